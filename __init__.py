@@ -1,8 +1,31 @@
-from . import AutoRig
-# from . import Control
-# from . import proxyObj
-# from . import rigUtils
-# print("UI")
-# from . import ui
-
-# __all__ = ['AutoRig', 'Control', 'proxyObj', 'rigUtils', 'ui']
\ No newline at end of file
+''' MagicRig
+
+Importing the package does nothing to the scene and loads no Qt, so
+batch tools can use the headless modules directly:
+
+    from MagicRig import build
+    build.buildCharacter("hero")
+
+The window and the MR_Root node are made on first use:
+
+    import MagicRig
+    MagicRig.show()
+'''
+import sys
+
+# submodules loaded on first attribute access, e.g. MagicRig.rigparts
+SUBMODULES = ("AutoRig", "build", "Control", "mirror", "proxyObj", "rigparts", "roleIndex", "rigUtils", "ui")
+
+
+def show():
+    ''' open the MagicRig window, creating MR_Root if the scene has none '''
+    from . import AutoRig
+    return AutoRig.show()
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        # __import__ rather than importlib so -X importtime still reports it
+        __import__(__name__ + "." + name)
+        return sys.modules[__name__ + "." + name]
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,215 @@
+''' rig many characters from a manifest, one worker process per character
+
+    mayapy batch.py manifest.json --workers 8 --timeout 600 --retries 1
+
+The manifest is json, either a list of characters or a dict with
+"defaults" and "characters". Each character takes the keyword arguments
+of build.buildCharacter:
+
+    {
+        "defaults": {"rigType": "biped", "fingers": 5},
+        "characters": [
+            {"prefix": "hero", "layout": "layouts/hero.json", "output": "rigs/hero.mb"},
+            {"prefix": "dog", "rigType": "quad", "tailJoints": 8, "output": "rigs/dog.mb"}
+        ]
+    }
+
+Builds run with the undo queue off, the fastest mode, unless a character
+sets "undo" (see buildContext). Relative layout and output paths are
+relative to the manifest. A summary with per-character status and timing
+is printed and written next to the manifest, or to --summary.
+'''
+import os
+import sys
+import json
+import time
+import types
+import argparse
+import importlib
+import traceback
+import multiprocessing
+from multiprocessing.connection import wait
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+PATH_KEYS = ("layout", "output")
+
+
+def loadManifest(path):
+    ''' list of character dicts with defaults applied and paths made absolute '''
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        defaults, characters = {}, data
+    else:
+        defaults, characters = data.get("defaults", {}), data["characters"]
+    base = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    for i, character in enumerate(characters):
+        job = dict(defaults)
+        job.update(character)
+        if "prefix" not in job:
+            raise ValueError("Character %s in %s has no prefix" % (i, path))
+        for key in PATH_KEYS:
+            if job.get(key):
+                job[key] = os.path.join(base, job[key])
+        jobs.append(job)
+    return jobs
+
+
+def installMaya(standIn):
+    ''' use a stand-in module for maya.cmds and maya.mel
+    Args:
+        standIn (string) module name, the module has a cmds and optionally a mel attribute
+    '''
+    module = importlib.import_module(standIn)
+    maya = types.ModuleType("maya")
+    maya.__path__ = []
+    maya.cmds = module.cmds
+    sys.modules["maya"] = maya
+    sys.modules["maya.cmds"] = module.cmds
+    if hasattr(module, "mel"):
+        maya.mel = module.mel
+        sys.modules["maya.mel"] = module.mel
+
+
+def importBuild():
+    ''' MagicRig.build from this folder, its parent does not have to be on sys.path '''
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    if "MagicRig" not in sys.modules:
+        package = types.ModuleType("MagicRig")
+        package.__path__ = [ROOT]
+        sys.modules["MagicRig"] = package
+    return importlib.import_module("MagicRig.build")
+
+
+def runJob(job, connection, standIn=None):
+    ''' worker process: build one character and send (status, seconds, error) back '''
+    start = time.time()
+    try:
+        if standIn:
+            installMaya(standIn)
+        else:
+            import maya.standalone
+            maya.standalone.initialize(name="python")
+        build = importBuild()
+        job = dict(job)
+        job.setdefault("undo", "off")
+        build.buildCharacter(**job)
+        connection.send(("ok", time.time() - start, None))
+    except Exception:
+        connection.send(("error", time.time() - start, traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+class Batch(object):
+    ''' run jobs in worker processes with timeouts and retries
+    Args:
+        jobs (list) of buildCharacter keyword dicts
+    Kwargs:
+        workers (int) processes at once, default cpu count
+        timeout (float) seconds before a job is killed, None to wait forever
+        retries (int) extra attempts for jobs that fail, time out or crash
+        standIn (string) module to use as maya.cmds in the workers
+    '''
+    def __init__(self, jobs, workers=None, timeout=None, retries=0, standIn=None, log=print):
+        self.jobs = jobs
+        self.workers = workers or multiprocessing.cpu_count()
+        self.timeout = timeout
+        self.retries = retries
+        self.standIn = standIn
+        self.log = log
+        self.context = multiprocessing.get_context("spawn")
+        self.results = []
+
+
+    def run(self):
+        ''' run every job
+        Returns:
+            list of result dicts in manifest order
+        '''
+        results = [None] * len(self.jobs)
+        pending = [(i, 1) for i in range(len(self.jobs))]
+        # connection: (index, attempt, process, start time)
+        running = {}
+        while pending or running:
+            while pending and len(running) < self.workers:
+                index, attempt = pending.pop(0)
+                receiver, sender = self.context.Pipe(duplex=False)
+                process = self.context.Process(target=runJob, args=(self.jobs[index], sender, self.standIn))
+                process.start()
+                sender.close()
+                running[receiver] = (index, attempt, process, time.time())
+
+            ready = wait(list(running) + [r[2].sentinel for r in running.values()], timeout=0.5)
+            now = time.time()
+            for receiver, (index, attempt, process, start) in list(running.items()):
+                status = None
+                if receiver in ready or process.sentinel in ready:
+                    try:
+                        status, seconds, error = receiver.recv()
+                    except EOFError:
+                        status, seconds, error = "crashed", now - start, "exit code %s" % process.exitcode
+                elif self.timeout and now - start > self.timeout:
+                    process.terminate()
+                    status, seconds, error = "timeout", now - start, "timed out after %ss" % self.timeout
+                if status is None:
+                    continue
+                process.join()
+                receiver.close()
+                del running[receiver]
+                results[index] = self.result(index, status, attempt, seconds, now - start, error)
+                self.log("%-8s %-20s attempt %s  %.2fs" % (status, self.jobs[index]["prefix"], attempt, seconds))
+                if status != "ok" and attempt <= self.retries:
+                    pending.append((index, attempt + 1))
+        self.results = results
+        return results
+
+
+    def result(self, index, status, attempt, seconds, wallSeconds, error):
+        job = self.jobs[index]
+        return {"prefix": job["prefix"], "rigType": job.get("rigType", "biped"), "status": status,
+                "attempts": attempt, "seconds": round(seconds, 3), "wallSeconds": round(wallSeconds, 3),
+                "output": job.get("output"), "error": error}
+
+
+def summary(results, seconds):
+    ''' dict written to the summary file '''
+    failed = [r for r in results if r["status"] != "ok"]
+    return {"characters": len(results), "ok": len(results) - len(failed), "failed": len(failed),
+            "seconds": round(seconds, 3), "results": results}
+
+
+def printSummary(data):
+    print("\n%-20s %-6s %-8s %8s %8s" % ("character", "type", "status", "attempts", "seconds"))
+    for r in data["results"]:
+        print("%-20s %-6s %-8s %8s %8.2f" % (r["prefix"], r["rigType"], r["status"], r["attempts"], r["seconds"]))
+    print("%s ok, %s failed, %.2fs total" % (data["ok"], data["failed"], data["seconds"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rig characters from a manifest with MagicRig")
+    parser.add_argument("manifest", help="json manifest of characters")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, default cpu count")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds before a build is killed")
+    parser.add_argument("--retries", type=int, default=0, help="extra attempts for failed builds")
+    parser.add_argument("--summary", default=None, help="summary json, default <manifest>_summary.json")
+    parser.add_argument("--stand-in", dest="standIn", default=None,
+                        help="module with cmds and mel attributes to use instead of maya")
+    args = parser.parse_args(argv)
+
+    jobs = loadManifest(args.manifest)
+    start = time.time()
+    results = Batch(jobs, args.workers, args.timeout, args.retries, args.standIn).run()
+    data = summary(results, time.time() - start)
+    path = args.summary or os.path.splitext(args.manifest)[0] + "_summary.json"
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+    printSummary(data)
+    return 0 if not data["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
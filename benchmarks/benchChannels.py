@@ -0,0 +1,55 @@
+''' channel lock/hide call count for a full biped
+
+Counts the setAttr calls the old per-channel Control locking made against
+the batched setChannelState calls of the current build.
+
+    mayapy benchmarks/benchChannels.py
+'''
+import benchUtils
+
+
+def main():
+    benchUtils.initMaya()
+    benchUtils.loadPackage()
+    import Control as controlModule
+    from MagicRig import Control as packageControl
+
+    # record the lock/hide spec of every control the build makes
+    controls = []
+    modules = [controlModule, packageControl]
+    originals = [m.setChannelState for m in modules]
+
+    def recordState(func):
+        def setChannelState(ctrls, *args, **kwargs):
+            controls.extend(c for c in ctrls if hasattr(c, "ctrlName"))
+            return func(ctrls, *args, **kwargs)
+        return setChannelState
+
+    for module, func in zip(modules, originals):
+        module.setChannelState = recordState(func)
+    # rigparts and rigUtils import the function by name
+    import rigUtils
+    from MagicRig import rigparts
+    rigUtils.setChannelState = controlModule.setChannelState
+    rigparts.setChannelState = packageControl.setChannelState
+
+    benchUtils.newScene()
+    counter, _ = benchUtils.countCalls(benchUtils.buildBiped)
+
+    legacyCalls = 0
+    channelCalls = 0
+    for ctrl in controls:
+        legacyCalls += sum(len(controlModule.CHANNELS[c]) for c in set(ctrl.lockChannels))
+        channels = set(ctrl.lockChannels) | set(ctrl.hideChannels)
+        channelCalls += sum(len(controlModule.CHANNELS[c]) for c in channels)
+
+    benchUtils.report("Channel lock/hide calls, full biped (%s controls)" % len(controls), [
+        ("before: setAttr per locked channel", legacyCalls),
+        ("before + hideChannels: setAttr per channel", channelCalls),
+        ("after: batched mel.eval calls", counter.counts.get("mel.eval", 0)),
+        ("total cmds calls in build", counter.total()),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+''' constraint against matrix drive mode on a biped with 10 fingers and 5 toes
+
+Builds the same character in each of buildContext's drive modes and
+reports the node count, the driving nodes by type, the time to pose every
+control and evaluate the joints, and how far apart the joints are. The run
+fails when the joints of the two modes are further apart than TOLERANCE.
+
+    mayapy benchmarks/benchDrive.py
+    python benchmarks/benchDrive.py --stand-in
+
+The stand-in evaluates constraints and matrix nodes only when they are
+made, so its evaluation times say nothing about maya's and its pose check
+is of the rest pose.
+'''
+import io
+import sys
+import contextlib
+
+import benchUtils
+
+OPTIONS = dict(fingers=10, toes=5, stretchy=True)
+DRIVE_TYPES = ("pointConstraint", "orientConstraint", "parentConstraint", "plusMinusAverage",
+               "multMatrix", "decomposeMatrix", "blendMatrix", "multDoubleLinear")
+TOLERANCE = 1e-4
+
+
+def jointMatrices(cmds):
+    return dict((joint, cmds.getAttr(joint + ".worldMatrix[0]")) for joint in cmds.ls(type="joint"))
+
+
+def main():
+    if "--stand-in" in sys.argv:
+        benchUtils.loadPackage()
+        import fakeMaya
+        fakeMaya.install()
+    else:
+        benchUtils.initMaya()
+        benchUtils.loadPackage()
+    import maya.cmds as cmds
+    import batch
+    import profiler
+    build = batch.importBuild()
+
+    rows = []
+    poses = {}
+    for mode in ("constraint", "matrix"):
+        with contextlib.redirect_stdout(io.StringIO()):
+            (_, seconds, nodes, evaluation), = profiler.compareDrive(build, "bench", modes=(mode,), **OPTIONS)
+        poses[mode] = jointMatrices(cmds)
+        types = ", ".join("%s %d" % (t, len(cmds.ls(type=t))) for t in DRIVE_TYPES if cmds.ls(type=t))
+        rows.append(("%s build" % mode, "%.4fs %5d nodes" % (seconds, nodes)))
+        rows.append(("%s evaluation" % mode, "%.3fms per frame" % (evaluation * 1000.0)))
+        rows.append(("%s nodes" % mode, types))
+
+    constraint, matrix = poses["constraint"], poses["matrix"]
+    worst = max(abs(a - b) for joint in constraint for a, b in zip(constraint[joint], matrix[joint]))
+    rows.append(("joints apart, worst", "%.2g" % worst))
+    benchUtils.report("Drive modes, biped %s" % ", ".join("%s=%s" % item for item in sorted(OPTIONS.items())), rows)
+    apart = sorted(joint for joint in constraint
+                   if max(abs(a - b) for a, b in zip(constraint[joint], matrix[joint])) > TOLERANCE)
+    if apart:
+        print("\njoints apart in the two drive modes: " + ", ".join(apart))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+''' full biped and quadruped builds on the in memory maya stand-in
+
+Runs with plain python, no maya needed:
+
+    python benchmarks/benchFakeMaya.py
+'''
+import benchUtils
+
+
+def main():
+    benchUtils.loadPackage()
+    import fakeMaya
+    fakeMaya.install()
+    import batch
+    build = batch.importBuild()
+
+    rows = []
+    for rigType in ("biped", "quad"):
+        seconds, _ = benchUtils.timed(build.buildCharacter, "bench", rigType=rigType)
+        rows.append(("%s build" % rigType, "%.3fs" % seconds))
+        rows.append(("%s nodes" % rigType, len(fakeMaya.cmds.ls())))
+    benchUtils.report("Builds on fakeMaya", rows)
+
+
+if __name__ == "__main__":
+    main()
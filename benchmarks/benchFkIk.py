@@ -0,0 +1,126 @@
+''' FK/IK blend of one limb: the old constraint setup against blendJoints
+
+Blends a three joint chain between its FKJ_ and IKJ_ copies with the old
+0-10 switch of three constraints and a plusMinusAverage, then with
+rigUtils.blendJoints in each drive mode, and reports the cmds calls,
+nodes and time per frame of playing the switch from IK to FK. The bind
+wrist sits under a forearm roll joint its FKJ_ and IKJ_ copies don't have,
+and the run fails when a bind joint is off its FKJ_ and IKJ_ joints at rest.
+
+    mayapy benchmarks/benchFkIk.py
+    python benchmarks/benchFkIk.py --stand-in
+
+The stand-in only evaluates nodes when they are connected, so its frame
+times are of setAttr and getAttr alone.
+'''
+import sys
+import time
+
+import benchUtils
+
+JOINTS = ("ShoulderL", "ElbowL", "WristL")
+ROLL = "ForearmRollL"
+FRAMES = 200
+TOLERANCE = 1e-3
+
+
+def legacyBlend(cmds, joints, blendAttr, name):
+    ''' the old FkIkBlend blend, weighted 0-10 by blendAttr '''
+    blend0 = cmds.orientConstraint("FKJ_" + joints[0], "IKJ_" + joints[0], joints[0], weight=10, maintainOffset=False)[0]
+    blend1 = cmds.parentConstraint("FKJ_" + joints[1], "IKJ_" + joints[1], joints[1], weight=10, maintainOffset=False)[0]
+    blend2 = cmds.parentConstraint("FKJ_" + joints[2], "IKJ_" + joints[2], joints[2], weight=10, maintainOffset=False)[0]
+    for blend, joint in zip((blend0, blend1, blend2), joints):
+        cmds.connectAttr(blendAttr, blend + ".FKJ_" + joint + "W0")
+    rev = cmds.shadingNode("plusMinusAverage", asUtility=True, name=name + "_Minus")
+    cmds.setAttr(rev + ".operation", 2)
+    cmds.setAttr(rev + ".input1D[0]", 10)
+    cmds.connectAttr(blendAttr, rev + ".input1D[1]")
+    for blend, joint in zip((blend0, blend1, blend2), joints):
+        cmds.connectAttr(rev + ".output1D", blend + ".IKJ_" + joint + "W1")
+
+
+def makeLimb(cmds, maximum):
+    ''' arm chain, its FKJ_ and IKJ_ copies and a switch '''
+    cmds.file(new=True, force=True)
+    cmds.select(clear=True)
+    for i, joint in enumerate(JOINTS):
+        cmds.joint(position=(3.0 + i * 3.5, 22.5, 0), name=joint)
+    for chain in ("FKJ_", "IKJ_"):
+        for joint in JOINTS:
+            cmds.duplicate(joint, parentOnly=True, name=chain + joint)
+            cmds.parent(chain + joint, world=True)
+        cmds.parent(chain + JOINTS[1], chain + JOINTS[0])
+        cmds.parent(chain + JOINTS[2], chain + JOINTS[1])
+    cmds.select(JOINTS[1])
+    cmds.joint(position=(8.25, 22.5, 0), name=ROLL)
+    cmds.parent(JOINTS[2], ROLL)
+    switch = cmds.createNode("transform", name="switch")
+    cmds.addAttr(switch, longName="Blend_FkIk_ArmL", attributeType="float", min=0, max=maximum, defaultValue=0)
+    return switch + ".Blend_FkIk_ArmL"
+
+
+def restOffset(cmds):
+    ''' largest distance of a bind joint from its FKJ_ and IKJ_ joints before
+    the FK elbow is bent '''
+    worst = 0.0
+    for joint in JOINTS:
+        bind = cmds.xform(joint, query=True, worldSpace=True, translation=True)
+        for chain in ("FKJ_", "IKJ_"):
+            other = cmds.xform(chain + joint, query=True, worldSpace=True, translation=True)
+            worst = max(worst, max(abs(a - b) for a, b in zip(bind, other)))
+    return worst
+
+
+def playback(cmds, switchAttr, maximum):
+    ''' seconds per frame to key the switch from IK to FK and pull the joints,
+    with the FK elbow bent '''
+    cmds.setAttr("FKJ_" + JOINTS[1] + ".rotateY", -40)
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        cmds.setAttr(switchAttr, maximum * frame / (FRAMES - 1.0))
+        for joint in JOINTS:
+            cmds.getAttr(joint + ".worldMatrix[0]")
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    if "--stand-in" in sys.argv:
+        benchUtils.loadPackage()
+        import fakeMaya
+        fakeMaya.install()
+    else:
+        benchUtils.initMaya()
+        benchUtils.loadPackage()
+    import maya.cmds as cmds
+    import rigUtils
+    import buildContext
+
+    rows = []
+    offsets = {}
+    switchAttr = makeLimb(cmds, 10)
+    before = len(cmds.ls())
+    counter = benchUtils.CallCounter(cmds)
+    seconds, _ = benchUtils.timed(legacyBlend, counter, JOINTS, switchAttr, "ArmL")
+    offsets["old constraints, 0-10"] = restOffset(cmds)
+    rows.append(("old constraints, 0-10", "%.4fs %3d calls %2d nodes %.3fms per frame" % (
+        seconds, counter.total(), len(cmds.ls()) - before, playback(cmds, switchAttr, 10) * 1000.0)))
+
+    for mode in buildContext.DRIVE_MODES:
+        switchAttr = makeLimb(cmds, 1)
+        before = len(cmds.ls())
+        with buildContext.driving(mode):
+            seconds, (counter, blends) = benchUtils.timed(
+                benchUtils.countCalls, rigUtils.blendJoints, list(JOINTS), switchAttr, "ArmL")
+        offsets["blendJoints, %s" % mode] = restOffset(cmds)
+        rows.append(("blendJoints, %s" % mode, "%.4fs %3d calls %2d nodes %.3fms per frame" % (
+            seconds, counter.total(), len(cmds.ls()) - before, playback(cmds, switchAttr, 1) * 1000.0)))
+    benchUtils.report("FK/IK blend of %s, %d frames" % (", ".join(JOINTS), FRAMES), rows)
+    off = ["%s %.3f" % (name, offset) for name, offset in sorted(offsets.items()) if offset > TOLERANCE]
+    if off:
+        print("\nbind joints off their FK/IK joints at rest: " + ", ".join(off))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+''' baking an FK/IK match over a 2000 frame shot
+
+Compares matching frame by frame, moving the current time and keying each
+channel with setKeyframe as an animator would by hand, against
+fkIkMatch.bake, which reads the chain at each frame with getAttr -time and
+writes every channel in one setAttr.
+
+    mayapy benchmarks/benchFkIkMatch.py
+    python benchmarks/benchFkIkMatch.py --stand-in
+
+The stand-in does not evaluate animation, so every frame has the same pose.
+'''
+import io
+import sys
+import contextlib
+
+import benchUtils
+
+FRAMES = 2000
+
+
+def legacyBake(cmds, fkIkMatch, limb, mode, start, end):
+    ''' match at each frame after moving the current time, one setKeyframe per channel '''
+    for frame in range(start, end + 1):
+        cmds.currentTime(frame)
+        _, values = fkIkMatch.solve(limb, mode, [None])
+        for plug, value in values.items():
+            cmds.setKeyframe(plug, time=frame, value=value[0])
+
+
+def main():
+    if "--stand-in" in sys.argv:
+        benchUtils.loadPackage()
+        import fakeMaya
+        fakeMaya.install()
+    else:
+        benchUtils.initMaya()
+        benchUtils.loadPackage()
+    import maya.cmds as cmds
+    import batch
+    import fkIkMatch
+    build = batch.importBuild()
+
+    rows = []
+    for mode in fkIkMatch.MODES:
+        with contextlib.redirect_stdout(io.StringIO()):
+            build.buildCharacter("bench", undo="off")
+        counter = benchUtils.CallCounter(cmds)
+        fkIkMatch.cmds = counter
+        try:
+            legacyTime, _ = benchUtils.timed(legacyBake, counter, fkIkMatch, "ArmL", mode, 1, FRAMES)
+        finally:
+            fkIkMatch.cmds = cmds
+        rows.append(("%s, frame by frame" % mode, "%.3fs %6d calls" % (legacyTime, counter.total())))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            build.buildCharacter("bench", undo="off")
+        bakeTime, (counter, keys) = benchUtils.timed(benchUtils.countCalls, fkIkMatch.bake, "ArmL", mode, 1, FRAMES,
+                                                     switch=False)
+        rows.append(("%s, fkIkMatch.bake" % mode, "%.3fs %6d calls %d keys, %d getAttr" % (
+            bakeTime, counter.total(), keys, counter.counts.get("getAttr", 0))))
+    benchUtils.report("FK/IK match of ArmL over %d frames" % FRAMES, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+''' import cost and side effects of the MagicRig package
+
+Imports the package, then the headless build module, in a fresh
+interpreter under python -X importtime. Fails if either import loads
+Qt or the window modules, or adds nodes to the scene.
+
+    mayapy benchmarks/benchImport.py
+    python benchmarks/benchImport.py --stand-in
+    python benchmarks/benchImport.py --stand-in --max-ms 50
+'''
+import os
+import sys
+import argparse
+import subprocess
+
+import benchUtils
+
+# modules the package and headless imports must not load
+FORBIDDEN = ("PySide2", "PySide6", "shiboken2", "shiboken6", "MagicRig.ui", "MagicRig.AutoRig")
+MARKER = "-- MagicRig import --"
+
+# run in the child: maya (or the stand-in) first, then the timed imports
+SCRIPT = '''
+import sys
+import time
+import importlib.util
+sys.path.insert(0, {root!r})
+if {standIn!r}:
+    import fakeMaya
+    fakeMaya.install()
+else:
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+import maya.cmds as cmds
+before = len(cmds.ls())
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("MagicRig", {init!r}, submodule_search_locations=[{root!r}])
+package = importlib.util.module_from_spec(spec)
+sys.modules["MagicRig"] = package
+spec.loader.exec_module(package)
+packageSeconds = time.perf_counter() - start
+sys.stderr.write({marker!r} + "\\n")
+import MagicRig.build
+sys.stderr.write({marker!r} + "\\n")
+print(len(cmds.ls()) - before)
+print(packageSeconds)
+print(" ".join(sorted(sys.modules)))
+'''
+
+
+def importTimes(lines):
+    ''' {module: (self us, cumulative us, depth)} from -X importtime lines '''
+    times = {}
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        selfTime, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times[name.strip()] = (int(selfTime), int(cumulative), depth)
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MagicRig import time and side effects")
+    parser.add_argument("--stand-in", dest="standIn", action="store_true", help="use fakeMaya instead of maya")
+    parser.add_argument("--max-ms", dest="maxMs", type=float, default=None,
+                        help="fail if importing the package and build takes longer")
+    args = parser.parse_args(argv)
+
+    root = benchUtils.ROOT
+    script = SCRIPT.format(root=root, standIn=args.standIn, marker=MARKER,
+                           init=os.path.join(root, "__init__.py"))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    if result.returncode:
+        print(result.stderr)
+        return 1
+    buildTimes = importTimes(result.stderr.split(MARKER + "\n")[1].splitlines())
+    output = result.stdout.splitlines()
+    nodesAdded, packageMs, modules = int(output[0]), float(output[1]) * 1000.0, output[2].split()
+
+    buildMs = sum(t[1] for t in buildTimes.values() if t[2] == 0) / 1000.0
+    slowest = sorted(buildTimes.items(), key=lambda item: -item[1][0])[:5]
+    rows = [("import MagicRig", "%.1fms" % packageMs),
+            ("import MagicRig.build", "%.1fms" % buildMs)]
+    rows += [("  self " + name, "%.1fms" % (t[0] / 1000.0)) for name, t in slowest]
+    rows.append(("nodes added by imports", nodesAdded))
+    loaded = [m for m in FORBIDDEN if m in modules]
+    rows.append(("forbidden modules loaded", ", ".join(loaded) or "none"))
+    benchUtils.report("Package import", rows)
+
+    failed = bool(loaded) or nodesAdded != 0
+    if args.maxMs is not None and packageMs + buildMs > args.maxMs:
+        print("\nimports took %.1fms, limit %.1fms" % (packageMs + buildMs, args.maxMs))
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+''' proxies to joints for a full biped: a proxyToJoint per proxy against jointChain
+
+Counts the cmds calls of turning every part's proxies into joints, the
+first pass of makeSkeletonBiped, and of the whole makeSkeletonBiped with
+its controls, once with the parts making their joints one proxyToJoint at
+a time as they used to and once with rigparts.jointChain.
+
+    mayapy benchmarks/benchJointChain.py
+    python benchmarks/benchJointChain.py --stand-in
+'''
+import io
+import sys
+import contextlib
+
+import benchUtils
+
+# fingers, toes
+CASES = ((5, 0), (5, 5))
+
+
+def legacyChain(rigparts, cmds):
+    ''' jointChain made of proxyToJoint calls, as the parts did it before '''
+    def jointChain(proxies, parents, space=None, remove=()):
+        names = []
+        for proxy, parent in zip(proxies, parents):
+            if isinstance(parent, int):
+                parent = names[parent]
+            names.append(rigparts.proxyToJoint(proxy, parent))
+        if remove:
+            cmds.delete(*remove)
+        return names
+    return jointChain
+
+
+def makeProxies(build, cmds, fingers, toes):
+    with contextlib.redirect_stdout(io.StringIO()):
+        cmds.file(new=True, force=True)
+        build.startup("bench")
+        return build.makeProxyBiped(fingers=fingers, toes=toes, undo="off")
+
+
+def makeJoints(build, parts):
+    ''' the proxy to joint pass of makeSkeleton '''
+    for name, parent in build.HIERARCHY["biped"]:
+        if parent:
+            parts[name].toJoint(getattr(parts[parent[0]], parent[1]))
+        else:
+            parts[name].toJoint()
+
+
+def main():
+    if "--stand-in" in sys.argv:
+        benchUtils.loadPackage()
+        import fakeMaya
+        fakeMaya.install()
+    else:
+        benchUtils.initMaya()
+        benchUtils.loadPackage()
+    import maya.cmds as cmds
+    import batch
+    from MagicRig import rigparts
+    build = batch.importBuild()
+
+    rows = []
+    jointChain = rigparts.jointChain
+    for fingers, toes in CASES:
+        for label, chain in (("proxyToJoint", legacyChain(rigparts, cmds)), ("jointChain", jointChain)):
+            rigparts.jointChain = chain
+            try:
+                parts = makeProxies(build, cmds, fingers, toes)
+                seconds, (joints, _) = benchUtils.timed(benchUtils.countCalls, makeJoints, build, parts)
+                made = len(cmds.ls(type="joint"))
+                parts = makeProxies(build, cmds, fingers, toes)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    counter, _ = benchUtils.countCalls(build.makeSkeletonBiped, parts, undo="off")
+            finally:
+                rigparts.jointChain = jointChain
+            rows.append(("%d fingers %d toes, %s" % (fingers, toes, label),
+                         "%.4fs %4d calls to make %3d joints, %5d calls in makeSkeletonBiped" % (
+                             seconds, joints.total(), made, counter.total())))
+    benchUtils.report("Biped proxies to joints", rows)
+
+
+if __name__ == "__main__":
+    main()
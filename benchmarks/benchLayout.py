@@ -0,0 +1,75 @@
+''' proxy layout templates on a biped with 10 fingers and 5 toes per side
+
+Compares the old per proxy setAttr layout against proxyLayout, which
+writes every proxy and mover in one batched call, by applying a library
+of templates to the same proxies.
+
+    mayapy benchmarks/benchLayout.py
+    python benchmarks/benchLayout.py --stand-in
+'''
+import io
+import os
+import sys
+import random
+import tempfile
+import contextlib
+
+import benchUtils
+
+TEMPLATES = 100
+
+
+def legacyApply(cmds, layout):
+    ''' the old build.applyLayout, translate only '''
+    for proxy, values in layout["nodes"].items():
+        if cmds.objExists(proxy):
+            cmds.setAttr(proxy + ".translate", values[0], values[1], values[2], type="float3")
+
+
+def main():
+    if "--stand-in" in sys.argv:
+        benchUtils.loadPackage()
+        import fakeMaya
+        fakeMaya.install()
+    else:
+        benchUtils.initMaya()
+        benchUtils.loadPackage()
+    import maya.cmds as cmds
+    import batch
+    import proxyLayout
+    build = batch.importBuild()
+
+    cmds.file(new=True, force=True)
+    build.startup("bench")
+    with contextlib.redirect_stdout(io.StringIO()):
+        build.makeProxyBiped(fingers=10, toes=5)
+
+    path = os.path.join(tempfile.mkdtemp(), "layout.json")
+    saveTime, _ = benchUtils.timed(build.saveLayout, path)
+    base = proxyLayout.read(path)
+    # body types: every node nudged a little
+    rand = random.Random(1)
+    library = []
+    for _ in range(TEMPLATES):
+        nodes = dict((node, [v + rand.uniform(-0.2, 0.2) for v in values[:3]] + values[3:])
+                     for node, values in base["nodes"].items())
+        library.append(dict(base, nodes=nodes))
+
+    legacyCounter = benchUtils.CallCounter(cmds)
+    legacyTime = sum(benchUtils.timed(legacyApply, legacyCounter, layout)[0] for layout in library)
+    applyTime, (applyCounter, _) = benchUtils.timed(benchUtils.countCalls, build.applyLayout, library[0])
+    for layout in library[1:]:
+        applyTime += benchUtils.timed(build.applyLayout, layout)[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        loadTime, _ = benchUtils.timed(build.loadLayout, path)
+
+    benchUtils.report("Proxy layouts, %s nodes, %s bytes" % (len(base["nodes"]), os.path.getsize(path)), [
+        ("save layout", "%.4fs" % saveTime),
+        ("old per proxy apply, average", "%.4fs %4d calls" % (legacyTime / TEMPLATES, legacyCounter.total() // TEMPLATES)),
+        ("batched apply, average", "%.4fs %4d calls" % (applyTime / TEMPLATES, applyCounter.total())),
+        ("load layout, new proxies", "%.4fs" % loadTime),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+''' proxy mirror on a biped with 10 fingers and 5 toes per side
+
+Compares the old per proxy getAttr/setAttr mirror against the pair
+indexed, batched mirror.MirrorIndex, and a repeat mirror with the index
+already built, which is what a live mirror while dragging pays.
+
+    mayapy benchmarks/benchMirror.py
+    python benchmarks/benchMirror.py --stand-in
+'''
+import io
+import sys
+import contextlib
+
+import benchUtils
+
+REPEATS = 20
+
+
+def legacyMirror(cmds, orient):
+    ''' the old build.mirrorProxy '''
+    source = "L" if orient == "R" else "R"
+    for proxy in cmds.listConnections("MR_Root.proxyObjects"):
+        if orient in proxy[-2:]:
+            pos = cmds.getAttr("%s.translate" % proxy[::-1].replace(orient, source, 1)[::-1])
+            cmds.setAttr("%s.translate" % proxy, (pos[0][0] * -1), pos[0][1], pos[0][2], type="float3")
+    cmds.select(clear=True)
+
+
+def main():
+    if "--stand-in" in sys.argv:
+        benchUtils.loadPackage()
+        import fakeMaya
+        fakeMaya.install()
+    else:
+        benchUtils.initMaya()
+        benchUtils.loadPackage()
+    import maya.cmds as cmds
+    import batch
+    import mirror
+    build = batch.importBuild()
+
+    cmds.file(new=True, force=True)
+    build.startup("bench")
+    with contextlib.redirect_stdout(io.StringIO()):
+        build.makeProxyBiped(fingers=10, toes=5)
+
+    legacyCounter = benchUtils.CallCounter(cmds)
+    legacyTime, _ = benchUtils.timed(legacyMirror, legacyCounter, "R")
+    mirror.index.clear()
+    firstTime, (firstCounter, _) = benchUtils.timed(benchUtils.countCalls, mirror.index.mirror, "R")
+    repeatTime, (repeatCounter, _) = benchUtils.timed(benchUtils.countCalls, mirror.index.mirror, "R")
+    for _ in range(REPEATS - 1):
+        repeatTime += benchUtils.timed(mirror.index.mirror, "R")[0]
+
+    benchUtils.report("Proxy mirror, %s pairs" % len(mirror.index.pairs), [
+        ("old getAttr/setAttr mirror", "%.4fs %4d calls" % (legacyTime, legacyCounter.total())),
+        ("first mirror, builds index", "%.4fs %4d calls" % (firstTime, firstCounter.total())),
+        ("repeat mirror, average", "%.4fs %4d calls" % (repeatTime / REPEATS, repeatCounter.total())),
+    ])
+
+
+if __name__ == "__main__":
+    main()
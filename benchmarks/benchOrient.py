@@ -0,0 +1,143 @@
+''' jointOrient against the orient pass of joint -edit -orientJoint -children
+
+Builds the same random chains twice, orients one copy with cmds.joint and
+the other with jointOrient.orientJoints, and reports the largest world
+matrix difference between the copies and the time each took, along with
+jointOrient.solve alone, which needs no scene. A hand, a chain that
+branches into five, is oriented too, and so are a leg straight below its
+hip and a spine straight up, where the aim runs along the up direction.
+
+    mayapy benchmarks/benchOrient.py
+    mayapy benchmarks/benchOrient.py --update
+    python benchmarks/benchOrient.py --stand-in
+
+The stand-in's orientJoint is the reference there, in mayapy it is maya's.
+--update in mayapy stores maya's world matrices of every case in
+benchmarks/baselines/mayaOrient.json, and each run after that, the
+stand-in's too, also reports how far jointOrient.solve is from them.
+'''
+import os
+import sys
+import json
+import random
+
+import benchUtils
+
+LENGTHS = (5, 50, 200)
+RULES = (("xyz", "yup"), ("xyz", "ydown"), ("yzx", "zup"), ("xyz", "none"))
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "mayaOrient.json")
+
+
+def chainPositions(count, seed):
+    ''' a wandering chain of count joints '''
+    rand = random.Random(seed)
+    positions = [(0.0, 0.0, 0.0)]
+    for _ in range(count - 1):
+        last = positions[-1]
+        positions.append((last[0] + rand.uniform(0.5, 2.0), last[1] + rand.uniform(-1.0, 1.0),
+                          last[2] + rand.uniform(-1.0, 1.0)))
+    return positions, [None] + list(range(count - 1))
+
+
+def handPositions():
+    ''' wrist with five fingers of four joints '''
+    positions = [(0.0, 0.0, 0.0)]
+    parents = [None]
+    for finger in range(5):
+        for i in range(4):
+            positions.append((1.0 + i * 0.6, -0.1 * i, (finger - 2) * 0.4 + 0.05 * i))
+            parents.append(0 if i == 0 else len(positions) - 2)
+    return positions, parents
+
+
+def legPositions():
+    ''' the default biped leg, knee and ankle straight below the hip '''
+    return [(1.7, 14.0, 0.0), (1.7, 8.0, 0.0), (1.7, 2.0, 0.0), (1.7, 0.0, 2.0)], [None, 0, 1, 2]
+
+
+def spinePositions():
+    ''' five joints straight up '''
+    return [(0.0, 10.0 + i * 2.0, 0.0) for i in range(5)], [None, 0, 1, 2, 3]
+
+
+def solvedMatrices(vecMath, jointOrient, positions, parents, orient, rule):
+    ''' world matrices from jointOrient.worldRotations, flat like xform -query -matrix '''
+    rotations = jointOrient.worldRotations(positions, orient, rule, parents)
+    return [v for rotation, position in zip(rotations, positions)
+            for v in vecMath.flatten(rotation[:3] + [list(position) + [1.0]])]
+
+
+def makeJoints(cmds, prefix, positions, parents):
+    names = []
+    for i, (position, parent) in enumerate(zip(positions, parents)):
+        cmds.select(clear=True)
+        if parent is not None:
+            cmds.select(names[parent])
+        names.append(cmds.joint(position=position, name="%s%d" % (prefix, i)))
+    cmds.select(clear=True)
+    return names
+
+
+def difference(cmds, first, second):
+    ''' largest world matrix difference between two sets of joints '''
+    a = cmds.xform(first, query=True, worldSpace=True, matrix=True)
+    b = cmds.xform(second, query=True, worldSpace=True, matrix=True)
+    return max(abs(x - y) for x, y in zip(a, b))
+
+
+def loadFixture():
+    if not os.path.exists(FIXTURE):
+        return {}
+    with open(FIXTURE) as f:
+        return json.load(f)
+
+
+def main():
+    standIn = "--stand-in" in sys.argv
+    update = "--update" in sys.argv
+    if standIn:
+        benchUtils.loadPackage()
+        import fakeMaya
+        fakeMaya.install()
+    else:
+        benchUtils.initMaya()
+        benchUtils.loadPackage()
+    import maya.cmds as cmds
+    import vecMath
+    import jointOrient
+    if update and standIn:
+        sys.exit("--update stores maya's results, run it in mayapy")
+
+    cases = [("%d joints" % count, chainPositions(count, count)) for count in LENGTHS]
+    cases += [("hand", handPositions()), ("leg", legPositions()), ("spine", spinePositions())]
+    fixture = loadFixture()
+    rows = []
+    for label, (positions, parents) in cases:
+        for orient, rule in RULES:
+            name = "%s %s %s" % (label, orient, rule)
+            cmds.file(new=True, force=True)
+            reference = makeJoints(cmds, "ref", positions, parents)
+            solved = makeJoints(cmds, "sol", positions, parents)
+            referenceTime, _ = benchUtils.timed(cmds.joint, reference[0], edit=True, orientJoint=orient,
+                                                secondaryAxisOrient=rule, children=True)
+            solvedTime, _ = benchUtils.timed(jointOrient.orientJoints, solved[0], orient, rule)
+            solveTime, _ = benchUtils.timed(jointOrient.solve, positions, orient, rule, parents)
+            if update:
+                fixture[name] = cmds.xform(reference, query=True, worldSpace=True, matrix=True)
+            result = "%.1e off, %.4fs orientJoint %.4fs orientJoints %.4fs solve" % (
+                difference(cmds, reference, solved), referenceTime, solvedTime, solveTime)
+            if name in fixture:
+                matrices = solvedMatrices(vecMath, jointOrient, positions, parents, orient, rule)
+                result += ", %.1e off maya's stored" % max(abs(a - b) for a, b in zip(fixture[name], matrices))
+            rows.append((name, result))
+    benchUtils.report("jointOrient against orientJoint", rows)
+    if update:
+        with open(FIXTURE, "w") as f:
+            json.dump(fixture, f, indent=1, sort_keys=True)
+        print("\nmaya's matrices written to %s" % FIXTURE)
+    elif not fixture:
+        print("\nno stored maya matrices yet, run mayapy benchmarks/benchOrient.py --update")
+
+
+if __name__ == "__main__":
+    main()
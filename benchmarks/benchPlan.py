@@ -0,0 +1,44 @@
+''' plan, optimise and execute a full biped
+
+Reports node counts before and after the rigplan passes and compares
+planning + execute against building straight into maya.
+
+    mayapy benchmarks/benchPlan.py
+'''
+import benchUtils
+
+
+def main():
+    benchUtils.initMaya()
+    benchUtils.loadPackage()
+    import rigplan
+
+    benchUtils.newScene()
+    directTime, _ = benchUtils.timed(benchUtils.buildBiped)
+
+    plan = rigplan.RigPlan()
+
+    def planBiped():
+        with rigplan.planning(plan):
+            benchUtils.newScene(cmds=plan.cmds)
+            benchUtils.buildBiped(cmds=plan.cmds)
+
+    planTime, _ = benchUtils.timed(planBiped)
+    before = plan.stats()
+    optimiseTime, passes = benchUtils.timed(plan.optimise)
+    after = plan.stats()
+    executeTime, _ = benchUtils.timed(rigplan.execute, plan)
+
+    rows = [("ops recorded", before["ops"]), ("ops after passes", after["ops"]),
+            ("nodes created before passes", before["nodesCreated"])]
+    for name, nodesBefore, nodesAfter in passes:
+        rows.append(("nodes created after %s" % name, nodesAfter))
+    rows += [("direct build", "%.3fs" % directTime),
+             ("plan", "%.3fs" % planTime),
+             ("optimise", "%.3fs" % optimiseTime),
+             ("execute", "%.3fs" % executeTime)]
+    benchUtils.report("Planned biped build", rows)
+
+
+if __name__ == "__main__":
+    main()
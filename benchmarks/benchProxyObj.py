@@ -0,0 +1,63 @@
+''' proxyObj scaling benchmark
+
+Times proxy creation with 10, 1k and 10k objects already in
+initialShadingGroup. Proxy time should stay flat, the old detach loop
+grows with the number of members.
+
+    mayapy benchmarks/benchProxyObj.py [proxies]
+'''
+import sys
+
+import benchUtils
+
+MEMBERS = [10, 1000, 10000]
+
+
+def fillShadingGroup(count):
+    ''' add count nurbs spheres to initialShadingGroup '''
+    import maya.cmds as cmds
+    for i in range(count):
+        cmds.sphere(name="filler%s" % i, ch=False)
+
+
+def legacyDetach(objShape):
+    ''' old initialShadingGroup detach, tries every index until one works '''
+    import maya.cmds as cmds
+    pos = 0
+    while True:
+        try:
+            cmds.disconnectAttr(objShape + ".instObjGroups", "initialShadingGroup.dagSetMembers[%s]" % pos)
+            return pos
+        except RuntimeError:
+            pos += 1
+
+
+def legacyProxies(count):
+    import maya.cmds as cmds
+    for i in range(count):
+        obj = cmds.sphere(name="legacyProxy%s" % i, r=0.5, d=3, s=4, nsp=2, ch=False)[0]
+        legacyDetach(cmds.listRelatives(obj, shapes=True)[0])
+
+
+def makeProxies(count):
+    from proxyObj import proxyObj
+    for i in range(count):
+        proxyObj("pBench%s" % i, (0, i, 0))
+
+
+def main(proxies=20):
+    benchUtils.initMaya()
+    benchUtils.loadPackage()
+    rows = []
+    for members in MEMBERS:
+        benchUtils.newScene()
+        fillShadingGroup(members)
+        legacyTime, _ = benchUtils.timed(legacyProxies, proxies)
+        newTime, _ = benchUtils.timed(makeProxies, proxies)
+        rows.append(("%s members" % members, "legacy detach %.3f ms/proxy   proxyObj %.3f ms/proxy" % (
+            legacyTime / proxies * 1000, newTime / proxies * 1000)))
+    benchUtils.report("proxyObj creation (%s proxies)" % proxies, rows)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
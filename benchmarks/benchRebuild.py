@@ -0,0 +1,60 @@
+''' incremental rebuild of a biped with 10 fingers, 5 toes and stretchy limbs
+
+Moves one wrist proxy in a saved layout, then compares building the whole
+rig again against build.rebuild, which only redoes the arm.
+
+    mayapy benchmarks/benchRebuild.py
+    python benchmarks/benchRebuild.py --stand-in
+'''
+import io
+import os
+import sys
+import json
+import tempfile
+import contextlib
+
+import benchUtils
+
+OPTIONS = dict(fingers=10, toes=5, stretchy=True)
+
+
+def main():
+    if "--stand-in" in sys.argv:
+        benchUtils.loadPackage()
+        import fakeMaya
+        fakeMaya.install()
+    else:
+        benchUtils.initMaya()
+        benchUtils.loadPackage()
+    import maya.cmds as cmds
+    import batch
+    build = batch.importBuild()
+
+    folder = tempfile.mkdtemp()
+    base, edit = os.path.join(folder, "base.json"), os.path.join(folder, "edit.json")
+    with contextlib.redirect_stdout(io.StringIO()):
+        cmds.file(new=True, force=True)
+        build.startup("bench")
+        build.makeProxy("biped", dict(build.DEFAULTS, **OPTIONS))
+        build.saveLayout(base)
+        layout = json.load(open(base))
+        layout["nodes"]["pWristL"][0] += 0.5
+        with open(edit, "w") as f:
+            json.dump(layout, f)
+
+        build.buildCharacter("bench", layout=base, undo="off")
+        fullTime, (fullCounter, _) = benchUtils.timed(benchUtils.countCalls, build.buildCharacter, "bench",
+                                                      layout=edit, undo="off")
+        build.buildCharacter("bench", layout=base, undo="off")
+        rebuildTime, (rebuildCounter, dirty) = benchUtils.timed(benchUtils.countCalls, build.rebuild, edit, undo="off")
+        cleanTime, (cleanCounter, _) = benchUtils.timed(benchUtils.countCalls, build.rebuild, edit, undo="off")
+
+    benchUtils.report("Rebuild after moving pWristL", [
+        ("full build", "%.4fs %5d calls" % (fullTime, fullCounter.total())),
+        ("rebuild %s" % ", ".join(dirty), "%.4fs %5d calls" % (rebuildTime, rebuildCounter.total())),
+        ("rebuild, nothing changed", "%.4fs %5d calls" % (cleanTime, cleanCounter.total())),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+''' build time, cmds call and node count regression suite
+
+Builds bipeds, quadrupeds and ribbons across a matrix of joint counts and
+compares each build against the baselines stored in benchmarks/baselines.
+Any metric past its threshold fails the run with exit code 1.
+
+    mayapy benchmarks/benchRegression.py
+    python benchmarks/benchRegression.py --stand-in
+    python benchmarks/benchRegression.py --stand-in --update
+
+Each backend keeps its own baseline file, maya.json or <stand-in>.json,
+since build times are not comparable between them. Call and node counts
+should match between backends and are the metrics to watch, so they have
+a tight threshold. Times are machine dependent and noisy on shared boxes,
+their threshold is loose; update the baseline when moving machines.
+'''
+import gc
+import io
+import os
+import sys
+import json
+import fnmatch
+import argparse
+import itertools
+import contextlib
+
+import benchUtils
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# option values built for each rig type, every combination is a case
+BIPED_MATRIX = {"spineJoints": (3, 4, 8), "fingers": (0, 5), "toes": (0, 2)}
+QUAD_MATRIX = {"spineJoints": (4, 8), "tailJoints": (2, 4, 10)}
+RIBBON_LENGTHS = (10, 20)
+
+SHORT_NAMES = {"spineJoints": "s", "fingers": "f", "toes": "t", "tailJoints": "tl"}
+
+
+def cases():
+    ''' list of (case name, rig type, options) '''
+    result = []
+    for rigType, matrix in (("biped", BIPED_MATRIX), ("quad", QUAD_MATRIX)):
+        keys = sorted(matrix)
+        for values in itertools.product(*[matrix[k] for k in keys]):
+            options = dict(zip(keys, values))
+            name = rigType + "-" + "-".join("%s%s" % (SHORT_NAMES[k], options[k]) for k in keys)
+            result.append((name, rigType, options))
+    for length in RIBBON_LENGTHS:
+        result.append(("ribbon-l%s" % length, "ribbon", {"length": length}))
+    return result
+
+
+class NodeCounter(object):
+    ''' counts created nodes, with the profiler's node added callback in maya
+    or from the change in scene size on a stand-in
+    '''
+    def __init__(self, cmds):
+        self.cmds = cmds
+        self.count = 0
+        self.callback = None
+
+
+    def __enter__(self):
+        import profiler
+        self.callback = profiler.nodeAddedCallback(self)
+        if self.callback is None:
+            self.count = -len(self.cmds.ls())
+        return self
+
+
+    def __exit__(self, *args):
+        import profiler
+        if self.callback is None:
+            self.count += len(self.cmds.ls())
+        else:
+            profiler.removeCallback(self.callback)
+
+
+    def nodeAdded(self):
+        self.count += 1
+
+
+def setupCase(rigType):
+    ''' empty scene ready to build rigType, not timed '''
+    import maya.cmds as cmds
+    from MagicRig import build
+    cmds.file(new=True, force=True)
+    build.startup("bench")
+    if rigType == "ribbon":
+        build.addMasterControl()
+
+
+def buildCase(rigType, options):
+    ''' the timed part of a case '''
+    from MagicRig import build, rigparts
+    if rigType == "biped":
+        build.makeSkeletonBiped(build.makeProxyBiped(**options))
+    elif rigType == "quad":
+        build.makeSkeletonQuad(build.makeProxyQuad(**options))
+    else:
+        rigparts.ribbon("spine", options["length"])
+
+
+def runCase(rigType, options, repeat=5):
+    ''' build a case repeat times
+    Returns:
+        dict of seconds (fastest run), calls, nodes and commands
+    '''
+    import maya.cmds as cmds
+    best = None
+    for _ in range(repeat):
+        setupCase(rigType)
+        # collector pauses are most of the noise between runs
+        gc.collect()
+        gc.disable()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                with NodeCounter(cmds) as nodes:
+                    seconds, (counter, _) = benchUtils.timed(benchUtils.countCalls, buildCase, rigType, options)
+        finally:
+            gc.enable()
+        if best is None or seconds < best["seconds"]:
+            best = {"seconds": round(seconds, 4), "calls": counter.total(), "nodes": nodes.count,
+                    "commands": dict(sorted(counter.counts.items()))}
+    return best
+
+
+def compare(baseline, current, timeThreshold, countThreshold, minSeconds=0.01):
+    ''' regressions of current against baseline
+    Returns:
+        list of (metric, baseline value, current value) past their threshold
+    '''
+    failures = []
+    limit = max(baseline["seconds"] * (1 + timeThreshold), baseline["seconds"] + minSeconds)
+    if current["seconds"] > limit:
+        failures.append(("seconds", baseline["seconds"], current["seconds"]))
+    for metric in ("calls", "nodes"):
+        if current[metric] > baseline[metric] * (1 + countThreshold):
+            failures.append((metric, baseline[metric], current[metric]))
+    return failures
+
+
+def commandChanges(baseline, current, top=3):
+    ''' commands whose call count grew the most '''
+    changes = []
+    for command, count in current["commands"].items():
+        grown = count - baseline["commands"].get(command, 0)
+        if grown > 0:
+            changes.append((grown, command))
+    return ", ".join("%s +%s" % (command, grown) for grown, command in sorted(changes, reverse=True)[:top])
+
+
+def baselinePath(backend):
+    return os.path.join(BASELINES, backend + ".json")
+
+
+def loadBaseline(backend):
+    path = baselinePath(backend)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["cases"]
+
+
+def saveBaseline(backend, results):
+    if not os.path.isdir(BASELINES):
+        os.makedirs(BASELINES)
+    with open(baselinePath(backend), "w") as f:
+        json.dump({"backend": backend, "cases": results}, f, indent=1, sort_keys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MagicRig build regression benchmarks")
+    parser.add_argument("--stand-in", dest="standIn", nargs="?", const="fakeMaya", default=None,
+                        help="module with cmds and mel attributes to use instead of maya, default fakeMaya")
+    parser.add_argument("--cases", default="*", help="only run cases matching this pattern, e.g. quad-*")
+    parser.add_argument("--repeat", type=int, default=5, help="builds per case, the fastest is kept")
+    parser.add_argument("--time-threshold", dest="timeThreshold", type=float, default=0.5,
+                        help="allowed fractional slow down, default 0.5")
+    parser.add_argument("--count-threshold", dest="countThreshold", type=float, default=0.02,
+                        help="allowed fractional growth of call and node counts, default 0.02")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    benchUtils.loadPackage()
+    import batch
+    if args.standIn:
+        batch.installMaya(args.standIn)
+        backend = args.standIn
+    else:
+        benchUtils.initMaya()
+        backend = "maya"
+    batch.importBuild()
+
+    baseline = loadBaseline(backend)
+    results = dict(baseline) if args.update else {}
+    rows = []
+    failed = 0
+    for name, rigType, options in cases():
+        if not fnmatch.fnmatch(name, args.cases):
+            continue
+        current = runCase(rigType, options, args.repeat)
+        results[name] = current
+        old = baseline.get(name)
+        if old is None:
+            status = "new"
+        else:
+            failures = compare(old, current, args.timeThreshold, args.countThreshold)
+            status = "ok"
+            if failures:
+                failed += 1
+                status = "FAIL " + ", ".join("%s %s -> %s" % f for f in failures)
+                changes = commandChanges(old, current)
+                if changes:
+                    status += " (" + changes + ")"
+        rows.append((name, "%7.3fs %6d calls %5d nodes  %s" % (
+            current["seconds"], current["calls"], current["nodes"], status)))
+
+    benchUtils.report("Build regressions on %s" % backend, rows)
+    if args.update:
+        saveBaseline(backend, results)
+        print("\nbaseline written to %s" % baselinePath(backend))
+        return 0
+    print("\n%s of %s cases regressed" % (failed, len(rows)))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+''' reloading a built biped with 10 fingers and 5 toes per side
+
+Compares walking the MR_Root network, a listConnections and getAttr per
+part and per control, against roleIndex, which reads MR_Root.roles once
+and rebuilds every rig part from it.
+
+    mayapy benchmarks/benchReload.py
+    python benchmarks/benchReload.py --stand-in
+'''
+import io
+import sys
+import contextlib
+
+import benchUtils
+
+REPEATS = 20
+# settings the rig parts keep on their network nodes
+NETWORK_ATTRS = ("side", "numToes", "numFingers", "spineJointNum", "numJoints")
+
+
+def networkWalk(cmds):
+    ''' what finding the parts and their controls costs without the index '''
+    found = {}
+    for node in cmds.listConnections("MR_Root.child") or []:
+        found[node] = {"object": cmds.getAttr(node + ".object")}
+        for attr in NETWORK_ATTRS:
+            if cmds.attributeQuery(attr, node=node, exists=True):
+                found[node][attr] = cmds.getAttr(node + "." + attr)
+    for ctrl in cmds.listConnections("MR_Root.controls") or []:
+        found[ctrl] = cmds.listConnections(ctrl + ".controlOffset")
+    return found
+
+
+def main():
+    if "--stand-in" in sys.argv:
+        benchUtils.loadPackage()
+        import fakeMaya
+        fakeMaya.install()
+    else:
+        benchUtils.initMaya()
+        benchUtils.loadPackage()
+    import maya.cmds as cmds
+    import batch
+    import roleIndex
+    build = batch.importBuild()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        build.buildCharacter("bench", fingers=10, toes=5, undo="off")
+
+    walkCounter = benchUtils.CallCounter(cmds)
+    walkTime, _ = benchUtils.timed(networkWalk, walkCounter)
+    roleIndex.index.clear()
+    loadTime, (loadCounter, parts) = benchUtils.timed(benchUtils.countCalls, build.load)
+    for _ in range(REPEATS - 1):
+        loadTime += benchUtils.timed(build.load)[0]
+    lookupTime, _ = benchUtils.timed(lambda: [build.lookup(role) for role in roleIndex.index.roles])
+
+    benchUtils.report("Rig reload, %s parts, %s roles" % (len(parts), len(roleIndex.index.roles)), [
+        ("network walk", "%.4fs %4d calls" % (walkTime, walkCounter.total())),
+        ("roleIndex load, average", "%.4fs %4d calls" % (loadTime / REPEATS, loadCounter.total())),
+        ("look up every role", "%.4fs" % lookupTime),
+    ])
+
+
+if __name__ == "__main__":
+    main()
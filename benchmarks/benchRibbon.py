@@ -0,0 +1,71 @@
+''' rigparts.ribbon by joint count on a ribbon of the same length
+
+Reports cmds calls, nodes and time to build, and the time per frame to
+move the top control and pull every joint's world matrix, per joint too,
+which should stay about the same as the joint count grows. The follicle
+ribbon made a follicle, its transform and a scaleConstraint per joint,
+its node count is shown for comparison.
+
+    mayapy benchmarks/benchRibbon.py
+    python benchmarks/benchRibbon.py --stand-in
+
+The stand-in only evaluates the uvPin when a joint is connected, so its
+frame times are of setAttr and getAttr alone.
+'''
+import io
+import sys
+import time
+import contextlib
+
+import benchUtils
+
+JOINT_COUNTS = (5, 20, 50)
+LENGTH = 10
+FRAMES = 20
+# follicle, follicleShape and scaleConstraint
+FOLLICLE_NODES = 3
+
+
+def evaluationTime(cmds, ctrl, joints):
+    ''' seconds per frame to move ctrl and pull every joint's world matrix '''
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        cmds.setAttr(ctrl + ".translateY", frame % 5)
+        for joint in joints:
+            cmds.getAttr(joint + ".worldMatrix[0]")
+    seconds = (time.perf_counter() - start) / FRAMES
+    cmds.setAttr(ctrl + ".translateY", 0)
+    return seconds
+
+
+def main():
+    if "--stand-in" in sys.argv:
+        benchUtils.loadPackage()
+        import fakeMaya
+        fakeMaya.install()
+    else:
+        benchUtils.initMaya()
+        benchUtils.loadPackage()
+    import maya.cmds as cmds
+    import batch
+    from MagicRig import rigparts
+    build = batch.importBuild()
+
+    rows = []
+    for count in JOINT_COUNTS:
+        cmds.file(new=True, force=True)
+        build.startup("bench")
+        build.addMasterControl()
+        before = len(cmds.ls())
+        with contextlib.redirect_stdout(io.StringIO()):
+            seconds, (counter, ribbon) = benchUtils.timed(benchUtils.countCalls, rigparts.ribbon, "spine", LENGTH, count)
+        nodes = len(cmds.ls()) - before
+        evaluation = evaluationTime(cmds, ribbon.topCtrl, ribbon.joints)
+        rows.append(("%s joints" % count, "%.4fs %4d calls %4d nodes (was %d) %.3fms per frame, %.1fus per joint" % (
+            seconds, counter.total(), nodes, nodes + FOLLICLE_NODES * count, evaluation * 1000.0,
+            evaluation * 1e6 / count)))
+    benchUtils.report("Ribbon of length %s by joint count" % LENGTH, rows)
+
+
+if __name__ == "__main__":
+    main()
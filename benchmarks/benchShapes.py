@@ -0,0 +1,82 @@
+''' Control shape creation benchmark
+
+Builds controls with the old per-control json load and offset scale/rotate,
+then with the cached shape library, and compares the time per control.
+
+    mayapy benchmarks/benchShapes.py [count]
+'''
+import os
+import sys
+import json
+
+import benchUtils
+
+SHAPES = ["circle", "cube", "sphere", "ctrlArrow", "square"]
+DIRECTIONS = ["", "x", "y", "z"]
+
+
+def legacyShape(name, shape, scale, direction):
+    ''' shape creation as Control did it before the shape library '''
+    import maya.cmds as cmds
+    if shape == "circle":
+        ctrlObject = cmds.circle(name=name + "_ctrl", ch=False, normal=[0, 1, 0], radius=1)[0]
+    else:
+        jsonFile = os.path.join(benchUtils.ROOT, "ControlShapes.json")
+        shapes = json.load(open(jsonFile))
+        ctrlObject = cmds.curve(p=shapes[shape], d=1, name=name + "_ctrl")
+    ctrlOffset = cmds.group([ctrlObject], name=name + "_offset")
+    cmds.scale(scale, scale, scale, ctrlOffset)
+    if direction == "x":
+        cmds.rotate(90, 0, 0, ctrlOffset, absolute=True)
+    elif direction == "y":
+        cmds.rotate(0, 90, 0, ctrlOffset, absolute=True)
+    elif direction == "z":
+        cmds.rotate(0, 0, 90, ctrlOffset, absolute=True)
+    return ctrlObject, ctrlOffset
+
+
+def cachedShape(name, shape, scale, direction):
+    ''' shape creation through the shape library '''
+    import maya.cmds as cmds
+    import shapeLib
+    ctrlObject = cmds.curve(name=name + "_ctrl", **shapeLib.curveKwargs(shape, scale, direction))
+    ctrlOffset = cmds.group([ctrlObject], name=name + "_offset")
+    return ctrlObject, ctrlOffset
+
+
+def build(func, count):
+    for i in range(count):
+        func("bench%s" % i, SHAPES[i % len(SHAPES)], 1.5, DIRECTIONS[i % len(DIRECTIONS)])
+
+
+def buildControls(count):
+    from MagicRig.Control import Control
+    master = Control("Master_Control", shape="ctrlMultiArrow", master=True)
+    import maya.cmds as cmds
+    cmds.disconnectAttr("MR_Root.controls", master.ctrlName + ".controlName")
+    cmds.connectAttr("MR_Root.masterControl", master.ctrlName + ".controlName")
+    for i in range(count):
+        Control("bench%s" % i, shape=SHAPES[i % len(SHAPES)], scale=1.5, direction=DIRECTIONS[i % len(DIRECTIONS)])
+
+
+def main(count=500):
+    benchUtils.initMaya()
+    benchUtils.loadPackage()
+
+    benchUtils.newScene()
+    legacyTime, _ = benchUtils.timed(build, legacyShape, count)
+    benchUtils.newScene()
+    cachedTime, _ = benchUtils.timed(build, cachedShape, count)
+    benchUtils.newScene()
+    controlTime, _ = benchUtils.timed(buildControls, count)
+
+    benchUtils.report("Control shapes (%s controls)" % count, [
+        ("legacy shape ms/control", "%.3f" % (legacyTime / count * 1000)),
+        ("cached shape ms/control", "%.3f" % (cachedTime / count * 1000)),
+        ("speed up", "%.2fx" % (legacyTime / cachedTime)),
+        ("full Control ms/control", "%.3f" % (controlTime / count * 1000)),
+    ])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
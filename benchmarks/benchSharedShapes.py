@@ -0,0 +1,56 @@
+''' saving and opening a full biped with and without shared control shapes
+
+Builds a biped with five fingers and five toes per side, once with every
+control on its own shape and once with the finger and toe controls of each
+hand and foot drawing with one instanced shape, and reports the curve
+shapes in the scene, the size of the saved .ma and the time to open it.
+
+    mayapy benchmarks/benchSharedShapes.py
+    python benchmarks/benchSharedShapes.py --stand-in
+
+The stand-in saves a json listing of the scene and opening it makes the
+nodes again from that, so its sizes and times only compare with each other.
+'''
+import io
+import os
+import sys
+import tempfile
+import contextlib
+
+import benchUtils
+
+REPEATS = 20
+
+
+def main():
+    if "--stand-in" in sys.argv:
+        benchUtils.loadPackage()
+        import fakeMaya
+        fakeMaya.install()
+    else:
+        benchUtils.initMaya()
+        benchUtils.loadPackage()
+    import maya.cmds as cmds
+    import batch
+    from MagicRig import Control
+    build = batch.importBuild()
+
+    folder = tempfile.mkdtemp()
+    rows = []
+    for shared in (False, True):
+        path = os.path.join(folder, "shared.ma" if shared else "own.ma")
+        Control.instanceShapes = shared
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                build.buildCharacter("bench", toes=5, output=path, undo="off")
+        finally:
+            Control.instanceShapes = True
+        shapes = len(cmds.ls(type="nurbsCurve"))
+        seconds = min(benchUtils.timed(cmds.file, path, open=True, force=True)[0] for _ in range(REPEATS))
+        rows.append(("shared shapes" if shared else "own shapes", "%3d curve shapes %8d bytes %.4fs open" % (
+            shapes, os.path.getsize(path), seconds)))
+    benchUtils.report("Biped with 5 fingers and 5 toes, saved as .ma", rows)
+
+
+if __name__ == "__main__":
+    main()
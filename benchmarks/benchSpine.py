@@ -0,0 +1,63 @@
+''' spline spine by joint and control count
+
+Builds a biped for each spine and reports the nodes the spine part made,
+its back controls, and the time per frame to move the top back control
+and pull every spine joint's world matrix.
+
+    mayapy benchmarks/benchSpine.py
+    python benchmarks/benchSpine.py --stand-in
+
+The stand-in does not solve spline IK, so its frame times are of setAttr
+and getAttr alone.
+'''
+import io
+import sys
+import time
+import contextlib
+
+import benchUtils
+
+CASES = ((4, 4), (10, 4), (20, 4), (30, 4), (30, 2), (30, 5))
+FRAMES = 20
+
+
+def evaluationTime(cmds, ctrl, joints):
+    ''' seconds per frame to move ctrl and pull every joint's world matrix '''
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        cmds.setAttr(ctrl + ".translateX", frame % 5)
+        for joint in joints:
+            cmds.getAttr(joint + ".worldMatrix[0]")
+    seconds = (time.perf_counter() - start) / FRAMES
+    cmds.setAttr(ctrl + ".translateX", 0)
+    return seconds
+
+
+def main():
+    if "--stand-in" in sys.argv:
+        benchUtils.loadPackage()
+        import fakeMaya
+        fakeMaya.install()
+    else:
+        benchUtils.initMaya()
+        benchUtils.loadPackage()
+    import maya.cmds as cmds
+    import batch
+    import partTracker
+    build = batch.importBuild()
+
+    rows = []
+    for joints, ctrls in CASES:
+        with contextlib.redirect_stdout(io.StringIO()):
+            seconds, _ = benchUtils.timed(build.buildCharacter, "bench", spineJoints=joints, spineCtrls=ctrls,
+                                          fingers=0, undo="off")
+        spine = build.load()["spine"]
+        nodes = len(partTracker.builtNodes(spine.name)) - joints
+        evaluation = evaluationTime(cmds, spine.backCtrls[-1], spine.spineList)
+        rows.append(("%2d joints, %d controls" % (joints, ctrls), "%.4fs build %3d spine nodes %.3fms per frame, %.1fus per joint" % (
+            seconds, nodes, evaluation * 1000.0, evaluation * 1e6 / joints)))
+    benchUtils.report("Spline spine, nodes besides the joints", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+''' makeStretchyIK on chains of increasing length
+
+Reports cmds calls, nodes created and time per chain length. The old
+engine made one multiplyDivide per joint and selected/pickWalked twice
+per joint, its node count is shown for comparison.
+
+    mayapy benchmarks/benchStretchyIK.py
+    python benchmarks/benchStretchyIK.py --stand-in
+'''
+import sys
+
+import benchUtils
+
+CHAIN_LENGTHS = (3, 10, 25, 50, 100)
+# distanceBetween, condition, 3 multiplyDivide, 2 plusMinusAverage
+NETWORK_NODES = 7
+
+
+def makeChain(cmds, count):
+    ''' straight joint chain along x with an ik handle over all of it '''
+    cmds.select(clear=True)
+    joints = [cmds.joint(position=(i * 2.0, 0, 0), name="chain%s" % i) for i in range(count)]
+    cmds.select(clear=True)
+    return cmds.ikHandle(startJoint=joints[0], endEffector=joints[-1], solver="ikSCsolver", name="chainIk")[0]
+
+
+def main():
+    if "--stand-in" in sys.argv:
+        benchUtils.loadPackage()
+        import fakeMaya
+        fakeMaya.install()
+    else:
+        benchUtils.initMaya()
+        benchUtils.loadPackage()
+    import maya.cmds as cmds
+    import StretchyIK
+
+    rows = []
+    for count in CHAIN_LENGTHS:
+        cmds.file(new=True, force=True)
+        handle = makeChain(cmds, count)
+        before = len(cmds.ls())
+        seconds, (counter, _) = benchUtils.timed(benchUtils.countCalls, StretchyIK.makeStretchyIK, handle)
+        nodes = len(cmds.ls()) - before
+        # the old engine: network, stretch group and a node per pickWalk step
+        rows.append(("%s joints" % count, "%7.4fs %5d calls %4d nodes (was %d)" % (
+            seconds, counter.total(), nodes, NETWORK_NODES + 1 + count)))
+    benchUtils.report("makeStretchyIK by chain length", rows)
+
+
+if __name__ == "__main__":
+    main()
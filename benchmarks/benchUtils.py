@@ -0,0 +1,160 @@
+''' shared setup for the MagicRig benchmarks
+
+Benchmarks are run from a shell with mayapy, e.g.
+    mayapy benchmarks/benchShapes.py
+'''
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loadPackage():
+    ''' make MagicRig modules importable without running the package __init__ '''
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    if "MagicRig" not in sys.modules:
+        package = types.ModuleType("MagicRig")
+        package.__path__ = [ROOT]
+        sys.modules["MagicRig"] = package
+    return sys.modules["MagicRig"]
+
+
+def initMaya():
+    ''' start maya standalone if we are not already inside maya '''
+    import maya.standalone
+    try:
+        maya.standalone.initialize(name="python")
+    except RuntimeError:
+        pass
+
+
+def newScene(prefix="bench", cmds=None):
+    ''' empty scene with a MR_Root node, same as AutoRig.startup
+    Kwargs:
+        cmds (module) stand in for maya.cmds, e.g. RigPlan.cmds
+    '''
+    if cmds is None:
+        import maya.cmds as cmds
+    loadPackage()
+    from MagicRig.rignode import MrNode
+    cmds.file(new=True, force=True)
+    rootNode = MrNode("MR_Root")
+    rootNode.addAttr("prefix", value=prefix)
+    rootNode.addAttr("masterScale", value=1.0)
+    rootNode.addAttr("masterControl")
+    rootNode.addAttr("proxyObjects")
+    rootNode.addAttr("controls")
+    return rootNode
+
+
+def timed(func, *args, **kwargs):
+    ''' call func and return (seconds, result) '''
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def report(title, rows):
+    ''' print a simple aligned table
+    Args:
+        title (string) heading
+        rows (list) of (label, value) pairs
+    '''
+    print("\n" + title)
+    print("-" * len(title))
+    width = max(len(str(r[0])) for r in rows)
+    for label, value in rows:
+        print(str(label).ljust(width + 2) + str(value))
+
+
+class CallCounter(object):
+    ''' stands in for maya.cmds and counts every command called through it '''
+    def __init__(self, cmds):
+        self._cmds = cmds
+        self.counts = {}
+
+
+    def __getattr__(self, name):
+        func = getattr(self._cmds, name)
+        counts = self.counts
+
+        def counted(*args, **kwargs):
+            counts[name] = counts.get(name, 0) + 1
+            return func(*args, **kwargs)
+        return counted
+
+
+    def total(self):
+        return sum(self.counts.values())
+
+
+def magicRigModules():
+    ''' loaded MagicRig modules that use maya.cmds or maya.mel '''
+    modules = []
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None) or ""
+        if path and os.path.dirname(os.path.abspath(path)) == ROOT and (hasattr(module, "cmds") or hasattr(module, "mel")):
+            modules.append(module)
+    return modules
+
+
+def countCalls(func, *args, **kwargs):
+    ''' run func with cmds calls of every MagicRig module counted
+    Returns:
+        (CallCounter, result)
+    '''
+    import maya.cmds
+    import maya.mel
+    counter = CallCounter(maya.cmds)
+    melCounter = CallCounter(maya.mel)
+    modules = magicRigModules()
+    for module in modules:
+        if hasattr(module, "cmds"):
+            module.cmds = counter
+        if hasattr(module, "mel"):
+            module.mel = melCounter
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        for module in modules:
+            if hasattr(module, "cmds"):
+                module.cmds = maya.cmds
+            if hasattr(module, "mel"):
+                module.mel = maya.mel
+    for name, count in melCounter.counts.items():
+        counter.counts["mel." + name] = count
+    return counter, result
+
+
+def buildBiped(spineJointNum=4, numFingers=5, numToes=0, armRoll=True, stretchy=True, cmds=None):
+    ''' proxies, skeleton and controls for a biped, same steps as AutoRig '''
+    if cmds is None:
+        import maya.cmds as cmds
+    loadPackage()
+    from MagicRig import rigparts
+    from MagicRig.Control import Control
+    root = rigparts.root("rootRig")
+    spine = rigparts.spine("spineRig", spineJointNum)
+    legL = rigparts.leg("legRigL", "L", stretchy, numToes)
+    legR = rigparts.leg("legRigR", "R", stretchy, numToes)
+    head = rigparts.head("headRig")
+    armL = rigparts.arm("armRigL", "L", numFingers, armRoll, stretchy)
+    armR = rigparts.arm("armRigR", "R", numFingers, armRoll, stretchy)
+
+    root.toJoint()
+    spine.toJoint(root.rootJoint)
+    legL.toJoint(root.rootJoint)
+    legR.toJoint(root.rootJoint)
+    armL.toJoint(spine.topJoint)
+    armR.toJoint(spine.topJoint)
+    head.toJoint(spine.topJoint)
+    cmds.delete("proxyExtra")
+
+    superMover = Control("Master_Control", shape="ctrlMultiArrow", scale=2.2, parent=None, master=True)
+    cmds.disconnectAttr("MR_Root.controls", superMover.ctrlName + ".controlName")
+    cmds.connectAttr("MR_Root.masterControl", superMover.ctrlName + ".controlName")
+    for part in (head, spine, legL, legR, armL, armR):
+        part.control()
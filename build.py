@@ -0,0 +1,504 @@
+''' headless rig building, the AutoRig steps without the window
+
+Every option the window reads from its widgets is an argument here, so
+builds can run from mayapy, batch jobs or tests.
+'''
+import maya.cmds as cmds
+import nameIndex
+import mirror
+import proxyLayout
+import partTracker
+import roleIndex
+import buildContext
+from buildContext import undoable, building, driving
+from Control import Control
+from . import rigparts
+from .rignode import MrNode
+
+RIG_TYPES = ("biped", "quad")
+
+# window.ui defaults
+DEFAULTS = {
+    "spineJoints": 4,
+    # back controls of the spline spine, 2 to 5
+    "spineCtrls": 4,
+    "fingers": 5,
+    "toes": 0,
+    "tailJoints": 4,
+    "scale": 1.0,
+    "stretchy": True,
+    "armRoll": True,
+    # how joints follow controls, see buildContext.DRIVE_MODES
+    "drive": "constraint",
+}
+
+
+# part: (part it hangs off, joint attribute of that part), in skeleton build order
+HIERARCHY = {
+    "biped": (("root", None), ("spine", ("root", "rootJoint")),
+              ("legL", ("root", "rootJoint")), ("legR", ("root", "rootJoint")),
+              ("armL", ("spine", "topJoint")), ("armR", ("spine", "topJoint")),
+              ("head", ("spine", "topJoint"))),
+    "quad": (("root", None), ("spine", ("root", "rootJoint")),
+             ("legFrontL", ("spine", "topJoint")), ("legFrontR", ("spine", "topJoint")),
+             ("legBackL", ("root", "rootJoint")), ("legBackR", ("root", "rootJoint")),
+             ("head", ("spine", "topJoint")), ("tail", ("root", "rootJoint"))),
+}
+# parts that get controls, in order
+CONTROLS = {
+    "biped": ("head", "spine", "legL", "legR", "armL", "armR"),
+    "quad": ("spine", "legFrontL", "legFrontR", "legBackL", "legBackR", "head", "tail"),
+}
+
+
+def partSpecs(rigType, settings):
+    ''' the rig parts of a rig type, in proxy build order
+    Args:
+        rigType (string) "biped" or "quad"
+        settings (dict) DEFAULTS keys
+    Returns:
+        list of (part name, class, constructor args)
+    '''
+    if rigType == "biped":
+        return [("root", rigparts.root, ("rootRig",)),
+                ("spine", rigparts.spine, ("spineRig", settings["spineJoints"], settings["spineCtrls"])),
+                ("legL", rigparts.leg, ("legRigL", "L", settings["stretchy"], settings["toes"])),
+                ("legR", rigparts.leg, ("legRigR", "R", settings["stretchy"], settings["toes"])),
+                ("head", rigparts.head, ("headRig",)),
+                ("armL", rigparts.arm, ("armRigL", "L", settings["fingers"], settings["armRoll"], settings["stretchy"])),
+                ("armR", rigparts.arm, ("armRigR", "R", settings["fingers"], settings["armRoll"], settings["stretchy"]))]
+    return [("root", rigparts.root, ("root",)),
+            ("spine", rigparts.spine, ("spineRig", settings["spineJoints"], settings["spineCtrls"])),
+            ("legFrontL", rigparts.quadLeg, ("Front_L", "L", 0)),
+            ("legFrontR", rigparts.quadLeg, ("Front_R", "R", 0)),
+            ("legBackL", rigparts.quadLeg, ("Back_L", "L", 0)),
+            ("legBackR", rigparts.quadLeg, ("Back_R", "R", 0)),
+            ("head", rigparts.head, ("head",)),
+            ("tail", rigparts.tail, ("tail", settings["tailJoints"]))]
+
+
+def startup(prefix=" "):
+    ''' make the MR_Root node if the scene has none
+    Kwargs:
+        prefix (string) character name
+    Returns:
+        MrNode or None if MR_Root already exists
+    '''
+    if cmds.objExists("MR_Root"):
+        return None
+    # a new scene, the indexes still hold the names and roles of the last one
+    nameIndex.beginSession()
+    rootNode = MrNode("MR_Root")
+    rootNode.addAttr("prefix", value=prefix or " ")
+    rootNode.addAttr("masterScale", value=1.0)
+    rootNode.addAttr("masterControl")
+    rootNode.addAttr("proxyObjects")
+    rootNode.addAttr("controls")
+    rootNode.addAttr("roles", value="{}")
+    rootNode.addAttr("driveMode", value=buildContext.driveMode)
+    roleIndex.index.clear()
+    mirror.index.clear()
+    return rootNode
+
+
+def resetProxyObjects():
+    ''' remove the old proxies before laying out new ones '''
+    if cmds.objExists("proxyExtra"):
+        nameIndex.delete("proxyExtra")
+    cmds.deleteAttr("MR_Root.proxyObjects")
+    cmds.addAttr("MR_Root", ln="proxyObjects", at="message")
+    mirror.index.clear()
+
+
+def makeParts(specs, tracker):
+    ''' make the proxies of each part in specs
+    Returns:
+        dict of part name: rig part
+    '''
+    parts = {}
+    for name, cls, args in specs:
+        with tracker.track(name):
+            parts[name] = cls(*args)
+    return parts
+
+
+@undoable("MagicRig proxy biped")
+def makeProxyBiped(spineJoints=4, fingers=5, toes=0, stretchy=True, armRoll=True, spineCtrls=4):
+    ''' layout proxies for biped rig
+    Returns:
+        dict of part name: rig part
+    '''
+    nameIndex.beginSession()
+    resetProxyObjects()
+    settings = dict(spineJoints=spineJoints, fingers=fingers, toes=toes, stretchy=stretchy, armRoll=armRoll,
+                    spineCtrls=spineCtrls)
+    tracker = partTracker.NodeTracker()
+    parts = makeParts(partSpecs("biped", settings), tracker)
+    # initial mirror
+    cmds.select(clear=True)
+    mirrorProxy("R")
+    roleIndex.index.save(parts)
+    partTracker.saveNodes(parts, tracker)
+    return parts
+
+
+@undoable("MagicRig proxy quad")
+def makeProxyQuad(spineJoints=4, tailJoints=4, spineCtrls=4):
+    ''' layout proxies for quadruped rig
+    Returns:
+        dict of part name: rig part
+    '''
+    nameIndex.beginSession()
+    resetProxyObjects()
+    tracker = partTracker.NodeTracker()
+    parts = makeParts(partSpecs("quad", dict(spineJoints=spineJoints, tailJoints=tailJoints, spineCtrls=spineCtrls)),
+                      tracker)
+    cmds.move(0, 16, -8, parts["root"].rootJoint)
+    cmds.rotate(90, parts["spine"].mover, rotateX=True)
+    cmds.move(0, 16, 0, parts["spine"].mover)
+    cmds.move(2.4, 14, 5.662, parts["legFrontL"].mover)
+    cmds.move(-2.4, 14, 5.662, parts["legFrontR"].mover)
+    cmds.move(0, 17, 10, parts["head"].mover)
+    cmds.scale(1.3, 1.3, 1.3, parts["head"].mover)
+    cmds.move(0, 16, -10, parts["tail"].mover)
+    # initial mirror
+    cmds.select(clear=True)
+    mirrorProxy("R")
+    roleIndex.index.save(parts)
+    partTracker.saveNodes(parts, tracker)
+    return parts
+
+
+def makeProxy(rigType, settings):
+    ''' makeProxyBiped or makeProxyQuad with the options in settings '''
+    if rigType == "biped":
+        return makeProxyBiped(settings["spineJoints"], settings["fingers"], settings["toes"],
+                              settings["stretchy"], settings["armRoll"], settings["spineCtrls"])
+    return makeProxyQuad(settings["spineJoints"], settings["tailJoints"], settings["spineCtrls"])
+
+
+def makeSkeleton(parts, rigType, names=None):
+    ''' turn proxies into joints under the joints of their parent parts, then
+    add the controls
+    Args:
+        parts (dict) part name: rig part
+        rigType (string) "biped" or "quad"
+    Kwargs:
+        names (list) only these parts, the others are already built
+    '''
+    nameIndex.beginSession()
+    partTracker.record(dict((name, parts[name]) for name in names) if names else parts)
+    hierarchy = [h for h in HIERARCHY[rigType] if names is None or h[0] in names]
+    controls = [c for c in CONTROLS[rigType] if names is None or c in names]
+    tracker = partTracker.NodeTracker()
+    with building("MagicRig skeleton", len(hierarchy)) as progress:
+        for name, parent in hierarchy:
+            progress.step(name)
+            with tracker.track(name):
+                if parent:
+                    parts[name].toJoint(getattr(parts[parent[0]], parent[1]))
+                else:
+                    parts[name].toJoint()
+        if cmds.objExists("proxyExtra"):
+            nameIndex.delete("proxyExtra")
+        with building("MagicRig controls", len(controls)) as progress:
+            if names is None:
+                addMasterControl()
+            for name in controls:
+                progress.step(name + " controls")
+                with tracker.track(name):
+                    parts[name].control()
+            if rigType == "quad":
+                cleanup()
+    if not cmds.attributeQuery("driveMode", node="MR_Root", exists=True):
+        cmds.addAttr("MR_Root", longName="driveMode", dataType="string")
+    cmds.setAttr("MR_Root.driveMode", buildContext.driveMode, type="string")
+    roleIndex.index.save(parts)
+    partTracker.saveNodes(parts, tracker)
+
+
+@undoable("MagicRig skeleton biped")
+def makeSkeletonBiped(parts):
+    ''' turn biped proxies into joints and add the controls '''
+    makeSkeleton(parts, "biped")
+
+
+@undoable("MagicRig skeleton quad")
+def makeSkeletonQuad(parts):
+    ''' turn quadruped proxies into joints and add the controls '''
+    makeSkeleton(parts, "quad")
+
+
+def addMasterControl():
+    ''' master control every other control sits under '''
+    superMover = Control("Master_Control", shape="ctrlMultiArrow", scale=2.2, parent=None, master=True)
+    cmds.disconnectAttr("MR_Root.controls", superMover.ctrlName + ".controlName")
+    cmds.connectAttr("MR_Root.masterControl", superMover.ctrlName + ".controlName")
+    return superMover
+
+
+def addControls(parts, rigType):
+    ''' adds the master control and the controls of every part '''
+    names = CONTROLS[rigType]
+    with building("MagicRig controls", len(names)) as progress:
+        addMasterControl()
+        for name in names:
+            progress.step(name + " controls")
+            parts[name].control()
+        if rigType == "quad":
+            cleanup()
+
+
+def addControlsBiped(parts):
+    '''adds the controls to the biped character template'''
+    addControls(parts, "biped")
+
+
+def addControlsQuad(parts):
+    addControls(parts, "quad")
+
+
+def mirrorProxy(orient, plane="YZ"):
+    ''' mirror the proxies of the other side onto orient
+    Args:
+        orient (string) side to write, "L" or "R"
+    Kwargs:
+        plane (string) mirror plane, "YZ", "XZ" or "XY"
+    Returns:
+        number of proxies moved
+    '''
+    return mirror.index.mirror(orient, plane)
+
+
+def load():
+    ''' rebuild the rig parts of the current scene from MR_Root and its role index
+    Returns:
+        dict of part name: rig part
+    '''
+    return roleIndex.index.load(rigparts)
+
+
+def lookup(role):
+    ''' node saved for a role, e.g. lookup("armRigL.wrist") '''
+    return roleIndex.index.lookup(role)
+
+
+def scaleProxy(value):
+    '''change total size of proxy rig'''
+    cmds.scale(value, value, value, getPrefix() + "_Rig", pivot=(0, 0, 0))
+    cmds.setAttr("MR_Root.masterScale", value)
+
+
+def driveMode():
+    ''' drive mode the rig in the scene was built with, see buildContext '''
+    if cmds.attributeQuery("driveMode", node="MR_Root", exists=True):
+        return cmds.getAttr("MR_Root.driveMode") or "constraint"
+    return "constraint"
+
+
+def getPrefix():
+    ''' returns rig name '''
+    return cmds.getAttr("MR_Root.prefix")
+
+
+def cleanup():
+    # parent controllers left in world space to the master control
+    ctrlOffsets = []
+    controls = cmds.listConnections("MR_Root.controls") or []
+    for ctrl in controls:
+        offset = cmds.listConnections(ctrl + ".controlOffset")[0]
+        if not cmds.listRelatives(offset, parent=True):
+            ctrlOffsets.append(offset)
+    if ctrlOffsets:
+        masterCtrl = cmds.listConnections("MR_Root.masterControl")[0]
+        cmds.parent(ctrlOffsets, masterCtrl)
+
+
+def layoutOptions(parts):
+    ''' rig type and build options the parts were made with
+    Returns:
+        (rigType, dict of DEFAULTS keys)
+    '''
+    options = {"spineJoints": parts["spine"].sJointNum, "spineCtrls": parts["spine"].numCtrls}
+    if "tail" in parts:
+        options["tailJoints"] = parts["tail"].numJoints
+        return "quad", options
+    options.update(fingers=parts["armL"].numFingers, toes=parts["legL"].numToes,
+                   stretchy=parts["armL"].stretchy, armRoll=parts["armL"].armRoll)
+    return "biped", options
+
+
+def saveLayout(path, parts=None):
+    ''' write every proxy and part mover transform, the part options and the
+    master scale to a layout file, see proxyLayout
+    Kwargs:
+        parts (dict) rig parts of the scene, loaded from MR_Root by default
+    '''
+    parts = parts or load()
+    rigType, options = layoutOptions(parts)
+    nodes = roleIndex.index.values("mover") + (cmds.listConnections("MR_Root.proxyObjects") or [])
+    proxyLayout.write(path, rigType, options, cmds.getAttr("MR_Root.masterScale"), proxyLayout.capture(nodes))
+
+
+def applyLayout(layout, nodes=None):
+    ''' move the proxies and movers of the scene to a layout in one batched call
+    Args:
+        layout (string) layout file, or a layout already read by proxyLayout.read
+    Kwargs:
+        nodes (list) only move these nodes of the layout
+    Returns:
+        list of nodes in the layout that are not in the scene
+    '''
+    if not isinstance(layout, dict):
+        layout = proxyLayout.read(layout)
+    extra = []
+    if layout["masterScale"] is not None:
+        scale = layout["masterScale"]
+        rig = getPrefix() + "_Rig"
+        extra = [("MR_Root.masterScale", scale), (rig + ".scaleX", scale),
+                 (rig + ".scaleY", scale), (rig + ".scaleZ", scale)]
+    transforms = layout["nodes"]
+    if nodes is not None:
+        transforms = dict((node, transforms[node]) for node in nodes if node in transforms)
+    return proxyLayout.apply(transforms, extra)
+
+
+@undoable("MagicRig load layout")
+def loadLayout(path, prefix=None):
+    ''' make new proxies with the options of a layout file and move them to it
+    Any proxies already in the scene are removed first.
+    Args:
+        path (string) layout file, see saveLayout
+    Kwargs:
+        prefix (string) character name if the scene has no MR_Root yet
+    Returns:
+        dict of part name: rig part
+    '''
+    layout = proxyLayout.read(path)
+    if not layout["rigType"]:
+        raise ValueError("%s only has proxy positions, use applyLayout on existing proxies" % path)
+    if not startup(prefix or " "):
+        if cmds.objExists(getPrefix() + "_Rig"):
+            nameIndex.delete(getPrefix() + "_Rig")
+        oldParts = cmds.listConnections("MR_Root.child") or []
+        if oldParts:
+            nameIndex.delete(*oldParts)
+    settings = dict(DEFAULTS)
+    settings.update(layout["options"])
+    parts = makeProxy(layout["rigType"], settings)
+    applyLayout(layout)
+    return parts
+
+
+@undoable("MagicRig rebuild")
+def rebuild(layout, **options):
+    ''' rebuild only the parts whose options or proxies differ from what they
+    were built from, the result is the same as building the rig again
+    Args:
+        layout (string) proxy layout file, see saveLayout, or a layout read by proxyLayout.read
+    Kwargs:
+        undo (string) "chunk", "off" or "record", see buildContext
+        options: any of DEFAULTS, used over the layout's, drive is the
+            rig's own unless given, changing it rebuilds every part
+    Returns:
+        list of the part names rebuilt
+    '''
+    if not isinstance(layout, dict):
+        layout = proxyLayout.read(layout)
+    unknown = set(options) - set(DEFAULTS)
+    if unknown:
+        raise ValueError("Unknown build options: %s" % ", ".join(sorted(unknown)))
+    settings = dict(DEFAULTS)
+    settings.update(layout["options"])
+    if layout["masterScale"] is not None:
+        settings["scale"] = layout["masterScale"]
+    settings.update(options)
+    built = driveMode()
+    if "drive" not in options:
+        settings["drive"] = built
+
+    parts = load()
+    untracked = [part.name for part in parts.values() if not partTracker.tracked(part.name)]
+    if untracked:
+        raise RuntimeError("%s were built without dirty tracking, build the rig again in full"
+                           % ", ".join(untracked))
+    rigType = layout["rigType"] or ("quad" if "tail" in parts else "biped")
+    specs = partSpecs(rigType, settings)
+    parents = dict((name, parent[0] if parent else None) for name, parent in HIERARCHY[rigType])
+    dirty = partTracker.dirtyParts(parts, specs, layout["nodes"], settings["scale"], parents)
+    if settings["drive"] != built:
+        dirty = [name for name, _, _ in specs]
+    if not dirty:
+        return []
+
+    # tear down the dirty parts, and any the rig type does not have
+    nameIndex.beginSession()
+    names = set(name for name, _, _ in specs)
+    old = [part.name for name, part in parts.items() if name in dirty or name not in names]
+    nodes = [node for networkNode in old for node in partTracker.builtNodes(networkNode)]
+    nameIndex.delete(*(nodes + old))
+
+    resetProxyObjects()
+    tracker = partTracker.NodeTracker()
+    new = makeParts([spec for spec in specs if spec[0] in dirty], tracker)
+    parts = dict((name, new.get(name) or parts[name]) for name, _, _ in specs)
+    cmds.select(clear=True)
+    mirrorProxy("R")
+    # only the new proxies, the locators of built parts are pivots of their controls now
+    proxies = set(cmds.listConnections("MR_Root.proxyObjects") or [])
+    applyLayout(layout, [node for part in new.values() for node in partTracker.inputNodes(part, proxies)])
+    if settings["scale"] != cmds.getAttr("MR_Root.masterScale"):
+        scaleProxy(settings["scale"])
+    partTracker.saveNodes(parts, tracker)
+    with driving(settings["drive"]):
+        makeSkeleton(parts, rigType, dirty)
+    return dirty
+
+
+@undoable("MagicRig build character")
+def buildCharacter(prefix, rigType=None, layout=None, output=None, newScene=True, **options):
+    ''' build a whole character: proxies, optional layout, skeleton and controls
+    Args:
+        prefix (string) character name
+    Kwargs:
+        rigType (string) "biped" or "quad", default the layout's or "biped"
+        layout (string) proxy layout file, see saveLayout, its options are used
+            for any not given here
+        output (string) save the scene to this path, .ma saves maya ascii
+        newScene (bool) start from an empty scene
+        undo (string) "chunk", "off" or "record", see buildContext
+        options: any of DEFAULTS, e.g. spineJoints=5, drive="matrix"
+    Returns:
+        dict of part name: rig part
+    '''
+    unknown = set(options) - set(DEFAULTS)
+    if unknown:
+        raise ValueError("Unknown build options: %s" % ", ".join(sorted(unknown)))
+    settings = dict(DEFAULTS)
+    if layout:
+        layout = proxyLayout.read(layout)
+        rigType = rigType or layout["rigType"]
+        settings.update(layout["options"])
+        if layout["masterScale"] is not None:
+            settings["scale"] = layout["masterScale"]
+    rigType = rigType or "biped"
+    if rigType not in RIG_TYPES:
+        raise ValueError("Unknown rig type: %s" % rigType)
+    settings.update(options)
+    if newScene:
+        cmds.file(new=True, force=True)
+    startup(prefix)
+    parts = makeProxy(rigType, settings)
+    if layout:
+        applyLayout(layout)
+    if settings["scale"] != 1.0:
+        scaleProxy(settings["scale"])
+    with driving(settings["drive"]):
+        if rigType == "biped":
+            makeSkeletonBiped(parts)
+        else:
+            makeSkeletonQuad(parts)
+    if output:
+        cmds.file(rename=output)
+        cmds.file(save=True, force=True, type="mayaAscii" if output.endswith(".ma") else "mayaBinary")
+    return parts
@@ -0,0 +1,200 @@
+''' scene state held for the length of a build
+
+Undo modes for the build entry points:
+    "chunk"   everything the build does is one named undo step, the default
+    "off"     the undo queue is off while building and put back afterwards,
+              the fast build, nothing can be undone
+    "record"  every cmds call is its own undo step, as maya would do it
+
+    from MagicRig import build
+    build.buildCharacter("hero", undo="off")
+    build.makeProxyBiped(undo="record")
+
+While building, suspended() stops viewport refresh and turns the
+evaluation manager off so maya does not redraw or rebuild its graph
+after each command; both are put back and the scene evaluated once at
+the end. building() adds a progress window on top, and works around
+any rig part method:
+
+    with buildContext.building("Arm controls", 1) as progress:
+        progress.step("armL")
+        parts["armL"].control()
+
+Drive modes, how rig parts make joints and control offsets follow
+controls, see rigUtils.drive:
+    "constraint"  point, orient and parent constraints, the default
+    "matrix"      offsetParentMatrix, multMatrix, decomposeMatrix and
+                  blendMatrix connections, no constraint nodes
+
+    build.buildCharacter("hero", drive="matrix")
+'''
+import functools
+from contextlib import contextmanager
+
+import maya.cmds as cmds
+
+UNDO_MODES = ("chunk", "off", "record")
+DRIVE_MODES = ("constraint", "matrix")
+
+# mode used when an entry point is called without undo=
+undoMode = "chunk"
+# drive mode of rig parts built outside driving()
+driveMode = "constraint"
+# entry points currently running, nested ones run inside the outer mode
+running = 0
+# Progress of the outermost building() context
+progress = None
+
+
+@contextmanager
+def undoChunk(name="MagicRig"):
+    ''' group every command inside into one undo step '''
+    cmds.undoInfo(openChunk=True, chunkName=name)
+    try:
+        yield
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+
+@contextmanager
+def undoSuspended():
+    ''' turn the undo queue off inside, the queue is kept and turned back on after '''
+    state = cmds.undoInfo(query=True, state=True)
+    cmds.undoInfo(stateWithoutFlush=False)
+    try:
+        yield
+    finally:
+        cmds.undoInfo(stateWithoutFlush=state)
+
+
+@contextmanager
+def undoContext(mode, name="MagicRig"):
+    ''' undoChunk, undoSuspended or nothing for one of UNDO_MODES '''
+    if mode not in UNDO_MODES:
+        raise ValueError("Unknown undo mode: %s, use one of %s" % (mode, ", ".join(UNDO_MODES)))
+    if mode == "chunk":
+        with undoChunk(name):
+            yield
+    elif mode == "off":
+        with undoSuspended():
+            yield
+    else:
+        yield
+
+
+def undoable(name):
+    ''' decorator for build entry points, adds an undo keyword
+    Kwargs of the decorated function:
+        undo (string) one of UNDO_MODES, default undoMode
+    '''
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            global running
+            mode = kwargs.pop("undo", None) or undoMode
+            if running:
+                return func(*args, **kwargs)
+            running += 1
+            try:
+                with undoContext(mode, name):
+                    return func(*args, **kwargs)
+            finally:
+                running -= 1
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def driving(mode):
+    ''' rig parts drive with mode inside, one of DRIVE_MODES '''
+    global driveMode
+    if mode not in DRIVE_MODES:
+        raise ValueError("Unknown drive mode: %s, use one of %s" % (mode, ", ".join(DRIVE_MODES)))
+    previous = driveMode
+    driveMode = mode
+    try:
+        yield
+    finally:
+        driveMode = previous
+
+
+@contextmanager
+def suspended():
+    ''' no viewport refresh or evaluation manager inside, one evaluation after '''
+    batch = cmds.about(batch=True)
+    refresh = cmds.refresh(query=True, suspend=True) if not batch else False
+    mode = cmds.evaluationManager(query=True, mode=True)[0]
+    if not batch:
+        cmds.refresh(suspend=True)
+    cmds.evaluationManager(mode="off")
+    try:
+        yield
+    finally:
+        cmds.evaluationManager(mode=mode)
+        if not batch:
+            cmds.refresh(suspend=refresh)
+            if not refresh:
+                cmds.refresh(force=True)
+
+
+class Progress(object):
+    ''' build progress in maya's progress window, which still draws with refresh suspended
+    Args:
+        title (string) window title
+        total (int) number of steps
+    Kwargs:
+        log (function) also called with each step's status, e.g. print in batch
+    '''
+    def __init__(self, title, total, log=None):
+        self.title = title
+        self.total = total
+        self.count = 0
+        self.log = log
+        self.visible = not cmds.about(batch=True)
+
+
+    def start(self):
+        if self.visible:
+            cmds.progressWindow(title=self.title, progress=0, maxValue=max(self.total, 1),
+                                status="", isInterruptable=False)
+
+
+    def addSteps(self, steps):
+        self.total += steps
+        if self.visible:
+            cmds.progressWindow(edit=True, maxValue=max(self.total, 1))
+
+
+    def step(self, status=""):
+        ''' move on one step, status says what is being built next '''
+        self.count += 1
+        if self.visible:
+            cmds.progressWindow(edit=True, progress=min(self.count, self.total), status=status)
+        if self.log:
+            self.log("%s %s/%s %s" % (self.title, self.count, self.total, status))
+
+
+    def end(self):
+        if self.visible:
+            cmds.progressWindow(endProgress=True)
+
+
+@contextmanager
+def building(title="MagicRig", steps=0, log=None):
+    ''' suspended() with a Progress, nested contexts add their steps to the outer one
+    Yields:
+        Progress
+    '''
+    global progress
+    if progress is not None:
+        progress.addSteps(steps)
+        yield progress
+        return
+    progress = Progress(title, steps, log)
+    progress.start()
+    try:
+        with suspended():
+            yield progress
+    finally:
+        progress.end()
+        progress = None
@@ -0,0 +1,51 @@
+''' in memory stand-in for maya.cmds, maya.mel and maya.standalone
+
+Runs MagicRig without maya, for tests and benchmarks:
+
+    import fakeMaya
+    fakeMaya.install()
+    import maya.cmds as cmds    # now the fake
+
+The scene is a planScene.Scene, reset it between builds with reset().
+'''
+import sys
+import types
+
+import planScene
+
+scene = planScene.Scene()
+cmds = planScene.SceneCmds(scene)
+mel = planScene.SceneMel(cmds)
+
+
+def initialize(name="python"):
+    ''' maya.standalone.initialize, nothing to start '''
+    pass
+
+
+def uninitialize():
+    pass
+
+
+standalone = types.ModuleType("maya.standalone")
+standalone.initialize = initialize
+standalone.uninitialize = uninitialize
+
+
+def install():
+    ''' register the fake as the maya package, must run before MagicRig is imported '''
+    maya = types.ModuleType("maya")
+    maya.__path__ = []
+    maya.cmds = cmds
+    maya.mel = mel
+    maya.standalone = standalone
+    sys.modules["maya"] = maya
+    sys.modules["maya.cmds"] = cmds
+    sys.modules["maya.mel"] = mel
+    sys.modules["maya.standalone"] = standalone
+    return maya
+
+
+def reset():
+    ''' empty the scene, like file -new '''
+    scene.new()
@@ -0,0 +1,276 @@
+''' match a limb's FK controls to its IK pose, or IK to FK, now or baked over frames
+
+FkIkBlend keeps FKJ_ and IKJ_ copies of each limb chain that are always
+posed, whatever the switch is at, so the chain to match is read with
+getAttr -time for every frame without moving the current time. Controls
+are worked out in python from the offsets they have to their chain now,
+and each channel is written as one animation curve, all of its keys in
+one setAttr of keyTimeValue, every channel in one MEL call.
+
+    import fkIkMatch
+    fkIkMatch.limbs()                         # ["ArmL", "ArmR", "LegL", "LegR"]
+    fkIkMatch.bake("ArmL", "fk", 1, 2000)     # FK arm follows the IK arm, keyed
+    fkIkMatch.match("LegR", "ik")             # IK leg snaps to FK at the current frame
+
+Controls are taken to have the default xyz rotate order.
+'''
+import json
+
+import maya.cmds as cmds
+
+import vecMath
+from melBatch import MelBatch
+
+# string attribute on the switch control with the controls of every limb
+ATTR = "fkIkLimbs"
+MODES = ("fk", "ik")
+# animation curve type for each keyed channel
+CURVE_TYPES = {"translate": "animCurveTL", "rotate": "animCurveTA"}
+
+
+def switchControl():
+    ''' control the FK/IK switches are on, the master control '''
+    return cmds.listConnections("MR_Root.masterControl")[0]
+
+
+def saveLimb(switchCtrl, limb, joints, fkCtrls, ikCtrl, pvCtrl):
+    ''' keep the controls of a limb on its switch control, called by FkIkBlend
+    Args:
+        switchCtrl (string) control with the Blend_FkIk_<limb> switch
+        limb (string) limb name with side, e.g. "ArmL"
+        joints (list) the 3 blended joints
+        fkCtrls (list) the 3 FK controls
+        ikCtrl (string) IK control
+        pvCtrl (string) pole vector control
+    '''
+    if not cmds.attributeQuery(ATTR, node=switchCtrl, exists=True):
+        cmds.addAttr(switchCtrl, longName=ATTR, dataType="string")
+    saved = json.loads(cmds.getAttr(switchCtrl + "." + ATTR) or "{}")
+    saved[limb] = {"joints": list(joints), "fk": list(fkCtrls), "ik": ikCtrl, "pv": pvCtrl}
+    cmds.setAttr(switchCtrl + "." + ATTR, json.dumps(saved, separators=(",", ":")), type="string")
+
+
+def limbs():
+    ''' names of the limbs that can be matched, e.g. ["ArmL", "ArmR"] '''
+    switchCtrl = switchControl()
+    if not cmds.attributeQuery(ATTR, node=switchCtrl, exists=True):
+        return []
+    return sorted(json.loads(cmds.getAttr(switchCtrl + "." + ATTR) or "{}"))
+
+
+def loadLimb(limb):
+    ''' controls of limb as saved by saveLimb, with the switch plug '''
+    switchCtrl = switchControl()
+    saved = {}
+    if cmds.attributeQuery(ATTR, node=switchCtrl, exists=True):
+        saved = json.loads(cmds.getAttr(switchCtrl + "." + ATTR) or "{}")
+    if limb not in saved:
+        raise ValueError("No FK/IK limb named %s, rebuild the rig to save its controls" % limb)
+    data = dict(saved[limb])
+    data["switch"] = switchCtrl + ".Blend_FkIk_" + limb
+    return data
+
+
+def matrixAt(plug, frame=None):
+    ''' 4x4 matrix of a plug at frame, the current time if frame is None '''
+    if frame is None:
+        return vecMath.unflatten(cmds.getAttr(plug))
+    return vecMath.unflatten(cmds.getAttr(plug, time=frame))
+
+
+def switchValue(plug, mode):
+    ''' switch value for mode, legacy switches go up to 10 for FK '''
+    if mode == "ik":
+        return 0.0
+    node, attr = plug.split(".", 1)
+    if cmds.attributeQuery(attr, node=node, maxExists=True):
+        return cmds.attributeQuery(attr, node=node, maximum=True)[0]
+    return 1.0
+
+
+def eulerFilter(rotate, previous):
+    ''' the euler angles for rotate closest to previous, no 360 degree jumps or flips '''
+    best, bestDistance = rotate, None
+    for candidate in (rotate, [rotate[0] + 180.0, 180.0 - rotate[1], rotate[2] + 180.0]):
+        unwrapped = [c + 360.0 * round((p - c) / 360.0) for c, p in zip(candidate, previous)]
+        distance = sum(abs(c - p) for c, p in zip(unwrapped, previous))
+        if bestDistance is None or distance < bestDistance:
+            best, bestDistance = unwrapped, distance
+    return best
+
+
+def poleVector(start, mid, end, distance, previous):
+    ''' pole vector position out from mid, away from the start-end line
+    Falls back on the previous direction when the chain is straight.
+    '''
+    line = vecMath.sub(end, start)
+    lineLength = vecMath.dot(line, line)
+    t = vecMath.dot(vecMath.sub(mid, start), line) / lineLength if lineLength else 0.0
+    out = vecMath.sub(mid, vecMath.add(start, vecMath.mul(line, t)))
+    if vecMath.length(out) < 1e-6:
+        out = previous
+    out = vecMath.normalize(out)
+    return vecMath.add(mid, vecMath.mul(out, distance)), out
+
+
+def solveFk(data, frames):
+    ''' FK control rotations that put the FK chain on the IK chain
+    Returns:
+        dict of plug: list of values, one per frame
+    '''
+    joints, ctrls = data["joints"], data["fk"]
+    # constant rotation offsets: control to its joint, and each control's parent to the control above it
+    offsets = []
+    for joint, ctrl in zip(joints, ctrls):
+        ctrlWorld = matrixAt(ctrl + ".worldMatrix[0]")
+        offsets.append(vecMath.rotationMatrix(vecMath.matMul(ctrlWorld, vecMath.matInverse(matrixAt("FKJ_" + joint + ".worldMatrix[0]")))))
+    parents = [None]
+    for above, ctrl in zip(ctrls, ctrls[1:]):
+        local = vecMath.matMul(matrixAt(ctrl + ".parentMatrix[0]"), vecMath.matInverse(matrixAt(above + ".worldMatrix[0]")))
+        parents.append(vecMath.rotationMatrix(local))
+
+    values = dict((ctrl + ".rotate" + axis, []) for ctrl in ctrls for axis in "XYZ")
+    previous = dict((ctrl, list(cmds.getAttr(ctrl + ".rotate")[0])) for ctrl in ctrls)
+    for frame in frames:
+        parentWorld = vecMath.rotationMatrix(matrixAt(ctrls[0] + ".parentMatrix[0]", frame))
+        for i, (joint, ctrl) in enumerate(zip(joints, ctrls)):
+            if parents[i] is not None:
+                parentWorld = vecMath.matMul(parents[i], parentWorld)
+            world = vecMath.matMul(offsets[i], vecMath.rotationMatrix(matrixAt("IKJ_" + joint + ".worldMatrix[0]", frame)))
+            local = vecMath.matMul(world, vecMath.matInverse(parentWorld))
+            rotate = eulerFilter(vecMath.matrixToEuler(local), previous[ctrl])
+            previous[ctrl] = rotate
+            for axis, value in zip("XYZ", rotate):
+                values[ctrl + ".rotate" + axis].append(value)
+            parentWorld = world
+    return values
+
+
+def solveIk(data, frames):
+    ''' IK control and pole vector positions that put the IK chain on the FK chain
+    Returns:
+        dict of plug: list of values, one per frame
+    '''
+    joints, ikCtrl, pvCtrl = data["joints"], data["ik"], data["pv"]
+    # the IK control's offset to the end joint, and how far out the pole vector sits
+    offset = vecMath.matMul(matrixAt(ikCtrl + ".worldMatrix[0]"), vecMath.matInverse(matrixAt("IKJ_" + joints[2] + ".worldMatrix[0]")))
+    pvPosition = matrixAt(pvCtrl + ".worldMatrix[0]")[3][:3]
+    distance = vecMath.distance(pvPosition, matrixAt("IKJ_" + joints[1] + ".worldMatrix[0]")[3][:3])
+    direction = vecMath.sub(pvPosition, matrixAt("IKJ_" + joints[1] + ".worldMatrix[0]")[3][:3])
+
+    values = dict((plug, []) for plug in [ikCtrl + ".translate" + a for a in "XYZ"] +
+                  [ikCtrl + ".rotate" + a for a in "XYZ"] + [pvCtrl + ".translate" + a for a in "XYZ"])
+    previous = list(cmds.getAttr(ikCtrl + ".rotate")[0])
+    for frame in frames:
+        chain = [matrixAt("FKJ_" + joint + ".worldMatrix[0]", frame) for joint in joints]
+        world = vecMath.matMul(offset, chain[2])
+        translate, rotate, _ = vecMath.decomposeMatrix(vecMath.matMul(world, vecMath.matInverse(matrixAt(ikCtrl + ".parentMatrix[0]", frame))))
+        rotate = previous = eulerFilter(rotate, previous)
+        position, direction = poleVector(chain[0][3][:3], chain[1][3][:3], chain[2][3][:3], distance, direction)
+        pvTranslate = vecMath.transformPoint(position, vecMath.matInverse(matrixAt(pvCtrl + ".parentMatrix[0]", frame)))
+        for plug, value in zip(("translate", "rotate"), (translate, rotate)):
+            for axis, v in zip("XYZ", value):
+                values[ikCtrl + "." + plug + axis].append(v)
+        for axis, v in zip("XYZ", pvTranslate):
+            values[pvCtrl + ".translate" + axis].append(v)
+    return values
+
+
+def solve(limb, mode, frames):
+    ''' control values that match limb to mode at each frame
+    Args:
+        limb (string) limb name, see limbs()
+        mode (string) "fk" to pose the FK controls on the IK chain, "ik" for the reverse
+        frames (list) frames to solve, None for the current time
+    Returns:
+        (limb data, dict of plug: list of values)
+    '''
+    if mode not in MODES:
+        raise ValueError("Unknown FK/IK mode: %s, use one of %s" % (mode, ", ".join(MODES)))
+    data = loadLimb(limb)
+    return data, (solveFk if mode == "fk" else solveIk)(data, frames)
+
+
+def curveType(plug):
+    attr = plug.rsplit(".", 1)[-1]
+    return CURVE_TYPES.get(attr[:-1], "animCurveTU")
+
+
+def addKeys(batch, plug, times, values, created=None):
+    ''' queue the keys of one channel as a single keyTimeValue setAttr
+    Keys already on the channel inside the frame range are replaced, the
+    ones outside it are kept. The whole curve is rewritten in place, only
+    keys past the new key count are cut so the curve is never emptied,
+    maya deletes an animCurve that loses all of its keys.
+    Kwargs:
+        created (list) new curves are appended to it
+    '''
+    curve = (cmds.keyframe(plug, query=True, name=True) or [None])[0]
+    keys = dict(zip(times, values))
+    if curve:
+        old = cmds.keyframe(plug, query=True, timeChange=True, valueChange=True) or []
+        for i in range(0, len(old), 2):
+            if not min(times) <= old[i] <= max(times):
+                keys.setdefault(old[i], old[i + 1])
+        if len(old) // 2 > len(keys):
+            cmds.cutKey(plug, index=(len(keys), len(old) // 2 - 1), clear=True)
+    else:
+        curve = cmds.createNode(curveType(plug), name=plug.replace(".", "_"))
+        if created is not None:
+            created.append(curve)
+        batch.add("connectAttr", curve + ".output", plug)
+    flat = [v for time in sorted(keys) for v in (time, keys[time])]
+    batch.add("setAttr", "%s.keyTimeValue[0:%d]" % (curve, len(keys) - 1), flat, size=len(keys))
+    return curve
+
+
+def match(limb, mode, switch=True):
+    ''' snap the controls of one side of limb onto the other at the current time
+    Args:
+        limb (string) limb name, see limbs()
+        mode (string) "fk" or "ik", the side that is moved
+    Kwargs:
+        switch (bool) also set the limb's switch to mode
+    '''
+    data, values = solve(limb, mode, [None])
+    batch = MelBatch()
+    for plug, value in sorted(values.items()):
+        batch.add("setAttr", plug, value[0])
+    if switch:
+        batch.add("setAttr", data["switch"], switchValue(data["switch"], mode))
+    batch.flush()
+
+
+def bake(limb, mode, start, end, switch=True):
+    ''' key the controls of one side of limb onto the other, every frame from start to end
+    The current time is never changed. Each channel gets all of its keys
+    in one setAttr, and every channel is written by one MEL call.
+    Args:
+        limb (string) limb name, see limbs()
+        mode (string) "fk" or "ik", the side that is keyed
+        start (int) first frame
+        end (int) last frame
+    Kwargs:
+        switch (bool) also key the limb's switch to mode at start and end
+    Returns:
+        number of keys set
+    '''
+    frames = list(range(int(start), int(end) + 1))
+    data, values = solve(limb, mode, frames)
+    batch = MelBatch()
+    created = []
+    try:
+        for plug, value in sorted(values.items()):
+            addKeys(batch, plug, frames, value, created)
+        count = len(frames) * len(values)
+        if switch:
+            value = switchValue(data["switch"], mode)
+            addKeys(batch, data["switch"], [frames[0], frames[-1]], [value, value], created)
+            count += 2
+        batch.flush()
+    except Exception:
+        # don't leave unconnected or empty curves behind
+        if created:
+            cmds.delete(created)
+        raise
+    return count
@@ -0,0 +1,155 @@
+''' joint orients worked out in python instead of maya's orient pass
+
+solve() takes the world positions of a chain or tree of joints and returns
+the translate and joint orient of every joint at once, what
+
+    cmds.joint(root, edit=True, orientJoint="xyz", secondaryAxisOrient="yup", children=True)
+
+leaves on them, so they can be written in one batch or worked out ahead
+of time in a plan-only build. orientJoints() does the query, solve and
+write for the joints in the scene:
+
+    jointOrient.orientJoints("ClavicleL", "xyz", jointOrient.sideRule("yup", "L"))
+
+Each joint aims the first axis of orient at its first child joint and
+turns the second towards the secondaryAxisOrient world direction, "yup",
+"ydown", "zup" ... or "none" to use the parent joint's y axis. End
+joints, and joints sitting on their first child, take their parent's
+orientation. A joint aiming along the up direction, like a leg straight
+below the hip with "yup", keeps the third axis of its parent joint, so
+the hip turns about world z only. Joints are assumed to have a scale of
+1 under a uniformly scaled parent, as the rig parts build them.
+'''
+import maya.cmds as cmds
+
+import vecMath
+from melBatch import MelBatch
+
+AXES = "xyz"
+
+
+def sideRule(rule, side):
+    ''' secondaryAxisOrient for one side, left joints flip up and down so
+    both sides mirror, e.g. sideRule("yup", "L") returns "ydown"
+    '''
+    if side != "L" or rule == "none":
+        return rule
+    if rule.endswith("down"):
+        return rule[:-4] + "up"
+    return rule[:-2] + "down"
+
+
+def upVector(rule):
+    ''' world direction of a secondaryAxisOrient rule, None for "none" '''
+    if not rule or rule == "none":
+        return None
+    up = [0.0, 0.0, 0.0]
+    up[AXES.index(rule[0])] = -1.0 if rule.endswith("down") else 1.0
+    return up
+
+
+def chainParents(count):
+    ''' parent indices of a single chain of count joints '''
+    return [None] + list(range(count - 1))
+
+
+def worldRotations(positions, orient="xyz", secondaryAxisOrient="yup", parents=None, parentMatrix=None):
+    ''' world rotation matrix of every joint
+    Args:
+        positions (list) world position of each joint, parents before their children
+    Kwargs:
+        orient (string) aim axis then up axis, e.g. "xyz", or "none" to follow the parent
+        secondaryAxisOrient (string) up rule, "yup", "ydown", "zup" ... or "none"
+        parents (list) index in positions of each joint's parent, None for the
+            root, default a single chain
+        parentMatrix (list) 4x4 world matrix of the root's parent, default identity
+    Returns:
+        list of 4x4 rotation matrices
+    '''
+    if parents is None:
+        parents = chainParents(len(positions))
+    firstChild = {}
+    for i, parent in enumerate(parents):
+        if parent is not None and parent not in firstChild:
+            firstChild[parent] = i
+    up = upVector(secondaryAxisOrient)
+    rootRotation = vecMath.rotationMatrix(parentMatrix or vecMath.identity())
+    rotations = []
+    for i, position in enumerate(positions):
+        parentRotation = rootRotation if parents[i] is None else rotations[parents[i]]
+        aim = None
+        if orient != "none" and i in firstChild:
+            aim = vecMath.sub(positions[firstChild[i]], position)
+        if aim is None or vecMath.length(aim) < vecMath.EPSILON:
+            rotations.append(parentRotation)
+            continue
+        upDirection = up or vecMath.transformVector([0.0, 1.0, 0.0], parentRotation)
+        rotations.append(vecMath.aimMatrix(aim, upDirection, AXES.index(orient[0]), AXES.index(orient[1]),
+                                           parentRotation))
+    return rotations
+
+
+def solve(positions, orient="xyz", secondaryAxisOrient="yup", parents=None, parentMatrix=None):
+    ''' translate and joint orient of every joint, with rotate zeroed
+    Args:
+        positions (list) world position of each joint, parents before their children
+    Kwargs:
+        same as worldRotations
+    Returns:
+        list of (translate, jointOrient) pairs, translate in the parent's space
+    '''
+    if parents is None:
+        parents = chainParents(len(positions))
+    parentMatrix = parentMatrix or vecMath.identity()
+    rotations = worldRotations(positions, orient, secondaryAxisOrient, parents, parentMatrix)
+    scale = vecMath.length(parentMatrix[0][:3])
+    rootRotation = vecMath.rotationMatrix(parentMatrix)
+    worlds = []
+    result = []
+    for i, rotation in enumerate(rotations):
+        if parents[i] is None:
+            parentWorld, parentRotation = parentMatrix, rootRotation
+        else:
+            parentWorld, parentRotation = worlds[parents[i]], rotations[parents[i]]
+        worlds.append([vecMath.mul(rotation[r][:3], scale) + [0.0] for r in range(3)] +
+                      [list(positions[i]) + [1.0]])
+        translate = vecMath.transformPoint(positions[i], vecMath.matInverse(parentWorld))
+        jointOrient = vecMath.matrixToEuler(vecMath.matMul(rotation, vecMath.matInverse(parentRotation)))
+        result.append(([vecMath.clean(v) for v in translate], jointOrient))
+    return result
+
+
+def orientJoints(root, orient="xyz", secondaryAxisOrient="yup"):
+    ''' orient root and every joint below it like joint -edit -orientJoint -children,
+    reading the joints in two queries and writing them in one MEL batch
+    Args:
+        root (string) top joint
+    Kwargs:
+        orient (string) aim axis then up axis, e.g. "xyz"
+        secondaryAxisOrient (string) up rule, see sideRule for sides
+    Returns:
+        list of the joints oriented, parents first
+    '''
+    # allDescendents lists children after their own children, reversed a parent comes first
+    below = list(reversed(cmds.listRelatives(root, allDescendents=True, type="joint", fullPath=True) or []))
+    if below:
+        rootPath = below[0].rsplit("|", 1)[0]
+    else:
+        rootPath = (cmds.listRelatives(root, parent=True, fullPath=True) or [""])[0] + "|" + root
+    paths = [rootPath] + below
+    parentPath = rootPath.rsplit("|", 1)[0]
+    values = cmds.xform(paths + ([parentPath] if parentPath else []), query=True, worldSpace=True, matrix=True)
+    index = dict((path, i) for i, path in enumerate(paths))
+    parents = [None] + [index[path.rsplit("|", 1)[0]] for path in below]
+    positions = [values[i * 16 + 12:i * 16 + 15] for i in range(len(paths))]
+    parentMatrix = vecMath.unflatten(values[-16:]) if parentPath else None
+
+    joints = [path.rsplit("|", 1)[-1] for path in paths]
+    batch = MelBatch()
+    for i, (translate, jointOrient) in enumerate(solve(positions, orient, secondaryAxisOrient, parents, parentMatrix)):
+        if i:
+            batch.add("setAttr", joints[i] + ".translate", *translate, type="double3")
+        batch.add("setAttr", joints[i] + ".rotate", 0.0, 0.0, 0.0, type="double3")
+        batch.add("setAttr", joints[i] + ".jointOrient", *jointOrient, type="double3")
+    batch.flush()
+    return joints
@@ -0,0 +1,69 @@
+import maya.mel as mel
+
+# flags that take no value in MEL, written bare when True and left out when False
+SWITCHES = frozenset(["parentOnly", "addObject", "shape", "world", "relative", "absolute",
+                      "worldSpace", "objectSpace", "force", "skipSelect", "children", "clear",
+                      "maintainOffset", "asUtility"])
+
+
+def melValue(value):
+    ''' format python value as a MEL argument '''
+    if value is True:
+        return "1"
+    elif value is False:
+        return "0"
+    elif isinstance(value, str):
+        return '"%s"' % value.replace("\\", "\\\\").replace('"', '\\"')
+    elif isinstance(value, (list, tuple)):
+        return " ".join(melValue(v) for v in value)
+    return repr(value)
+
+
+def melCommand(command, *args, **flags):
+    ''' format one MEL statement
+    e.g. melCommand("setAttr", "ctrl.tx", lock=True) returns 'setAttr -lock 1 "ctrl.tx"'
+    and melCommand("duplicate", "hip", parentOnly=True) returns 'duplicate -parentOnly "hip"'
+    A list repeats its flag for each item, like the points of a curve, a
+    tuple is one flag with several values:
+    melCommand("curve", point=[(0, 0, 0), (1, 0, 0)], degree=1) returns
+    'curve -point 0 0 0 -point 1 0 0 -degree 1'
+    '''
+    parts = [command]
+    for flag, value in flags.items():
+        if flag in SWITCHES:
+            if value:
+                parts.append("-" + flag)
+            continue
+        for item in value if isinstance(value, list) else [value]:
+            parts.append("-" + flag)
+            parts.append(melValue(item))
+    for arg in args:
+        parts.append(melValue(arg))
+    return " ".join(parts)
+
+
+class MelBatch(object):
+    ''' collect MEL statements and run them with a single mel.eval call '''
+    def __init__(self):
+        self.statements = []
+
+
+    def __len__(self):
+        return len(self.statements)
+
+
+    def add(self, command, *args, **flags):
+        ''' queue a statement, same arguments as melCommand '''
+        self.statements.append(melCommand(command, *args, **flags))
+
+
+    def flush(self):
+        ''' run queued statements
+        Returns:
+            number of statements run
+        '''
+        count = len(self.statements)
+        if count:
+            mel.eval(";\n".join(self.statements) + ";")
+        self.statements = []
+        return count
@@ -0,0 +1,143 @@
+''' mirror proxies from one side of the rig to the other
+
+The L/R pairs are worked out once and kept in an index, rescanned when
+an ls of their paths finds one renamed, moved or deleted. Each mirror is
+then one xform query for every world matrix it needs, the mirror done in
+python and one batched MEL call to write translate and rotate back.
+That keeps a mirror cheap enough to run while a proxy is being dragged.
+
+    import mirror
+    mirror.index.mirror("R")              # left side onto the right
+    mirror.index.mirror("L", plane="XY")  # right onto left across XY
+'''
+import re
+
+import maya.cmds as cmds
+
+import vecMath
+from melBatch import MelBatch
+
+# side letter at the end of a proxy name, before any unique name suffix
+SIDE_RE = re.compile(r"^(.*)([LR])(\d*)$")
+
+# axis each mirror plane flips
+PLANES = {"YZ": 0, "XZ": 1, "XY": 2}
+
+
+def mirrorName(name):
+    ''' (side, opposite name) of a side suffixed name, (None, None) otherwise '''
+    match = SIDE_RE.match(name)
+    if not match:
+        return None, None
+    base, side, suffix = match.groups()
+    return side, base + ("R" if side == "L" else "L") + suffix
+
+
+def reflection(plane):
+    ''' sign of each element of a flat matrix mirrored across plane
+    Mirroring is S * M * S with S the reflection, which only flips signs.
+    '''
+    if plane not in PLANES:
+        raise ValueError("Unknown mirror plane: %s, use one of %s" % (plane, ", ".join(sorted(PLANES))))
+    diagonal = [1.0, 1.0, 1.0, 1.0]
+    diagonal[PLANES[plane]] = -1.0
+    return [diagonal[i] * diagonal[j] for i in range(4) for j in range(4)]
+
+
+class MirrorIndex(object):
+    ''' L/R proxy pairs and their parents, built once per proxy layout '''
+    def __init__(self):
+        self.pairs = []
+        self.parents = {}
+        self.paths = []
+        self.scanned = False
+
+
+    def scan(self):
+        ''' pair up every proxy under MR_Root.proxyObjects '''
+        proxies = cmds.listConnections("MR_Root.proxyObjects") or []
+        names = set(proxies)
+        self.pairs = []
+        for proxy in proxies:
+            side, opposite = mirrorName(proxy)
+            if side == "L" and opposite in names:
+                self.pairs.append((proxy, opposite))
+        self.parents = {}
+        paired = set(name for pair in self.pairs for name in pair)
+        self.paths = []
+        for path in cmds.ls(proxies, long=True) or []:
+            parts = path.split("|")
+            self.parents[parts[-1]] = "|".join(parts[:-1]) or None
+            if parts[-1] in paired:
+                self.paths.append(path)
+        self.scanned = True
+
+
+    def stale(self):
+        ''' True when a paired proxy was renamed, reparented or deleted since the scan '''
+        # ls of an empty list lists the whole scene
+        if not self.paths:
+            return False
+        return len(cmds.ls(self.paths, long=True) or []) != len(self.paths)
+
+
+    def clear(self):
+        ''' forget the pairs, call when proxies are added or removed '''
+        self.pairs = []
+        self.parents = {}
+        self.paths = []
+        self.scanned = False
+
+
+    def mirror(self, orient="R", plane="YZ"):
+        ''' copy the world transforms of one side onto the other
+        Kwargs:
+            orient (string) side to write, "R" mirrors left onto right
+            plane (string) mirror plane, "YZ", "XZ" or "XY"
+        Returns:
+            number of proxies moved
+        '''
+        signs = reflection(plane)
+        if not self.scanned or self.stale():
+            self.scan()
+        if orient == "R":
+            pairs = self.pairs
+        else:
+            pairs = [(target, source) for source, target in self.pairs]
+        if not pairs:
+            return 0
+
+        targets = set(target for _, target in pairs)
+        sources = [source for source, _ in pairs]
+        # parents of targets that are not moved themselves, shortest paths first
+        outside = sorted(set(self.parents[t] for t in targets if self.parents[t]
+                             and self.parents[t].split("|")[-1] not in targets), key=len)
+        flat = cmds.xform(sources + outside, query=True, worldSpace=True, matrix=True)
+
+        world = {}
+        for i, source in enumerate(sources):
+            mirrored = [a * b for a, b in zip(signs, flat[i * 16:i * 16 + 16])]
+            world[pairs[i][1]] = vecMath.unflatten(mirrored)
+        for i, parent in enumerate(outside, len(sources)):
+            world[parent] = vecMath.unflatten(flat[i * 16:i * 16 + 16])
+
+        batch = MelBatch()
+        inverses = {}
+        for _, target in pairs:
+            parent = self.parents[target]
+            if parent:
+                key = parent.split("|")[-1] if parent.split("|")[-1] in targets else parent
+                if key not in inverses:
+                    inverses[key] = vecMath.matInverse(world[key])
+                local = vecMath.matMul(world[target], inverses[key])
+            else:
+                local = world[target]
+            translate, rotate, _ = vecMath.decomposeMatrix(local)
+            batch.add("setAttr", target + ".translate", *translate, type="double3")
+            batch.add("setAttr", target + ".rotate", *rotate, type="double3")
+        batch.flush()
+        return len(pairs)
+
+
+# one index shared by every MagicRig module
+index = MirrorIndex()
@@ -0,0 +1,95 @@
+import maya.cmds as cmds
+
+
+class NameIndex(object):
+    ''' in memory index of node names in the scene
+
+    The scene is listed once per build session, after that names are
+    handed out and tracked without asking maya. Unique names follow the
+    old uniqueName rule: name, name1, name2 ...
+    '''
+    def __init__(self):
+        self.taken = set()
+        self.nextSuffix = {}
+        self.scanned = False
+
+
+    def scan(self):
+        ''' rebuild index from every node in the scene '''
+        self.taken = set(node.rsplit("|", 1)[-1] for node in cmds.ls())
+        self.nextSuffix = {}
+        self.scanned = True
+
+
+    def uniqueName(self, name):
+        ''' return a free name based on name and mark it as taken '''
+        if not self.scanned:
+            self.scan()
+        newName = name
+        if newName in self.taken:
+            i = self.nextSuffix.get(name, 1)
+            newName = name + str(i)
+            while newName in self.taken:
+                i += 1
+                newName = name + str(i)
+            self.nextSuffix[name] = i + 1
+        self.taken.add(newName)
+        return newName
+
+
+    def add(self, *names):
+        ''' mark names as taken '''
+        for name in names:
+            self.taken.add(name.rsplit("|", 1)[-1])
+
+
+    def remove(self, *names):
+        ''' mark names as free again '''
+        for name in names:
+            name = name.rsplit("|", 1)[-1]
+            self.taken.discard(name)
+            # let the suffix counter of the base name reuse the freed slot,
+            # suffixes start at 1 so name0 is never handed out
+            base = name.rstrip("0123456789")
+            suffix = name[len(base):]
+            if suffix and base in self.nextSuffix and 1 <= int(suffix) < self.nextSuffix[base]:
+                self.nextSuffix[base] = int(suffix)
+
+
+    def exists(self, name):
+        if not self.scanned:
+            self.scan()
+        return name.rsplit("|", 1)[-1] in self.taken
+
+
+# one index shared by every MagicRig module
+index = NameIndex()
+
+
+def beginSession():
+    ''' scan the scene, call at the start of each build '''
+    index.scan()
+
+
+def uniqueName(name):
+    ''' check name is unique and return unique name
+    Args:
+        name of object (string)
+    '''
+    return index.uniqueName(name)
+
+
+def add(*names):
+    ''' record names of nodes created outside uniqueName '''
+    index.add(*names)
+
+
+def delete(*nodes):
+    ''' delete nodes and free their names and the names of their children,
+    nothing is deleted when no nodes are given, not the selection
+    '''
+    if not nodes:
+        return
+    children = cmds.listRelatives(nodes, allDescendents=True) or []
+    cmds.delete(*nodes)
+    index.remove(*(list(nodes) + children))
@@ -0,0 +1,152 @@
+''' dirty tracking for rig parts, so a rebuild only redoes what changed
+
+Every rig part's network node keeps three string attributes, added by
+rignode.MetaNode:
+
+    inputHash   hash of the part's options, its proxy transforms and the
+                master scale, taken just before the proxies became joints
+    inputNodes  json list of the proxies and movers that went into the hash
+    builtNodes  json list of the uuids of every node the part made, used to
+                tear the part down again
+
+Nodes are tracked by uuid, which survives the renames and reparenting a
+build does, and by listing the scene before and after each step.
+
+    tracker = partTracker.NodeTracker()
+    with tracker.track("armL"):
+        parts["armL"].toJoint(parent)
+    partTracker.saveNodes(parts, tracker)
+'''
+import json
+import hashlib
+from contextlib import contextmanager
+
+import maya.cmds as cmds
+
+import roleIndex
+import proxyLayout
+
+HASH_ATTR = "inputHash"
+INPUTS_ATTR = "inputNodes"
+NODES_ATTR = "builtNodes"
+
+
+class NodeTracker(object):
+    ''' uuids of the nodes made inside each track() block, per part name '''
+    def __init__(self):
+        self.created = {}
+
+
+    @contextmanager
+    def track(self, partName):
+        before = set(cmds.ls(uuid=True))
+        try:
+            yield
+        finally:
+            made = [uuid for uuid in cmds.ls(uuid=True) if uuid not in before]
+            self.created.setdefault(partName, []).extend(made)
+
+
+def setString(node, attr, value):
+    cmds.setAttr(node + "." + attr, value, type="string")
+
+
+def getString(node, attr, default=""):
+    return cmds.getAttr(node + "." + attr) or default
+
+
+def tracked(node):
+    ''' True if the network node has the dirty tracking attributes, parts
+    made before there was tracking do not
+    '''
+    return cmds.attributeQuery(HASH_ATTR, node=node, exists=True)
+
+
+def saveNodes(parts, tracker):
+    ''' add the nodes tracked for each part to its builtNodes '''
+    for partName, uuids in tracker.created.items():
+        node = parts[partName].name
+        built = json.loads(getString(node, NODES_ATTR, "[]"))
+        setString(node, NODES_ATTR, json.dumps(built + uuids, separators=(",", ":")))
+
+
+def builtNodes(node):
+    ''' names of the nodes a part made that are still in the scene '''
+    uuids = json.loads(getString(node, NODES_ATTR, "[]"))
+    return cmds.ls(uuids) if uuids else []
+
+
+def inputNodes(part, proxies):
+    ''' the proxies and movers of a part, the nodes a proxy layout has for it
+    Args:
+        part (MetaNode) rig part
+        proxies (set) every proxy of the rig
+    '''
+    roles = {}
+    roleIndex.flatten(part, part.name, roles)
+    nodes = set()
+    for key, value in roles.items():
+        if key.endswith(".mover"):
+            nodes.add(value)
+            continue
+        for name in value if isinstance(value, list) else [value]:
+            if name in proxies:
+                nodes.add(name)
+    return sorted(nodes)
+
+
+def inputHash(cls, settings, transforms, masterScale):
+    ''' hash of everything a part is built from
+    Args:
+        cls (class) rig part class
+        settings (list) the part's SETTINGS values
+        transforms (dict) node: layout values of its input nodes, None if missing
+        masterScale (float)
+    '''
+    data = [cls.__name__, list(settings), sorted(transforms.items()), masterScale]
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def settingsOf(part):
+    return [getattr(part, attr) for attr in type(part).SETTINGS]
+
+
+def record(parts):
+    ''' hash the inputs of every part from its proxies in the scene, call
+    before the proxies become joints
+    '''
+    proxies = set(cmds.listConnections("MR_Root.proxyObjects") or [])
+    nodes = dict((partName, inputNodes(part, proxies)) for partName, part in parts.items())
+    transforms = proxyLayout.capture(sorted(set(n for names in nodes.values() for n in names)))
+    masterScale = cmds.getAttr("MR_Root.masterScale")
+    for partName, part in parts.items():
+        partTransforms = dict((n, transforms[n]) for n in nodes[partName])
+        setString(part.name, HASH_ATTR, inputHash(type(part), settingsOf(part), partTransforms, masterScale))
+        setString(part.name, INPUTS_ATTR, json.dumps(nodes[partName]))
+
+
+def dirtyParts(parts, specs, transforms, masterScale, parents):
+    ''' names of the parts whose inputs are not the ones they were built from
+    A part is also dirty when the part it hangs off is, since its joints
+    are under that part's joints.
+    Args:
+        parts (dict) part name: rig part, as loaded from the scene
+        specs (list) of (part name, class, constructor args) to build
+        transforms (dict) node: values of the proxy layout to build
+        masterScale (float)
+        parents (dict) part name: part name it hangs off, or None
+    Returns:
+        list of part names in specs order
+    '''
+    dirty = []
+    for partName, cls, args in specs:
+        part = parts.get(partName)
+        if part is None or type(part) is not cls or part.name != args[0]:
+            dirty.append(partName)
+            continue
+        names = json.loads(getString(part.name, INPUTS_ATTR, "[]"))
+        partTransforms = dict((n, transforms.get(n)) for n in names)
+        newHash = inputHash(cls, list(args[1:]), partTransforms, masterScale)
+        if newHash != getString(part.name, HASH_ATTR) or parents.get(partName) in dirty:
+            dirty.append(partName)
+    return dirty
@@ -0,0 +1,2068 @@
+''' in memory stand-in for the parts of the maya scene MagicRig uses
+
+A Scene holds dag and dg nodes, their attributes, connections and
+transforms. SceneCmds exposes it through the same function names and
+flags as maya.cmds, so rig code can run against it without maya. It is
+used to plan builds (rigplan) and as a test double.
+
+Constraints are evaluated once when they are made, which is all a rig
+build needs, and the matrix nodes of buildContext's "matrix" drive mode
+once when their output is connected to a transform. Deformers, solvers
+and time are not evaluated.
+'''
+import re
+import json
+import fnmatch
+import itertools
+
+import vecMath
+
+TRANSFORM_TYPES = {"transform", "joint", "ikHandle", "ikEffector",
+                   "pointConstraint", "orientConstraint", "parentConstraint",
+                   "scaleConstraint", "poleVectorConstraint", "aimConstraint"}
+SHAPE_TYPES = {"nurbsCurve", "nurbsSurface", "locator", "mesh", "clusterHandle",
+               "deformBend", "deformTwist", "deformSquash", "deformFlare", "deformSine", "deformWave",
+               "follicle", "camera"}
+CONSTRAINT_TYPES = {"pointConstraint", "orientConstraint", "parentConstraint",
+                    "scaleConstraint", "poleVectorConstraint", "aimConstraint"}
+# dg nodes Scene.evaluate computes, following their input connections
+EVALUATED_TYPES = {"multMatrix", "decomposeMatrix", "blendMatrix", "multDoubleLinear", "pairBlend", "reverse",
+                   "uvPin"}
+
+# compound attributes with X, Y, Z children
+VECTOR_ATTRS = {
+    "translate": (0.0, 0.0, 0.0),
+    "rotate": (0.0, 0.0, 0.0),
+    "scale": (1.0, 1.0, 1.0),
+    "jointOrient": (0.0, 0.0, 0.0),
+    "rotatePivot": (0.0, 0.0, 0.0),
+    "scalePivot": (0.0, 0.0, 0.0),
+    "rotatePivotTranslate": (0.0, 0.0, 0.0),
+    "scalePivotTranslate": (0.0, 0.0, 0.0),
+    "rotateAxis": (0.0, 0.0, 0.0),
+}
+TRANSFORM_DEFAULTS = {"visibility": True, "rotateOrder": 0, "inheritsTransform": True,
+                      "overrideEnabled": False, "overrideColor": 0}
+
+ATTR_ALIASES = {
+    "t": "translate", "r": "rotate", "s": "scale", "v": "visibility",
+    "jo": "jointOrient", "rp": "rotatePivot", "sp": "scalePivot", "ra": "rotateAxis",
+    "rpt": "rotatePivotTranslate", "spt": "scalePivotTranslate",
+    "ro": "rotateOrder", "it": "inheritsTransform",
+}
+for _short, _long in list(ATTR_ALIASES.items()):
+    if _long in VECTOR_ATTRS:
+        for _axis in "xyz":
+            ATTR_ALIASES[_short + _axis] = _long + _axis.upper()
+
+MATRIX_ATTRS = {"matrix", "worldMatrix", "worldInverseMatrix", "parentMatrix",
+                "parentInverseMatrix", "inverseMatrix", "offsetParentMatrix"}
+
+# commands that only read the scene or ui state, never recorded in a plan
+QUERY_COMMANDS = {"getAttr", "objExists", "listRelatives", "listConnections", "ls",
+                  "objectCenter", "attributeQuery", "nodeType", "about", "error", "warning",
+                  "refresh", "evaluationManager", "progressWindow", "flushUndo"}
+
+# MEL tokens: a quoted string, a statement end or a bare word
+TOKEN_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|(;)|([^\s;"]+)')
+ESCAPE_RE = re.compile(r'\\([\\"])')
+PLUG_RE = re.compile(r"^([^.]+)\.(.+)$")
+INDEX_RE = re.compile(r"^(.*)\[(-?\d*)(?::(-?\d*))?\]$")
+SURFACE_INDEX_RE = re.compile(r"^cv\[([-\d:]*)\]\[([-\d:]*)\]$")
+DIGITS_RE = re.compile(r"^(.*?)(\d*)$")
+# node uuids, unique across every scene of the session like maya's
+UUIDS = itertools.count(1)
+
+
+def greville(count, degree=3):
+    ''' parameters 0-1 of the cvs of a clamped uniform curve with count cvs '''
+    spans = count - degree
+    knots = [0] * degree + list(range(1, spans)) + [spans] * degree
+    return [sum(knots[i:i + degree]) / float(degree * spans) for i in range(count)]
+
+
+def blendMatrices(a, b, weight):
+    ''' blend from a to b, translate and scale linearly, rotation by its rows '''
+    rows = [vecMath.normalize(vecMath.add(vecMath.mul(vecMath.normalize(a[i][:3]), 1.0 - weight),
+                                          vecMath.mul(vecMath.normalize(b[i][:3]), weight)))
+            for i in range(3)]
+    z = vecMath.normalize(vecMath.cross(rows[0], rows[1]))
+    y = vecMath.cross(z, rows[0])
+    scale = [vecMath.length(a[i][:3]) * (1.0 - weight) + vecMath.length(b[i][:3]) * weight for i in range(3)]
+    m = [vecMath.mul(row, s) + [0.0] for row, s in zip((rows[0], y, z), scale)]
+    m.append([a[3][i] * (1.0 - weight) + b[3][i] * weight for i in range(3)] + [1.0])
+    return m
+
+
+def pinMatrix(corners, u, v, tangentAxis=0, normalAxis=2):
+    ''' uvPin matrix on a flat surface, corners are the (u, v) = (0, 0), (0, 1),
+    (1, 0) and (1, 1) points, axes 0-2 are x, y, z and 3-5 their negatives
+    '''
+    c00, c01, c10, c11 = corners
+    bottom = [a + (b - a) * u for a, b in zip(c00, c10)]
+    top = [a + (b - a) * u for a, b in zip(c01, c11)]
+    position = [a + (b - a) * v for a, b in zip(bottom, top)]
+    du = vecMath.sub([a + (b - a) * v for a, b in zip(c10, c11)], [a + (b - a) * v for a, b in zip(c00, c01)])
+    normal = vecMath.normalize(vecMath.cross(vecMath.sub(top, bottom), du))
+    tangent = vecMath.normalize(vecMath.sub(du, vecMath.mul(normal, vecMath.dot(du, normal))))
+    rows = [None, None, None]
+    for axis, vector in ((tangentAxis, tangent), (normalAxis, normal)):
+        rows[axis % 3] = vecMath.mul(vector, -1.0 if axis > 2 else 1.0)
+    k = 3 - tangentAxis % 3 - normalAxis % 3
+    rows[k] = vecMath.cross(rows[(k + 1) % 3], rows[(k + 2) % 3])
+    return [row + [0.0] for row in rows] + [position + [1.0]]
+
+
+def shortName(name):
+    ''' last part of a dag path '''
+    return name.rsplit("|", 1)[-1]
+
+
+def normalizeFlags(kwargs, aliases):
+    ''' replace short flag names with long ones '''
+    result = {}
+    for key, value in kwargs.items():
+        result[aliases.get(key, key)] = value
+    return result
+
+
+def asList(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        result = []
+        for v in value:
+            result.extend(asList(v))
+        return result
+    return [value]
+
+
+class Node(object):
+    ''' one dag or dg node '''
+    def __init__(self, name, nodeType):
+        self.name = name
+        self.type = nodeType
+        self.parent = None
+        self.children = []
+        # more parents of an instanced shape, see Scene.addInstance
+        self.instances = []
+        self.attrs = {}
+        # dynamic attributes, name: dict of attribute options
+        self.dynamic = {}
+        # lock, keyable and channelBox state per attribute
+        self.attrState = {}
+        # incoming connections attr: (srcNode, srcAttr)
+        self.inputs = {}
+        # outgoing connections as (attr, dstNode, dstAttr)
+        self.outputs = []
+        if self.isTransform():
+            for attr, default in VECTOR_ATTRS.items():
+                self.attrs[attr] = list(default)
+            self.attrs.update(TRANSFORM_DEFAULTS)
+
+
+    def isTransform(self):
+        return self.type in TRANSFORM_TYPES
+
+
+    def isShape(self):
+        return self.type in SHAPE_TYPES
+
+
+    def isDag(self):
+        return self.isTransform() or self.isShape()
+
+
+    def fullPath(self):
+        path = []
+        node = self
+        while node:
+            path.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(path))
+
+
+    def localMatrix(self):
+        if not self.isTransform():
+            return vecMath.identity()
+        a = self.attrs
+        m = vecMath.composeMatrix(a["translate"], a["rotate"], a["scale"],
+                                  a["jointOrient"] if self.type == "joint" else None,
+                                  a["rotatePivot"], a["scalePivot"])
+        for attr in ("rotatePivotTranslate", "scalePivotTranslate"):
+            offset = a[attr]
+            m[3][0] += offset[0]
+            m[3][1] += offset[1]
+            m[3][2] += offset[2]
+        return m
+
+
+    def offsetParentMatrix(self):
+        values = self.attrs.get("offsetParentMatrix")
+        return vecMath.unflatten(values) if values else vecMath.identity()
+
+
+    def spaceMatrix(self):
+        ''' matrix the local channels are in, offsetParentMatrix * parentMatrix '''
+        m = self.offsetParentMatrix()
+        if self.parent and self.attrs.get("inheritsTransform", True):
+            m = vecMath.matMul(m, self.parent.worldMatrix())
+        return m
+
+
+    def worldMatrix(self):
+        if "offsetParentMatrix" in self.attrs:
+            return vecMath.matMul(self.localMatrix(), self.spaceMatrix())
+        m = self.localMatrix()
+        if self.parent and self.attrs.get("inheritsTransform", True):
+            m = vecMath.matMul(m, self.parent.worldMatrix())
+        return m
+
+
+    def parentMatrix(self):
+        if self.parent:
+            return self.parent.worldMatrix()
+        return vecMath.identity()
+
+
+    def pivotWorld(self):
+        ''' world position of the rotate pivot '''
+        if not self.isTransform():
+            return self.parent.pivotWorld() if self.parent else [0.0, 0.0, 0.0]
+        return vecMath.transformPoint(self.attrs["rotatePivot"], self.worldMatrix())
+
+
+class Scene(object):
+    ''' in memory scene graph '''
+    def __init__(self):
+        self.new()
+
+
+    def new(self):
+        ''' empty the scene, like file -new '''
+        self.nodes = {}
+        self.selection = []
+        self.counters = {}
+        # every node created, in order
+        self.history = []
+        # uuid: node, uuids are never reused so deleted nodes stay in here
+        self.uuids = {}
+        self.createNode("shadingEngine", "initialShadingGroup")
+        self.createNode("time", "time1")
+
+
+    #-------------------------------------------------------------------------
+    # nodes
+    #-------------------------------------------------------------------------
+    def uniqueName(self, name):
+        ''' maya style renaming, increments the trailing number until free '''
+        if name not in self.nodes:
+            return name
+        base, digits = DIGITS_RE.match(name).groups()
+        i = int(digits) + 1 if digits else 1
+        while base + str(i) in self.nodes:
+            i += 1
+        return base + str(i)
+
+
+    def defaultName(self, nodeType):
+        ''' type1, type2 ... names for nodes created without a name '''
+        i = self.counters.get(nodeType, 1)
+        while nodeType + str(i) in self.nodes:
+            i += 1
+        self.counters[nodeType] = i + 1
+        return nodeType + str(i)
+
+
+    def createNode(self, nodeType, name=None, parent=None):
+        name = self.uniqueName(shortName(name)) if name else self.defaultName(nodeType)
+        node = Node(name, nodeType)
+        self.nodes[name] = node
+        self.history.append(node)
+        node.uuid = "00000000-0000-0000-0000-%012X" % next(UUIDS)
+        self.uuids[node.uuid] = node
+        if parent is not None:
+            self.setParent(node, parent)
+        return node
+
+
+    def node(self, name):
+        ''' Node from name, dag path or plug, raises ValueError if missing '''
+        if isinstance(name, Node):
+            return name
+        name = shortName(name.split(".", 1)[0])
+        try:
+            return self.nodes[name]
+        except KeyError:
+            raise ValueError("No object matches name: %s" % name)
+
+
+    def exists(self, name):
+        return shortName(name.split(".", 1)[0]) in self.nodes
+
+
+    def fromUuid(self, uuid):
+        ''' Node with uuid, None if there is none or it was deleted '''
+        node = self.uuids.get(uuid)
+        if node is not None and self.nodes.get(node.name) is node:
+            return node
+        return None
+
+
+    def rename(self, node, newName):
+        newName = shortName(newName)
+        if newName == node.name:
+            return node.name
+        del self.nodes[node.name]
+        node.name = self.uniqueName(newName)
+        self.nodes[node.name] = node
+        return node.name
+
+
+    def delete(self, node):
+        if node.name not in self.nodes:
+            return
+        for child in list(node.children):
+            if child.parent is not node:
+                # only this instance of a shape goes
+                node.children.remove(child)
+                child.instances.remove(node)
+            elif child.instances:
+                # the shape lives on under its next instance
+                node.children.remove(child)
+                child.parent = child.instances.pop(0)
+            else:
+                self.delete(child)
+        # constraints and effectors die with the nodes they drive
+        for attr, src in list(node.inputs.items()):
+            self.disconnect(src[0], src[1], node, attr)
+        for srcAttr, dst, dstAttr in list(node.outputs):
+            self.disconnect(node, srcAttr, dst, dstAttr)
+        for parent in node.instances:
+            parent.children.remove(node)
+        node.instances = []
+        if node.parent:
+            node.parent.children.remove(node)
+        del self.nodes[node.name]
+        if node in self.selection:
+            self.selection.remove(node)
+
+
+    def describe(self, cvs=False):
+        ''' json friendly dict of every node's type, parent and attributes
+        Kwargs:
+            cvs (bool) keep the points of curves and surfaces
+        '''
+        data = {}
+        for name, node in self.nodes.items():
+            data[name] = {"type": node.type, "parent": node.parent.name if node.parent else None,
+                          "attrs": dict((k, v) for k, v in node.attrs.items() if cvs or k != "cvs"),
+                          "inputs": dict((k, "%s.%s" % (v[0].name, v[1])) for k, v in node.inputs.items())}
+            if node.instances:
+                data[name]["instances"] = [parent.name for parent in node.instances]
+        return data
+
+
+    def load(self, data):
+        ''' empty the scene and fill it from a describe() dict, like file -open
+        Only attribute values come back, not the options of dynamic attributes.
+        '''
+        self.new()
+        for name, entry in data.items():
+            if name not in self.nodes:
+                self.createNode(entry["type"], name)
+        for name, entry in data.items():
+            node = self.nodes[name]
+            if entry["parent"]:
+                self.setParent(node, self.nodes[entry["parent"]])
+            for parent in entry.get("instances", []):
+                self.addInstance(node, self.nodes[parent])
+            node.attrs.update(entry["attrs"])
+        for name, entry in data.items():
+            for attr, plug in entry["inputs"].items():
+                src, srcAttr = plug.split(".", 1)
+                self.connect(self.nodes[src], srcAttr, self.nodes[name], attr)
+
+
+    def descendants(self, node):
+        result = []
+        for child in node.children:
+            result.append(child)
+            result.extend(self.descendants(child))
+        return result
+
+
+    def shapes(self, node):
+        return [c for c in node.children if c.isShape()]
+
+
+    def addInstance(self, node, parent):
+        ''' one more parent for node, which then draws under both, like parent -addObject '''
+        if parent is node.parent or parent in node.instances:
+            return
+        node.instances.append(parent)
+        parent.children.append(node)
+
+
+    #-------------------------------------------------------------------------
+    # hierarchy and transforms
+    #-------------------------------------------------------------------------
+    def setParent(self, node, parent):
+        ''' reparent without keeping the world transform '''
+        if node.parent:
+            node.parent.children.remove(node)
+        node.parent = parent
+        if parent:
+            parent.children.append(node)
+
+
+    def reparent(self, node, parent):
+        ''' reparent and keep the world transform, like cmds.parent '''
+        world = node.worldMatrix()
+        self.setParent(node, parent)
+        if node.isTransform():
+            self.setWorldMatrix(node, world)
+
+
+    def setWorldMatrix(self, node, world, rotation=True, translation=True, scale=True):
+        ''' set the channels of node so its world matrix matches world '''
+        local = vecMath.matMul(world, vecMath.matInverse(node.spaceMatrix()))
+        t, r, s = vecMath.decomposeMatrix(local)
+        if rotation:
+            if scale:
+                node.attrs["scale"] = s
+            if node.type == "joint":
+                # keep rotate, compensate in the joint orient like maya does
+                desired = vecMath.rotationMatrix(local)
+                rotate = vecMath.eulerToMatrix(node.attrs["rotate"])
+                node.attrs["jointOrient"] = vecMath.matrixToEuler(
+                    vecMath.matMul(vecMath.matInverse(rotate), desired))
+            else:
+                node.attrs["rotate"] = r
+        if translation:
+            self.setLocalPosition(node, t)
+
+
+    def setLocalPosition(self, node, position):
+        ''' set translate so the node's local matrix has position as its translation '''
+        current = node.localMatrix()
+        translate = node.attrs["translate"]
+        node.attrs["translate"] = [translate[i] + position[i] - current[3][i] for i in range(3)]
+
+
+    def setPivotWorld(self, node, position):
+        ''' move node so its rotate pivot lands on a world position '''
+        delta = vecMath.sub(position, node.pivotWorld())
+        if node.parent or "offsetParentMatrix" in node.attrs:
+            delta = vecMath.transformVector(delta, vecMath.matInverse(node.spaceMatrix()))
+        node.attrs["translate"] = vecMath.add(node.attrs["translate"], delta)
+
+
+    def setWorldRotation(self, node, rotation):
+        ''' set rotate channels so the node's world rotation matches a rotation matrix '''
+        parentRot = vecMath.rotationMatrix(node.spaceMatrix())
+        local = vecMath.matMul(rotation, vecMath.matInverse(parentRot))
+        if node.type == "joint":
+            orient = vecMath.eulerToMatrix(node.attrs["jointOrient"])
+            local = vecMath.matMul(local, vecMath.matInverse(orient))
+        node.attrs["rotate"] = vecMath.matrixToEuler(local)
+
+
+    def keepChildren(self, node):
+        ''' world matrices of transform children, pass to restoreChildren after editing node '''
+        return [(child, child.worldMatrix()) for child in node.children if child.isTransform()]
+
+
+    def restoreChildren(self, saved, scale=True):
+        for child, world in saved:
+            self.setWorldMatrix(child, world, scale=scale)
+
+
+    #-------------------------------------------------------------------------
+    # attributes
+    #-------------------------------------------------------------------------
+    def splitPlug(self, plug):
+        ''' "node.attr" to (Node, attr name) with aliases resolved '''
+        match = PLUG_RE.match(plug)
+        if not match:
+            raise ValueError("Not a plug: %s" % plug)
+        node = self.node(match.group(1))
+        # compound paths like "cond.colorIfFalse.colorIfFalseR" use the last part
+        attr = match.group(2).rsplit(".", 1)[-1]
+        return node, self.attrName(node, attr)
+
+
+    def attrName(self, node, attr):
+        if attr in node.dynamic:
+            return attr
+        base, index = attr, ""
+        if attr.endswith("]"):
+            base, index = attr[:attr.index("[")], attr[attr.index("["):]
+        return ATTR_ALIASES.get(base, base) + index
+
+
+    def hasAttr(self, node, attr):
+        if attr in node.dynamic or attr in node.attrs:
+            return True
+        base = attr.split("[", 1)[0]
+        if base in node.dynamic or base in node.attrs or base in MATRIX_ATTRS:
+            return True
+        if base[:-1] in VECTOR_ATTRS and base[-1] in "XYZ" and node.isTransform():
+            return True
+        # static attributes of dg nodes are not modelled, accept them
+        return not node.isTransform() and node.type != "network"
+
+
+    def getValue(self, node, attr):
+        base = attr.split("[", 1)[0]
+        if base in MATRIX_ATTRS:
+            return vecMath.flatten(self.matrixAttr(node, base))
+        if attr in node.attrs:
+            value = node.attrs[attr]
+            if isinstance(value, list) and attr in VECTOR_ATTRS:
+                return [tuple(value)]
+            return value
+        if attr[:-1] in VECTOR_ATTRS and attr[-1] in "XYZ" and attr[:-1] in node.attrs:
+            return node.attrs[attr[:-1]]["XYZ".index(attr[-1])]
+        if attr in node.dynamic:
+            return node.dynamic[attr].get("defaultValue")
+        if attr in ("worldPosition", "position") and node.isDag():
+            return [tuple(node.pivotWorld())]
+        return 0
+
+
+    def setValue(self, node, attr, value):
+        if attr[:-1] in VECTOR_ATTRS and attr[-1] in "XYZ" and attr[:-1] in node.attrs:
+            node.attrs[attr[:-1]]["XYZ".index(attr[-1])] = value
+        elif attr in VECTOR_ATTRS and node.isTransform():
+            node.attrs[attr] = [float(v) for v in value]
+        else:
+            node.attrs[attr] = value
+
+
+    def matrixAttr(self, node, attr):
+        if attr == "matrix":
+            return node.localMatrix()
+        elif attr == "inverseMatrix":
+            return vecMath.matInverse(node.localMatrix())
+        elif attr == "worldMatrix":
+            return node.worldMatrix()
+        elif attr == "worldInverseMatrix":
+            return vecMath.matInverse(node.worldMatrix())
+        elif attr == "parentMatrix":
+            return node.parentMatrix()
+        elif attr == "offsetParentMatrix":
+            return node.offsetParentMatrix()
+        return vecMath.matInverse(node.parentMatrix())
+
+
+    def evaluate(self, node, attr):
+        ''' value of a plug, computing the EVALUATED_TYPES nodes from their
+        inputs, other nodes give their current value
+        '''
+        if node.type not in EVALUATED_TYPES:
+            return self.getValue(node, attr)
+        if attr in node.inputs:
+            src, srcAttr = node.inputs[attr]
+            return self.evaluate(src, srcAttr)
+        if node.type == "multMatrix" and attr == "matrixSum":
+            m = vecMath.identity()
+            for i in sorted(self.multiIndices(node, "matrixIn")):
+                m = vecMath.matMul(m, self.evaluateMatrix(node, "matrixIn[%s]" % i))
+            return vecMath.flatten(m)
+        if node.type == "decomposeMatrix" and attr.startswith("output"):
+            t, r, s = vecMath.decomposeMatrix(self.evaluateMatrix(node, "inputMatrix"))
+            values = {"outputTranslate": t, "outputRotate": r, "outputScale": s}
+            if attr in values:
+                return values[attr]
+            return values[attr[:-1]]["XYZ".index(attr[-1])]
+        if node.type == "blendMatrix" and attr == "outputMatrix":
+            # one target, "target[0].weight" and "target[0].targetMatrix" are stored by their last part
+            weight = self.evaluate(node, "weight") if "weight" in node.inputs or "weight" in node.attrs else 1.0
+            weight *= node.attrs.get("envelope", 1.0)
+            if "targetMatrix" not in node.inputs and "targetMatrix" not in node.attrs:
+                weight = 0.0
+            source = self.evaluateMatrix(node, "inputMatrix")
+            if weight <= 0.0:
+                return vecMath.flatten(source)
+            target = self.evaluateMatrix(node, "targetMatrix")
+            if weight >= 1.0:
+                return vecMath.flatten(target)
+            return vecMath.flatten(blendMatrices(source, target, weight))
+        if node.type == "multDoubleLinear" and attr == "output":
+            return self.evaluate(node, "input1") * self.evaluate(node, "input2")
+        if node.type == "uvPin" and attr.startswith("outputMatrix["):
+            # flat surfaces only, deformers are not evaluated
+            shape = node.inputs["deformedGeometry"][0]
+            cvs, countV = shape.attrs["cvs"], shape.attrs["cvCountV"]
+            world = shape.worldMatrix()
+            corners = [vecMath.transformPoint(cvs[i], world) for i in (0, countV - 1, len(cvs) - countV, len(cvs) - 1)]
+            u, v = asList(node.attrs.get("coordinate" + attr[len("outputMatrix"):], [0.0, 0.0]))
+            return vecMath.flatten(pinMatrix(corners, u, v, node.attrs.get("tangentAxis", 0),
+                                             node.attrs.get("normalAxis", 2)))
+        if node.type == "reverse" and attr.startswith("output"):
+            return 1.0 - self.evaluate(node, "input" + attr[len("output"):])
+        if node.type == "pairBlend" and attr in ("outTranslate", "outRotate"):
+            channel = "inTranslate" if attr == "outTranslate" else "inRotate"
+            weight = self.evaluate(node, "weight") if "weight" in node.inputs or "weight" in node.attrs else 1.0
+            first, second = (asList(self.evaluate(node, channel + i)) for i in "12")
+            if attr == "outRotate" and 0.0 < weight < 1.0:
+                m = blendMatrices(vecMath.eulerToMatrix(first), vecMath.eulerToMatrix(second), weight)
+                return vecMath.matrixToEuler(m)
+            return [a * (1.0 - weight) + b * weight for a, b in zip(first, second)]
+        value = node.attrs.get(attr)
+        return 0.0 if value is None else value
+
+
+    def evaluateMatrix(self, node, attr):
+        values = self.evaluate(node, attr)
+        return vecMath.unflatten(values) if values else vecMath.identity()
+
+
+    def multiIndices(self, node, attr):
+        ''' used element indices of a multi attribute '''
+        prefix = attr + "["
+        return set(int(key[len(prefix):key.index("]")]) for key in list(node.inputs) + list(node.attrs)
+                   if key.startswith(prefix))
+
+
+    #-------------------------------------------------------------------------
+    # connections
+    #-------------------------------------------------------------------------
+    def connect(self, src, srcAttr, dst, dstAttr, force=False):
+        if dstAttr in dst.inputs:
+            if dst.inputs[dstAttr] == (src, srcAttr):
+                return
+            if not force:
+                old = dst.inputs[dstAttr]
+                raise RuntimeError("%s.%s is already connected to %s.%s" % (
+                    dst.name, dstAttr, old[0].name, old[1]))
+            old = dst.inputs[dstAttr]
+            self.disconnect(old[0], old[1], dst, dstAttr)
+        dst.inputs[dstAttr] = (src, srcAttr)
+        src.outputs.append((srcAttr, dst, dstAttr))
+
+
+    def disconnect(self, src, srcAttr, dst, dstAttr):
+        if dst.inputs.get(dstAttr) != (src, srcAttr):
+            raise RuntimeError("There is no connection from %s.%s to %s.%s to disconnect" % (
+                src.name, srcAttr, dst.name, dstAttr))
+        del dst.inputs[dstAttr]
+        src.outputs.remove((srcAttr, dst, dstAttr))
+
+
+    def nextIndex(self, node, attr):
+        ''' first free element of a multi attribute '''
+        used = self.multiIndices(node, attr)
+        i = 0
+        while i in used:
+            i += 1
+        return i
+
+
+    #-------------------------------------------------------------------------
+    # joints
+    #-------------------------------------------------------------------------
+    def orientJoint(self, joint, orient="xyz", secondaryAxisOrient="yup"):
+        ''' maya style joint orient, aims the first axis at the first child joint '''
+        saved = self.keepChildren(joint)
+        childJoints = [c for c in joint.children if c.type == "joint"]
+        if orient == "none" or not childJoints:
+            # end joints take the orientation of their parent
+            self.setWorldJointOrient(joint, vecMath.rotationMatrix(joint.parentMatrix()))
+        else:
+            position = joint.pivotWorld()
+            aim = vecMath.sub(childJoints[0].pivotWorld(), position)
+            axes = "xyz"
+            aimAxis = axes.index(orient[0])
+            upAxis = axes.index(orient[1])
+            up = [0.0, 0.0, 0.0]
+            if secondaryAxisOrient and secondaryAxisOrient != "none":
+                up[axes.index(secondaryAxisOrient[0])] = -1.0 if secondaryAxisOrient.endswith("down") else 1.0
+            else:
+                up = vecMath.transformVector([0, 1, 0], joint.parentMatrix())
+            self.setWorldJointOrient(joint, vecMath.aimMatrix(aim, up, aimAxis, upAxis,
+                                                              vecMath.rotationMatrix(joint.parentMatrix())))
+        # only the rotation changed, scales taken back out of the matrices would drift down long chains
+        self.restoreChildren(saved, scale=False)
+
+
+    def setWorldJointOrient(self, joint, rotation):
+        ''' put a world rotation in the joint orient with rotate zeroed '''
+        parentRot = vecMath.rotationMatrix(joint.parentMatrix())
+        joint.attrs["rotate"] = [0.0, 0.0, 0.0]
+        joint.attrs["jointOrient"] = vecMath.matrixToEuler(
+            vecMath.matMul(rotation, vecMath.matInverse(parentRot)))
+
+
+    #-------------------------------------------------------------------------
+    # geometry
+    #-------------------------------------------------------------------------
+    def componentShape(self, component):
+        node = self.node(component)
+        return node if node.isShape() else (self.shapes(node) or [node])[0]
+
+
+    def componentIndices(self, component):
+        ''' cv indices of "node.cv[..]" or "surface.cv[u][v]" '''
+        shape = self.componentShape(component)
+        count = len(shape.attrs.get("cvs", []))
+        attr = component.split(".", 1)[1]
+        match = SURFACE_INDEX_RE.match(attr)
+        if match and "cvCountV" in shape.attrs:
+            countV = shape.attrs["cvCountV"]
+            us = self.indexRange(INDEX_RE.match("cv[%s]" % match.group(1)), count // countV)
+            vs = self.indexRange(INDEX_RE.match("cv[%s]" % match.group(2)), countV)
+            return [u * countV + v for u in us for v in vs]
+        match = INDEX_RE.match(attr)
+        if not match:
+            return []
+        return [i for i in self.indexRange(match, count) if i < count]
+
+
+    def componentPositions(self, component, worldSpace=True):
+        ''' positions of "node.cv[..]" style components '''
+        shape = self.componentShape(component)
+        cvs = shape.attrs.get("cvs", [])
+        points = [cvs[i] for i in self.componentIndices(component)]
+        if worldSpace and shape.parent:
+            world = shape.worldMatrix()
+            points = [vecMath.transformPoint(p, world) for p in points]
+        return points
+
+
+    def indexRange(self, match, count):
+        start, end = match.group(2), match.group(3)
+        if end is None:
+            if start == "":
+                return list(range(count))
+            return [int(start)]
+        start = int(start) if start else 0
+        end = int(end) if end else count - 1
+        return list(range(start, end + 1))
+
+
+    def expandComponents(self, component, count):
+        name, attr = component.split(".", 1)
+        match = INDEX_RE.match(attr)
+        if not match:
+            return [component]
+        return ["%s.%s[%s]" % (name, match.group(1), i) for i in self.indexRange(match, count)]
+
+
+class SceneCmds(object):
+    ''' maya.cmds style functions that work on a Scene '''
+    def __init__(self, scene=None):
+        self.scene = scene or Scene()
+        # undo is not recorded, only its state and open chunks are tracked
+        self.undoState = True
+        self.undoChunks = []
+        # no viewport or evaluation, their settings are kept for queries
+        self.refreshSuspended = False
+        self.evaluationMode = "parallel"
+        # animation curves are not evaluated, keys are kept as (time, value) pairs
+        self.time = 1.0
+        self.progress = {"progress": 0, "maxValue": 100, "status": "", "isCancelled": False}
+
+
+    #-------------------------------------------------------------------------
+    # helpers
+    #-------------------------------------------------------------------------
+    def _objects(self, args):
+        ''' nodes from positional arguments, falls back to the selection '''
+        names = asList(args)
+        if not names:
+            return list(self.scene.selection)
+        return [self.scene.node(n) for n in names]
+
+
+    def _select(self, nodes):
+        self.scene.selection = list(nodes)
+
+
+    def _makeDag(self, nodeType, name, shapeName=None, parent=None):
+        ''' transform with one shape under it '''
+        scene = self.scene
+        transform = scene.createNode("transform", name or scene.defaultName(nodeType), parent)
+        shapeName = shapeName or DIGITS_RE.match(transform.name).group(1) + "Shape" + DIGITS_RE.match(transform.name).group(2)
+        shape = scene.createNode(nodeType, shapeName, transform)
+        return transform, shape
+
+
+    def _splitArgs(self, args, count=3):
+        ''' split leading numbers from object names '''
+        values = []
+        names = []
+        for arg in asList(args):
+            if isinstance(arg, (int, float)) and not names:
+                values.append(float(arg))
+            else:
+                names.append(arg)
+        return values, names
+
+
+    #-------------------------------------------------------------------------
+    # creation
+    #-------------------------------------------------------------------------
+    def createNode(self, nodeType, name=None, parent=None, skipSelect=False, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "name", "p": "parent", "ss": "skipSelect"})
+        name = kwargs.get("name", name)
+        parent = kwargs.get("parent", parent)
+        scene = self.scene
+        parentNode = scene.node(parent) if parent else None
+        if nodeType in SHAPE_TYPES and parentNode is None:
+            # shapes get a transform, follicle1 with follicleShape1 under it
+            transformName = scene.defaultName(nodeType)
+            parentNode = scene.createNode("transform", transformName)
+            if not name:
+                base, digits = DIGITS_RE.match(transformName).groups()
+                name = base + "Shape" + digits
+        node = scene.createNode(nodeType, name, parentNode)
+        if not skipSelect:
+            self._select([node])
+        return node.name
+
+
+    def shadingNode(self, nodeType, asUtility=False, asShader=False, asTexture=False, name=None, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "name", "au": "asUtility"})
+        return self.createNode(nodeType, name=kwargs.get("name", name))
+
+
+    def spaceLocator(self, name=None, position=None, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "name", "p": "position"})
+        name = kwargs.get("name", name)
+        transform, shape = self._makeDag("locator", name or "locator1")
+        if kwargs.get("position", position):
+            shape.attrs["localPosition"] = list(kwargs.get("position", position))
+        self._select([transform])
+        return [transform.name]
+
+
+    def sphere(self, name=None, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "name", "r": "radius", "ch": "constructionHistory"})
+        transform, shape = self._makeDag("nurbsSurface", kwargs.get("name", name) or "nurbsSphere1")
+        shape.attrs["radius"] = kwargs.get("radius", 1.0)
+        # new geometry joins the default shading group
+        sg = self.scene.nodes["initialShadingGroup"]
+        index = self.scene.nextIndex(sg, "dagSetMembers")
+        self.scene.connect(shape, "instObjGroups[0]", sg, "dagSetMembers[%s]" % index)
+        self._select([transform])
+        if kwargs.get("constructionHistory", True):
+            history = self.scene.createNode("makeNurbSphere")
+            self.scene.connect(history, "outputSurface", shape, "create")
+            return [transform.name, history.name]
+        return [transform.name]
+
+
+    def nurbsPlane(self, name=None, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "name", "w": "width", "lr": "lengthRatio",
+                                         "u": "patchesU", "v": "patchesV", "ch": "constructionHistory",
+                                         "ax": "axis", "p": "pivot", "d": "degree"})
+        transform, shape = self._makeDag("nurbsSurface", kwargs.get("name", name) or "nurbsPlane1")
+        width = float(kwargs.get("width", 1.0))
+        length = width * float(kwargs.get("lengthRatio", 1.0))
+        pivot = kwargs.get("pivot", (0, 0, 0))
+        # cubic cvs at the greville points, u across the width, v along the length
+        us = greville(int(kwargs.get("patchesU", 1)) + 3)
+        vs = greville(int(kwargs.get("patchesV", 1)) + 3)
+        shape.attrs["cvs"] = [[pivot[0] + (u - 0.5) * width, pivot[1], pivot[2] + (v - 0.5) * length]
+                              for u in us for v in vs]
+        shape.attrs["cvCountV"] = len(vs)
+        self._select([transform])
+        if kwargs.get("constructionHistory", True):
+            return [transform.name, self.scene.createNode("makeNurbPlane").name]
+        return [transform.name]
+
+
+    def curve(self, name=None, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "name", "p": "point", "d": "degree", "k": "knot",
+                                         "per": "periodic", "a": "append", "r": "replace"})
+        points = [list(map(float, p)) for p in kwargs.get("point", [])]
+        transform, shape = self._makeDag("nurbsCurve", kwargs.get("name", name) or "curve1")
+        shape.attrs["cvs"] = points
+        shape.attrs["degree"] = kwargs.get("degree", 3)
+        shape.attrs["knots"] = list(kwargs.get("knot", []))
+        shape.attrs["periodic"] = bool(kwargs.get("periodic", False))
+        self._select([transform])
+        return transform.name
+
+
+    def circle(self, name=None, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "name", "r": "radius", "nr": "normal", "c": "center",
+                                         "ch": "constructionHistory", "sw": "sweep"})
+        import shapeLib
+        radius = kwargs.get("radius", 1.0)
+        center = kwargs.get("center", (0, 0, 0))
+        points = [vecMath.add(vecMath.mul(p, radius), center) for p in shapeLib.getShape("circle").points]
+        name = self.curve(name=kwargs.get("name", name) or "nurbsCircle1", point=points, degree=3, periodic=True)
+        if kwargs.get("constructionHistory", True):
+            return [name, self.scene.createNode("makeNurbCircle").name]
+        return [name]
+
+
+    def group(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "name", "em": "empty", "w": "world", "p": "parent"})
+        scene = self.scene
+        objects = [] if kwargs.get("empty") else self._objects(args)
+        parent = None
+        if kwargs.get("parent"):
+            parent = scene.node(kwargs["parent"])
+        elif objects and not kwargs.get("world"):
+            parent = objects[0].parent
+        group = scene.createNode("transform", kwargs.get("name") or scene.defaultName("group"), parent)
+        for node in objects:
+            scene.reparent(node, group)
+        self._select([group])
+        return group.name
+
+
+    def joint(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "name", "p": "position", "q": "query", "e": "edit",
+                                         "a": "absolute", "r": "relative", "oj": "orientJoint",
+                                         "sao": "secondaryAxisOrient", "ch": "children",
+                                         "zso": "zeroScaleOrient", "o": "orientation", "rad": "radius"})
+        scene = self.scene
+        if kwargs.get("query"):
+            node = self._objects(args)[0]
+            if kwargs.get("position"):
+                if kwargs.get("relative"):
+                    return list(node.attrs["translate"])
+                return node.pivotWorld()
+            if kwargs.get("orientation"):
+                return list(node.attrs["jointOrient"])
+            return None
+        if kwargs.get("edit"):
+            nodes = self._objects(args)
+            for node in nodes:
+                if "position" in kwargs:
+                    scene.setPivotWorld(node, kwargs["position"])
+                if "orientJoint" in kwargs:
+                    joints = [node]
+                    if kwargs.get("children"):
+                        joints += [d for d in scene.descendants(node) if d.type == "joint"]
+                    for joint in joints:
+                        scene.orientJoint(joint, kwargs["orientJoint"], kwargs.get("secondaryAxisOrient", "yup"))
+            return None
+        parent = None
+        for node in scene.selection:
+            if node.isTransform():
+                parent = node
+                break
+        joint = scene.createNode("joint", kwargs.get("name") or scene.defaultName("joint"), parent)
+        if "position" in kwargs:
+            if kwargs.get("relative"):
+                joint.attrs["translate"] = list(map(float, kwargs["position"]))
+            else:
+                scene.setPivotWorld(joint, kwargs["position"])
+        self._select([joint])
+        return joint.name
+
+
+    def duplicate(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "name", "po": "parentOnly", "rr": "returnRootsOnly"})
+        results = []
+        for node in self._objects(args):
+            copy = self._copy(node, kwargs.get("name"), not kwargs.get("parentOnly"))
+            results.append(copy.name)
+        self._select([self.scene.node(n) for n in results])
+        return results
+
+
+    def _copy(self, node, name, withChildren):
+        scene = self.scene
+        copy = scene.createNode(node.type, name or node.name, node.parent)
+        copy.attrs = dict((k, list(v) if isinstance(v, list) else v) for k, v in node.attrs.items())
+        copy.dynamic = dict((k, dict(v)) for k, v in node.dynamic.items())
+        copy.attrState = dict((k, dict(v)) for k, v in node.attrState.items())
+        for child in node.children:
+            if withChildren or child.isShape():
+                childCopy = self._copy(child, None, withChildren)
+                scene.setParent(childCopy, copy)
+        return copy
+
+
+    def cluster(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "name", "rel": "relative", "r": "relative"})
+        scene = self.scene
+        points = []
+        for component in asList(args):
+            points.extend(scene.componentPositions(component))
+        deformer = scene.createNode("cluster", kwargs.get("name") or scene.defaultName("cluster"))
+        handle = scene.createNode("transform", deformer.name + "Handle")
+        scene.createNode("clusterHandle", handle.name + "Shape", handle)
+        scene.connect(handle, "worldMatrix[0]", deformer, "matrix")
+        if points:
+            centre = vecMath.average(points)
+            handle.attrs["rotatePivot"] = list(centre)
+            handle.attrs["scalePivot"] = list(centre)
+        deformer.attrs["components"] = list(asList(args))
+        self._select([handle])
+        return [deformer.name, handle.name]
+
+
+    def ikHandle(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "name", "sj": "startJoint", "ee": "endEffector",
+                                         "sol": "solver", "ccv": "createCurve", "q": "query",
+                                         "e": "edit", "jl": "jointList", "c": "curve"})
+        scene = self.scene
+        if kwargs.get("query"):
+            handle = self._objects(args)[0]
+            start = handle.inputs.get("startJoint", (None,))[0]
+            effector = handle.inputs.get("endEffector", (None,))[0]
+            if kwargs.get("startJoint"):
+                return start.name
+            if kwargs.get("endEffector"):
+                return effector.name
+            if kwargs.get("jointList"):
+                joints = []
+                node = effector.parent
+                while node and node is not start:
+                    joints.append(node.name)
+                    node = node.parent
+                joints.append(start.name)
+                return list(reversed(joints))
+            if kwargs.get("curve"):
+                curve = handle.inputs.get("inCurve", (None,))[0]
+                return curve.fullPath() if curve else None
+            return None
+        start = scene.node(kwargs["startJoint"])
+        end = scene.node(kwargs["endEffector"])
+        effector = scene.createNode("ikEffector", scene.defaultName("effector"), end.parent)
+        scene.setPivotWorld(effector, end.pivotWorld())
+        handle = scene.createNode("ikHandle", kwargs.get("name") or scene.defaultName("ikHandle"))
+        scene.setPivotWorld(handle, end.pivotWorld())
+        handle.attrs["solver"] = kwargs.get("solver", "ikRPsolver")
+        scene.connect(start, "message", handle, "startJoint")
+        scene.connect(effector, "handlePath[0]", handle, "endEffector")
+        results = [handle.name, effector.name]
+        if kwargs.get("solver") == "ikSplineSolver" and kwargs.get("createCurve", True):
+            chain = [end]
+            while chain[-1] is not start and chain[-1].parent:
+                chain.append(chain[-1].parent)
+            positions = [j.pivotWorld() for j in reversed(chain)]
+            # simplified curve with one span, four cvs along the chain
+            cvs = [positions[int(round(i * (len(positions) - 1) / 3.0))] for i in range(4)]
+            curveName = self.curve(point=cvs, degree=3)
+            curve = scene.node(curveName)
+            scene.setParent(curve, start.parent)
+            scene.setWorldMatrix(curve, vecMath.identity())
+            scene.connect(curve, "worldSpace[0]", handle, "inCurve")
+            results.append(curve.name)
+        elif kwargs.get("curve"):
+            scene.connect(scene.node(kwargs["curve"]), "worldSpace[0]", handle, "inCurve")
+        self._select([handle])
+        return results
+
+
+    def blendShape(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "name", "w": "weight"})
+        scene = self.scene
+        nodes = self._objects(args)
+        targets, base = nodes[:-1], nodes[-1]
+        deformer = scene.createNode("blendShape", kwargs.get("name") or scene.defaultName("blendShape"))
+        for i, target in enumerate(targets):
+            # the weight of each target is aliased to the target name
+            deformer.dynamic[target.name] = {"attributeType": "double", "defaultValue": 0.0}
+            deformer.attrs[target.name] = 0.0
+            scene.connect(target, "worldSpace[0]", deformer, "inputTarget[0].inputTargetGroup[%s]" % i)
+        self._deform(deformer, [base])
+        return [deformer.name]
+
+
+    def wire(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"w": "wire", "n": "name", "dds": "dropoffDistance"})
+        scene = self.scene
+        geometry = self._objects(args)
+        deformer = scene.createNode("wire", kwargs.get("name") or scene.defaultName("wire"))
+        for i, curveName in enumerate(asList(kwargs.get("wire"))):
+            curve = scene.node(curveName)
+            # maya keeps a copy of the wire curve as its base
+            base = self._copy(curve, curve.name + "BaseWire", False)
+            scene.connect(curve, "worldSpace[0]", deformer, "deformedWire[%s]" % i)
+            scene.connect(base, "worldSpace[0]", deformer, "baseWire[%s]" % i)
+        self._deform(deformer, geometry)
+        return [deformer.name]
+
+
+    def nonLinear(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"typ": "type", "n": "name"})
+        scene = self.scene
+        geometry = self._objects(args)
+        deformerType = kwargs.get("type", "bend")
+        deformer = scene.createNode(deformerType, kwargs.get("name") or scene.defaultName(deformerType))
+        handle = scene.createNode("transform", deformer.name + "Handle")
+        shape = scene.createNode("deform" + deformerType[0].upper() + deformerType[1:], handle.name + "Shape", handle)
+        scene.connect(handle, "worldMatrix[0]", deformer, "matrix")
+        scene.connect(shape, "deformerData", deformer, "deformerData")
+        self._deform(deformer, geometry)
+        self._select([handle])
+        return [deformer.name, handle.name]
+
+
+    def _deform(self, deformer, geometry):
+        ''' put deformer on the end of each geometry's deformer stack '''
+        scene = self.scene
+        for i, node in enumerate(geometry):
+            shapes = scene.shapes(node) if not node.isShape() else [node]
+            shape = shapes[0] if shapes else node
+            previous = shape.inputs.get("create")
+            if previous:
+                scene.disconnect(previous[0], previous[1], shape, "create")
+                scene.connect(previous[0], previous[1], deformer, "input[%s].inputGeometry" % i)
+            scene.connect(deformer, "outputGeometry[%s]" % i, shape, "create")
+
+
+    def arclen(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"ch": "constructionHistory"})
+        scene = self.scene
+        curve = self._objects(args)[0]
+        shape = (scene.shapes(curve) or [curve])[0]
+        if kwargs.get("constructionHistory"):
+            info = scene.createNode("curveInfo")
+            scene.connect(shape, "worldSpace[0]", info, "inputCurve")
+            return info.name
+        points = scene.componentPositions(curve.name + ".cv[:]")
+        return sum(vecMath.distance(a, b) for a, b in zip(points, points[1:]))
+
+
+    def TagAsController(self):
+        self.controller(*[node.name for node in self.scene.selection])
+
+
+    def controller(self, *args, **kwargs):
+        for node in self._objects(asList(args)) if args else list(self.scene.selection):
+            tag = self.scene.createNode("controller", node.name + "_tag")
+            self.scene.connect(node, "message", tag, "controllerObject")
+
+
+    #-------------------------------------------------------------------------
+    # constraints
+    #-------------------------------------------------------------------------
+    def _constraint(self, constraintType, args, kwargs):
+        kwargs = normalizeFlags(kwargs, {"mo": "maintainOffset", "w": "weight", "n": "name",
+                                         "o": "offset", "sk": "skip"})
+        scene = self.scene
+        nodes = self._objects(args)
+        if len(nodes) < 2:
+            nodes = list(self.scene.selection)
+        targets, obj = nodes[:-1], nodes[-1]
+        name = kwargs.get("name") or "%s_%s1" % (obj.name, constraintType)
+        constraint = scene.createNode(constraintType, name, obj)
+        weight = kwargs.get("weight", 1.0)
+        for i, target in enumerate(targets):
+            attr = "%sW%s" % (target.name, i)
+            constraint.dynamic[attr] = {"attributeType": "double", "defaultValue": weight}
+            constraint.attrs[attr] = weight
+            scene.connect(target, "parentMatrix[0]", constraint, "target[%s].targetParentMatrix" % i)
+        if not kwargs.get("maintainOffset"):
+            if constraintType in ("pointConstraint", "parentConstraint"):
+                scene.setPivotWorld(obj, vecMath.average([t.pivotWorld() for t in targets]))
+            if constraintType in ("orientConstraint", "parentConstraint"):
+                rotations = [vecMath.rotationMatrix(t.worldMatrix()) for t in targets]
+                scene.setWorldRotation(obj, self._averageRotation(rotations))
+        outputs = {"pointConstraint": ["translate"], "orientConstraint": ["rotate"],
+                   "parentConstraint": ["translate", "rotate"], "scaleConstraint": ["scale"],
+                   "aimConstraint": ["rotate"], "poleVectorConstraint": ["poleVector"]}[constraintType]
+        for attr in outputs:
+            for axis in "XYZ":
+                dst = attr + axis
+                if dst in obj.inputs:
+                    src = obj.inputs[dst]
+                    scene.disconnect(src[0], src[1], obj, dst)
+                scene.connect(constraint, "constraint" + attr[0].upper() + attr[1:] + axis, obj, dst)
+        return [constraint.name]
+
+
+    def _averageRotation(self, rotations):
+        if len(rotations) == 1:
+            return rotations[0]
+        rows = []
+        for i in range(3):
+            rows.append(vecMath.normalize(vecMath.average([r[i][:3] for r in rotations])))
+        # re-orthogonalise
+        z = vecMath.normalize(vecMath.cross(rows[0], rows[1]))
+        y = vecMath.cross(z, rows[0])
+        return [rows[0] + [0.0], y + [0.0], z + [0.0], [0.0, 0.0, 0.0, 1.0]]
+
+
+    def pointConstraint(self, *args, **kwargs):
+        return self._constraint("pointConstraint", args, kwargs)
+
+
+    def orientConstraint(self, *args, **kwargs):
+        return self._constraint("orientConstraint", args, kwargs)
+
+
+    def parentConstraint(self, *args, **kwargs):
+        return self._constraint("parentConstraint", args, kwargs)
+
+
+    def scaleConstraint(self, *args, **kwargs):
+        return self._constraint("scaleConstraint", args, kwargs)
+
+
+    def aimConstraint(self, *args, **kwargs):
+        return self._constraint("aimConstraint", args, kwargs)
+
+
+    def poleVectorConstraint(self, *args, **kwargs):
+        return self._constraint("poleVectorConstraint", args, kwargs)
+
+
+    #-------------------------------------------------------------------------
+    # editing
+    #-------------------------------------------------------------------------
+    def parent(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"w": "world", "r": "relative", "s": "shape", "a": "absolute",
+                                         "add": "addObject"})
+        scene = self.scene
+        names = asList(args)
+        if kwargs.get("world"):
+            nodes, parent = self._objects(names), None
+        else:
+            if len(names) == 1:
+                names = [n.name for n in scene.selection] + names
+            nodes, parent = [scene.node(n) for n in names[:-1]], scene.node(names[-1])
+        results = []
+        for node in nodes:
+            if kwargs.get("addObject"):
+                scene.addInstance(node, parent)
+                results.append(node.name)
+                continue
+            if node.parent is parent:
+                results.append(node.name)
+                continue
+            if kwargs.get("relative") or node.isShape():
+                scene.setParent(node, parent)
+            else:
+                scene.reparent(node, parent)
+            results.append(node.name)
+        return results
+
+
+    def ungroup(self, *args, **kwargs):
+        scene = self.scene
+        for group in self._objects(args):
+            for child in [c for c in group.children if c.isTransform()]:
+                scene.reparent(child, group.parent)
+            if not group.children:
+                scene.delete(group)
+
+
+    def delete(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"ch": "constructionHistory"})
+        if kwargs.get("constructionHistory"):
+            return
+        for node in self._objects(args):
+            self.scene.delete(node)
+
+
+    def rename(self, *args, **kwargs):
+        if len(args) == 1:
+            node, newName = self.scene.selection[0], args[0]
+        else:
+            node, newName = self.scene.node(args[0]), args[1]
+        return self.scene.rename(node, newName)
+
+
+    def select(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"r": "replace", "cl": "clear", "add": "add", "d": "deselect",
+                                         "hi": "hierarchy"})
+        if kwargs.get("clear"):
+            self.scene.selection = []
+            return
+        nodes = [self.scene.node(n) for n in asList(args)]
+        if kwargs.get("hierarchy"):
+            nodes = nodes + [d for n in nodes for d in self.scene.descendants(n)]
+        if kwargs.get("add"):
+            self.scene.selection.extend(n for n in nodes if n not in self.scene.selection)
+        elif kwargs.get("deselect"):
+            self.scene.selection = [n for n in self.scene.selection if n not in nodes]
+        else:
+            self.scene.selection = nodes
+
+
+    def pickWalk(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"d": "direction"})
+        direction = kwargs.get("direction", "down")
+        result = []
+        for node in self._objects(args):
+            if direction == "down":
+                children = [c for c in node.children if not c.isShape()]
+                result.append(children[0] if children else node)
+            elif direction == "up":
+                result.append(node.parent or node)
+            else:
+                result.append(node)
+        self.scene.selection = result
+        return [n.name for n in result]
+
+
+    def makeIdentity(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"a": "apply", "t": "translate", "r": "rotate", "s": "scale",
+                                         "jo": "jointOrient", "n": "normal"})
+        scene = self.scene
+        for node in self._objects(args):
+            if not node.isTransform():
+                continue
+            saved = scene.keepChildren(node)
+            position = node.pivotWorld()
+            if node.type == "joint":
+                if kwargs.get("jointOrient"):
+                    scene.setWorldJointOrient(node, vecMath.identity())
+                elif kwargs.get("rotate"):
+                    scene.setWorldJointOrient(node, vecMath.rotationMatrix(node.worldMatrix()))
+                if kwargs.get("scale"):
+                    node.attrs["scale"] = [1.0, 1.0, 1.0]
+                scene.setPivotWorld(node, position)
+            else:
+                # bake the frozen channels into the shapes
+                before = node.localMatrix()
+                if kwargs.get("rotate"):
+                    node.attrs["rotate"] = [0.0, 0.0, 0.0]
+                if kwargs.get("scale"):
+                    node.attrs["scale"] = [1.0, 1.0, 1.0]
+                if kwargs.get("translate"):
+                    node.attrs["translate"] = [0.0, 0.0, 0.0]
+                    node.attrs["rotatePivot"] = list(position) if not node.parent else node.attrs["rotatePivot"]
+                delta = vecMath.matMul(before, vecMath.matInverse(node.localMatrix()))
+                for shape in scene.shapes(node):
+                    if "cvs" in shape.attrs:
+                        shape.attrs["cvs"] = [vecMath.transformPoint(p, delta) for p in shape.attrs["cvs"]]
+            scene.restoreChildren(saved)
+
+
+    def _transformEdit(self, args, kwargs, channel):
+        ''' shared code of move, rotate and scale '''
+        kwargs = normalizeFlags(kwargs, {"r": "relative", "a": "absolute", "ws": "worldSpace",
+                                         "os": "objectSpace", "ls": "localSpace", "p": "pivot"})
+        scene = self.scene
+        values, names = self._splitArgs(args)
+        axes = [i for i, axis in enumerate("xyz") if kwargs.get(axis) or
+                kwargs.get(channel + axis.upper()) or kwargs.get("move" + axis.upper())]
+        if len(values) == 1:
+            values = values * 3
+            if not axes:
+                axes = [0, 1, 2]
+        elif not axes:
+            axes = [0, 1, 2]
+        return scene, values, names, axes, kwargs
+
+
+    def move(self, *args, **kwargs):
+        scene, values, names, axes, kwargs = self._transformEdit(args, kwargs, "translate")
+        pivots = [n for n in names if "." in n]
+        objects = self._objects([n for n in names if "." not in n]) if len(pivots) < len(names) or not names else []
+        for plug in pivots:
+            node, attr = scene.splitPlug(plug)
+            local = vecMath.transformPoint(values, vecMath.matInverse(node.worldMatrix()))
+            if attr in ("rotatePivot", "scalePivot"):
+                saved = node.worldMatrix()
+                node.attrs[attr] = local
+                # keep the node in place, like maya's pivot translate compensation
+                offset = vecMath.sub([saved[3][i] for i in range(3)], node.worldMatrix()[3][:3])
+                if node.parent:
+                    offset = vecMath.transformVector(offset, vecMath.matInverse(node.parentMatrix()))
+                key = "rotatePivotTranslate" if attr == "rotatePivot" else "scalePivotTranslate"
+                node.attrs[key] = vecMath.add(node.attrs[key], offset)
+        for node in objects:
+            if kwargs.get("objectSpace") or kwargs.get("localSpace"):
+                translate = node.attrs["translate"]
+                for i in axes:
+                    translate[i] = translate[i] + values[i] if kwargs.get("relative") else values[i]
+                continue
+            current = node.pivotWorld()
+            target = list(current)
+            for i in axes:
+                target[i] = current[i] + values[i] if kwargs.get("relative") else values[i]
+            scene.setPivotWorld(node, target)
+
+
+    def rotate(self, *args, **kwargs):
+        scene, values, names, axes, kwargs = self._transformEdit(args, kwargs, "rotate")
+        for node in self._objects(names):
+            saved = scene.keepChildren(node) if False else None
+            rotate = node.attrs["rotate"]
+            for i in axes:
+                rotate[i] = rotate[i] + values[i] if kwargs.get("relative") else values[i]
+
+
+    def scale(self, *args, **kwargs):
+        scene, values, names, axes, kwargs = self._transformEdit(args, kwargs, "scale")
+        for node in self._objects(names):
+            old = list(node.attrs["scale"])
+            scale = node.attrs["scale"]
+            for i in axes:
+                scale[i] = scale[i] * values[i] if kwargs.get("relative") else values[i]
+            pivot = kwargs.get("pivot")
+            if pivot is not None:
+                # scale the position around the pivot as well
+                position = node.pivotWorld()
+                ratio = [scale[i] / old[i] if old[i] else 1.0 for i in range(3)]
+                target = [pivot[i] + (position[i] - pivot[i]) * ratio[i] for i in range(3)]
+                scene.setPivotWorld(node, target)
+
+
+    def xform(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"q": "query", "ws": "worldSpace", "os": "objectSpace",
+                                         "t": "translation", "ro": "rotation", "s": "scale",
+                                         "m": "matrix", "rp": "rotatePivot", "sp": "scalePivot",
+                                         "a": "absolute", "r": "relative", "piv": "pivots",
+                                         "bb": "boundingBox"})
+        scene = self.scene
+        world = kwargs.get("worldSpace")
+        components = [a for a in asList(args) if "." in str(a)]
+        if kwargs.get("query") and components:
+            result = []
+            for component in components:
+                for point in scene.componentPositions(component, world):
+                    result.extend(point)
+            return result
+        nodes = self._objects(args)
+        if kwargs.get("query"):
+            result = []
+            for node in nodes:
+                if kwargs.get("translation"):
+                    if world:
+                        result.extend(node.worldMatrix()[3][:3])
+                    else:
+                        result.extend(node.attrs["translate"])
+                elif kwargs.get("rotation"):
+                    if world:
+                        result.extend(vecMath.matrixToEuler(node.worldMatrix()))
+                    else:
+                        result.extend(node.attrs["rotate"])
+                elif kwargs.get("scale"):
+                    result.extend(node.attrs["scale"])
+                elif kwargs.get("matrix"):
+                    result.extend(vecMath.flatten(node.worldMatrix() if world else node.localMatrix()))
+                elif kwargs.get("rotatePivot") or kwargs.get("pivots"):
+                    if world:
+                        result.extend(node.pivotWorld())
+                    else:
+                        result.extend(node.attrs["rotatePivot"])
+                elif kwargs.get("boundingBox"):
+                    points = self._worldPoints(node)
+                    result.extend([min(p[i] for p in points) for i in range(3)] +
+                                  [max(p[i] for p in points) for i in range(3)])
+            return result
+        for node in nodes:
+            if "matrix" in kwargs:
+                matrix = vecMath.unflatten(kwargs["matrix"])
+                if world:
+                    scene.setWorldMatrix(node, matrix)
+                else:
+                    t, r, s = vecMath.decomposeMatrix(matrix)
+                    node.attrs["translate"], node.attrs["rotate"], node.attrs["scale"] = t, r, s
+            if "rotation" in kwargs:
+                if world:
+                    scene.setWorldRotation(node, vecMath.eulerToMatrix(kwargs["rotation"]))
+                else:
+                    node.attrs["rotate"] = list(map(float, kwargs["rotation"]))
+            if "scale" in kwargs:
+                node.attrs["scale"] = list(map(float, kwargs["scale"]))
+            if "translation" in kwargs:
+                value = list(map(float, kwargs["translation"]))
+                if kwargs.get("relative"):
+                    value = vecMath.add(node.pivotWorld() if world else node.attrs["translate"], value)
+                if world:
+                    scene.setWorldMatrix(node, self._withTranslation(node.worldMatrix(), value), rotation=False)
+                else:
+                    node.attrs["translate"] = value
+            if "rotatePivot" in kwargs or "pivots" in kwargs:
+                pivot = list(map(float, kwargs.get("rotatePivot", kwargs.get("pivots"))))
+                if world:
+                    pivot = vecMath.transformPoint(pivot, vecMath.matInverse(node.worldMatrix()))
+                node.attrs["rotatePivot"] = pivot
+                node.attrs["scalePivot"] = list(pivot)
+
+
+    def _withTranslation(self, matrix, translation):
+        matrix = [list(r) for r in matrix]
+        matrix[3][0], matrix[3][1], matrix[3][2] = translation
+        return matrix
+
+
+    def _worldPoints(self, node):
+        points = []
+        for shape in [node] + self.scene.descendants(node):
+            if "cvs" in shape.attrs:
+                world = shape.worldMatrix()
+                points.extend(vecMath.transformPoint(p, world) for p in shape.attrs["cvs"])
+        return points or [node.pivotWorld()]
+
+
+    def objectCenter(self, *args, **kwargs):
+        points = self._worldPoints(self._objects(args)[0])
+        low = [min(p[i] for p in points) for i in range(3)]
+        high = [max(p[i] for p in points) for i in range(3)]
+        return vecMath.mul(vecMath.add(low, high), 0.5)
+
+
+    #-------------------------------------------------------------------------
+    # attributes
+    #-------------------------------------------------------------------------
+    def addAttr(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"ln": "longName", "sn": "shortName", "at": "attributeType",
+                                         "dt": "dataType", "dv": "defaultValue", "k": "keyable",
+                                         "en": "enumName", "min": "minValue", "max": "maxValue",
+                                         "m": "multi", "q": "query", "ex": "exists"})
+        scene = self.scene
+        nodes = self._objects(args)
+        if kwargs.get("query"):
+            node, attr = scene.splitPlug(args[0]) if args and "." in args[0] else (nodes[0], kwargs.get("longName"))
+            if kwargs.get("exists"):
+                return attr in node.dynamic
+            return node.dynamic.get(attr)
+        name = kwargs["longName"]
+        for node in nodes:
+            if name in node.dynamic:
+                raise RuntimeError("Found more than one attribute named %s on %s" % (name, node.name))
+            options = {"attributeType": kwargs.get("attributeType"), "dataType": kwargs.get("dataType")}
+            for key in ("minValue", "maxValue", "enumName", "keyable", "multi"):
+                if key in kwargs:
+                    options[key] = kwargs[key]
+            default = kwargs.get("defaultValue")
+            if default is None:
+                if options["dataType"] == "string":
+                    default = None
+                elif options["attributeType"] not in (None, "message", "compound"):
+                    default = 0
+            options["defaultValue"] = default
+            node.dynamic[name] = options
+            if options["attributeType"] != "message" and options["dataType"] is None or options["dataType"]:
+                node.attrs[name] = default
+
+
+    def deleteAttr(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"at": "attribute"})
+        scene = self.scene
+        if "attribute" in kwargs:
+            node, attr = scene.node(args[0]), kwargs["attribute"]
+        else:
+            node, attr = scene.splitPlug(args[0])
+        for key, src in list(node.inputs.items()):
+            if key == attr or key.startswith(attr + "["):
+                scene.disconnect(src[0], src[1], node, key)
+        for srcAttr, dst, dstAttr in list(node.outputs):
+            if srcAttr == attr or srcAttr.startswith(attr + "["):
+                scene.disconnect(node, srcAttr, dst, dstAttr)
+        node.dynamic.pop(attr, None)
+        node.attrs.pop(attr, None)
+
+
+    def setAttr(self, plug, *values, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"l": "lock", "k": "keyable", "cb": "channelBox",
+                                         "typ": "type", "e": "edit"})
+        node, attr = self.scene.splitPlug(plug)
+        if node.type.startswith("animCurve") and attr.split("[", 1)[0] in ("keyTimeValue", "ktv"):
+            flat = asList(values)
+            keys = [(flat[i], flat[i + 1]) for i in range(0, len(flat), 2)]
+            match = re.search(r"\[(\d+)(?::\d+)?\]", attr)
+            first = int(match.group(1)) if match else 0
+            # like maya, only the indices given are written, later keys stay
+            old = node.attrs.get("keyTimeValue", [])
+            node.attrs["keyTimeValue"] = old[:first] + keys + old[first + len(keys):]
+            return
+        state = node.attrState.setdefault(attr, {})
+        if values:
+            if state.get("lock"):
+                raise RuntimeError("The attribute '%s' is locked or connected and cannot be modified." % plug)
+            if len(values) == 1:
+                value = values[0]
+                if isinstance(value, (list, tuple)) and len(value) == 1 and kwargs.get("type") != "string":
+                    value = value[0]
+            else:
+                value = list(values)
+            if kwargs.get("type") in ("matrix",):
+                value = list(value)
+            self.scene.setValue(node, attr, value)
+        for flag in ("lock", "keyable", "channelBox"):
+            if flag in kwargs:
+                state[flag] = bool(kwargs[flag])
+
+
+    def getAttr(self, plug, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"l": "lock", "k": "keyable", "cb": "channelBox",
+                                         "typ": "type", "t": "time"})
+        node, attr = self.scene.splitPlug(plug)
+        if not self.scene.hasAttr(node, attr):
+            raise ValueError("No object matches name: %s" % plug)
+        state = node.attrState.get(attr, {})
+        for flag, default in (("lock", False), ("keyable", True), ("channelBox", False)):
+            if kwargs.get(flag):
+                return state.get(flag, default)
+        if kwargs.get("type"):
+            value = self.scene.getValue(node, attr)
+            return "string" if isinstance(value, str) else "double"
+        return self.scene.evaluate(node, attr)
+
+
+    def connectAttr(self, src, dst, force=False, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"f": "force", "na": "nextAvailable"})
+        scene = self.scene
+        srcNode, srcAttr = scene.splitPlug(src)
+        dstNode, dstAttr = scene.splitPlug(dst)
+        if kwargs.get("nextAvailable") and not dstAttr.endswith("]"):
+            dstAttr = "%s[%s]" % (dstAttr, scene.nextIndex(dstNode, dstAttr))
+        if dstNode.attrState.get(dstAttr, {}).get("lock"):
+            raise RuntimeError("The destination attribute '%s' is locked" % dst)
+        scene.connect(srcNode, srcAttr, dstNode, dstAttr, force or kwargs.get("force", False))
+        if srcNode.type in EVALUATED_TYPES and dstNode.isTransform():
+            scene.setValue(dstNode, dstAttr, scene.evaluate(srcNode, srcAttr))
+
+
+    def disconnectAttr(self, src, dst, **kwargs):
+        scene = self.scene
+        srcNode, srcAttr = scene.splitPlug(src)
+        dstNode, dstAttr = scene.splitPlug(dst)
+        if srcAttr not in [o[0] for o in srcNode.outputs]:
+            # parent multi plug, e.g. "shape.instObjGroups", use its first element
+            for attr, node, otherAttr in srcNode.outputs:
+                if attr.startswith(srcAttr + "[") and node is dstNode and otherAttr == dstAttr:
+                    srcAttr = attr
+                    break
+        scene.disconnect(srcNode, srcAttr, dstNode, dstAttr)
+
+
+    #-------------------------------------------------------------------------
+    # animation
+    #-------------------------------------------------------------------------
+    def _animCurve(self, plug):
+        node, attr = self.scene.splitPlug(plug)
+        src = node.inputs.get(attr)
+        if src and src[0].type.startswith("animCurve"):
+            return src[0]
+        return None
+
+
+    def currentTime(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"q": "query", "e": "edit", "u": "update"})
+        if kwargs.get("query"):
+            return self.time
+        self.time = float(args[0])
+        return self.time
+
+
+    def setKeyframe(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"at": "attribute", "t": "time", "v": "value"})
+        plugs = []
+        for target in asList(args):
+            if "." in target:
+                plugs.append(target)
+            else:
+                plugs.extend(target + "." + attr for attr in asList(kwargs.get("attribute")))
+        time = float(asList(kwargs.get("time", self.time))[0])
+        for plug in plugs:
+            curve = self._animCurve(plug)
+            if curve is None:
+                name = self.createNode("animCurveTU", name=plug.replace(".", "_"))
+                self.connectAttr(name + ".output", plug)
+                curve = self.scene.node(name)
+            value = kwargs.get("value", self.getAttr(plug))
+            keys = dict(curve.attrs.get("keyTimeValue", []))
+            keys[time] = asList(value)[0]
+            curve.attrs["keyTimeValue"] = sorted(keys.items())
+        return len(plugs)
+
+
+    def keyframe(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"q": "query", "n": "name", "tc": "timeChange", "vc": "valueChange"})
+        curves = [c for c in (self._animCurve(plug) for plug in asList(args)) if c is not None]
+        if kwargs.get("name"):
+            return [c.name for c in curves] or None
+        result = []
+        for curve in curves:
+            for time, value in curve.attrs.get("keyTimeValue", []):
+                if kwargs.get("timeChange"):
+                    result.append(time)
+                if kwargs.get("valueChange"):
+                    result.append(value)
+        return result or None
+
+
+    def cutKey(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"t": "time", "cl": "clear", "in": "index"})
+        start, end = kwargs.get("time", (float("-inf"), float("inf")))
+        index = asList(kwargs.get("index", (0, float("inf"))))
+        first, last = index[0], index[-1]
+        for plug in asList(args):
+            curve = self._animCurve(plug)
+            if curve is not None:
+                keys = curve.attrs.get("keyTimeValue", [])
+                keys = [(t, v) for i, (t, v) in enumerate(keys) if not (start <= t <= end and first <= i <= last)]
+                curve.attrs["keyTimeValue"] = keys
+                # maya deletes a curve left without keys
+                if not keys:
+                    self.delete(curve.name)
+
+
+    #-------------------------------------------------------------------------
+    # queries
+    #-------------------------------------------------------------------------
+    def objExists(self, name):
+        if not name:
+            return False
+        name = str(name)
+        if not self.scene.exists(name):
+            return False
+        if "." in name:
+            node, attr = self.scene.splitPlug(name)
+            return self.scene.hasAttr(node, attr)
+        return True
+
+
+    def nodeType(self, name, **kwargs):
+        return self.scene.node(name).type
+
+
+    def listRelatives(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"s": "shapes", "c": "children", "p": "parent",
+                                         "ad": "allDescendents", "f": "fullPath", "typ": "type",
+                                         "ni": "noIntermediate", "pa": "path", "ap": "allParents"})
+        scene = self.scene
+        result = []
+        for node in self._objects(args):
+            if kwargs.get("parent"):
+                related = [node.parent] if node.parent else []
+            elif kwargs.get("allParents"):
+                related = ([node.parent] if node.parent else []) + node.instances
+            elif kwargs.get("allDescendents"):
+                related = list(reversed(scene.descendants(node)))
+            else:
+                related = list(node.children)
+            if kwargs.get("shapes"):
+                related = [n for n in related if n.isShape()]
+            if kwargs.get("type"):
+                types = asList(kwargs["type"])
+                related = [n for n in related if n.type in types]
+            for n in related:
+                name = n.fullPath() if kwargs.get("fullPath") else n.name
+                if name not in result:
+                    result.append(name)
+        return result or None
+
+
+    def listConnections(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"s": "source", "d": "destination", "p": "plugs",
+                                         "c": "connections", "t": "type", "sh": "shapes",
+                                         "scn": "skipConversionNodes"})
+        scene = self.scene
+        source = kwargs.get("source", True)
+        destination = kwargs.get("destination", True)
+        types = asList(kwargs.get("type"))
+        result = []
+        for target in asList(args):
+            if "." in target:
+                node, attr = scene.splitPlug(target)
+            else:
+                node, attr = scene.node(target), None
+
+            def matches(name):
+                return attr is None or name == attr or name.startswith(attr + "[") or name.startswith(attr + ".")
+
+            pairs = []
+            if source:
+                for dstAttr, (src, srcAttr) in list(node.inputs.items()):
+                    if matches(dstAttr):
+                        pairs.append((dstAttr, src, srcAttr))
+            if destination:
+                for srcAttr, dst, dstAttr in list(node.outputs):
+                    if matches(srcAttr):
+                        pairs.append((srcAttr, dst, dstAttr))
+            for myAttr, other, otherAttr in pairs:
+                if types and other.type not in types:
+                    continue
+                if kwargs.get("connections"):
+                    result.append("%s.%s" % (node.name, myAttr))
+                if kwargs.get("plugs"):
+                    result.append("%s.%s" % (other.name, otherAttr))
+                else:
+                    # shapes report their transform unless asked for shapes
+                    if other.isShape() and not kwargs.get("shapes") and other.parent:
+                        result.append(other.parent.name)
+                    else:
+                        result.append(other.name)
+        return result or None
+
+
+    def ls(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"sl": "selection", "typ": "type", "et": "exactType",
+                                         "fl": "flatten", "l": "long", "sn": "shortNames",
+                                         "tr": "transforms", "s": "shapes", "o": "objectsOnly",
+                                         "uid": "uuid"})
+        scene = self.scene
+        names = asList(args)
+        if kwargs.get("selection"):
+            nodes = list(scene.selection)
+        elif names:
+            nodes = []
+            components = []
+            for pattern in names:
+                pattern = str(pattern)
+                if pattern in scene.uuids:
+                    node = scene.fromUuid(pattern)
+                    if node is not None:
+                        nodes.append(node)
+                    continue
+                if "." in pattern:
+                    if scene.exists(pattern):
+                        components.append(pattern)
+                    continue
+                path, pattern = pattern, shortName(pattern)
+                if any(c in pattern for c in "*?["):
+                    nodes.extend(scene.nodes[n] for n in fnmatch.filter(list(scene.nodes), pattern))
+                elif pattern in scene.nodes:
+                    # a dag path only matches while the node is still under it
+                    full = scene.nodes[pattern].fullPath()
+                    if "|" not in path or full == path or (not path.startswith("|") and full.endswith("|" + path)):
+                        nodes.append(scene.nodes[pattern])
+            if components:
+                result = []
+                for component in components:
+                    if kwargs.get("flatten"):
+                        node = scene.node(component)
+                        shape = node if node.isShape() else (scene.shapes(node) or [node])[0]
+                        result.extend(scene.expandComponents(component, len(shape.attrs.get("cvs", []))))
+                    else:
+                        result.append(component)
+                return result
+        else:
+            nodes = list(scene.nodes.values())
+        if kwargs.get("dag"):
+            expanded = []
+            for node in nodes:
+                expanded.append(node)
+                expanded.extend(scene.descendants(node))
+            nodes = expanded
+        if kwargs.get("type"):
+            types = asList(kwargs["type"])
+            nodes = [n for n in nodes if n.type in types or ("transform" in types and n.isTransform())]
+        if kwargs.get("exactType"):
+            types = asList(kwargs["exactType"])
+            nodes = [n for n in nodes if n.type in types]
+        if kwargs.get("transforms"):
+            nodes = [n for n in nodes if n.isTransform()]
+        if kwargs.get("shapes"):
+            nodes = [n for n in nodes if n.isShape()]
+        if kwargs.get("uuid"):
+            return [n.uuid for n in nodes]
+        return [n.fullPath() if kwargs.get("long") and n.isDag() else n.name for n in nodes]
+
+
+    def attributeQuery(self, attr, node=None, exists=False, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"n": "node", "ex": "exists", "mxe": "maxExists", "mx": "maximum",
+                                         "mne": "minExists", "min": "minimum"})
+        node = self.scene.node(kwargs.get("node", node))
+        attr = self.scene.attrName(node, attr)
+        options = node.dynamic.get(attr, {})
+        for flag, key in (("maxExists", "maxValue"), ("minExists", "minValue")):
+            if kwargs.get(flag):
+                return key in options
+        for flag, key in (("maximum", "maxValue"), ("minimum", "minValue")):
+            if kwargs.get(flag):
+                return [float(options.get(key, 0.0))]
+        return self.scene.hasAttr(node, attr)
+
+
+    #-------------------------------------------------------------------------
+    # misc
+    #-------------------------------------------------------------------------
+    def file(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"f": "force", "n": "new", "rn": "rename", "s": "save",
+                                         "q": "query", "sn": "sceneName", "typ": "type", "o": "open"})
+        scene = self.scene
+        if kwargs.get("query"):
+            return getattr(scene, "fileName", "")
+        if kwargs.get("new"):
+            scene.new()
+            scene.fileName = ""
+        if kwargs.get("rename"):
+            scene.fileName = kwargs["rename"]
+        if kwargs.get("save"):
+            # no maya file format here, save a json listing of the nodes
+            with open(scene.fileName, "w") as f:
+                json.dump(scene.describe(cvs=True), f, indent=1, sort_keys=True)
+            return scene.fileName
+        if kwargs.get("open"):
+            with open(args[0]) as f:
+                scene.load(json.load(f))
+            scene.fileName = args[0]
+            return scene.fileName
+
+
+    def error(self, message, **kwargs):
+        raise RuntimeError(message)
+
+
+    def warning(self, message, **kwargs):
+        print("Warning: %s" % message)
+
+
+    def percent(self, *args, **kwargs):
+        pass
+
+
+    def reorderDeformers(self, *args, **kwargs):
+        pass
+
+
+    def flushUndo(self):
+        pass
+
+
+    def about(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"b": "batch", "v": "version", "api": "apiVersion"})
+        if kwargs.get("batch"):
+            return True
+        if kwargs.get("apiVersion"):
+            return 20220000
+        return "2022"
+
+
+    def refresh(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"q": "query", "su": "suspend", "f": "force"})
+        if kwargs.get("query"):
+            return self.refreshSuspended
+        if "suspend" in kwargs:
+            self.refreshSuspended = bool(kwargs["suspend"])
+
+
+    def evaluationManager(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"q": "query", "m": "mode", "inv": "invalidate"})
+        if kwargs.get("query"):
+            if kwargs.get("mode"):
+                return [self.evaluationMode]
+            return None
+        if "mode" in kwargs:
+            self.evaluationMode = kwargs["mode"]
+
+
+    def progressWindow(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"q": "query", "e": "edit", "ep": "endProgress", "t": "title",
+                                         "pr": "progress", "st": "status", "max": "maxValue",
+                                         "ic": "isCancelled", "ii": "isInterruptable", "s": "step"})
+        state = self.progress
+        if kwargs.get("query"):
+            for flag in ("progress", "maxValue", "status", "isCancelled"):
+                if kwargs.get(flag):
+                    return state[flag]
+            return None
+        if kwargs.get("endProgress"):
+            state.update(progress=0, status="", isCancelled=False)
+            return
+        for flag in ("progress", "maxValue", "status"):
+            if flag in kwargs:
+                state[flag] = kwargs[flag]
+        if "step" in kwargs:
+            state["progress"] += kwargs["step"]
+
+
+    def undoInfo(self, *args, **kwargs):
+        kwargs = normalizeFlags(kwargs, {"q": "query", "st": "state", "swf": "stateWithoutFlush",
+                                         "ock": "openChunk", "cck": "closeChunk", "cn": "chunkName"})
+        if kwargs.get("query"):
+            if kwargs.get("state") or kwargs.get("stateWithoutFlush"):
+                return self.undoState
+            return None
+        for flag in ("state", "stateWithoutFlush"):
+            if flag in kwargs:
+                self.undoState = bool(kwargs[flag])
+        if kwargs.get("openChunk"):
+            self.undoChunks.append(kwargs.get("chunkName", ""))
+        if kwargs.get("closeChunk"):
+            if not self.undoChunks:
+                raise RuntimeError("There is no open undo chunk to close")
+            self.undoChunks.pop()
+
+
+class SceneMel(object):
+    ''' maya.mel style eval for the statements MagicRig batches '''
+    # how many values each flag takes, anything else takes one
+    FLAG_ARITY = {"translation": 3, "t": 3, "rotation": 3, "ro": 3, "scale": 3, "s": 3,
+                  "rotatePivot": 3, "rp": 3, "worldSpace": 0, "ws": 0, "objectSpace": 0,
+                  "os": 0, "absolute": 0, "a": 0, "relative": 0, "r": 0, "parentOnly": 0,
+                  "po": 0, "addObject": 0, "shape": 0, "world": 0, "force": 0, "f": 0,
+                  "skipSelect": 0, "ss": 0, "children": 0, "clear": 0, "cl": 0,
+                  "maintainOffset": 0, "mo": 0, "asUtility": 0, "au": 0, "point": 3, "p": 3}
+
+    def __init__(self, cmds):
+        self.cmds = cmds
+
+
+    def eval(self, script):
+        result = None
+        for tokens in splitStatements(script):
+            if not tokens:
+                continue
+            command, args, flags = tokens[0], [], {}
+            # flags given more than once, like curve -p, become a list of their values
+            repeated = set()
+            i = 1
+            while i < len(tokens):
+                token = tokens[i]
+                if token.startswith("-") and not isNumber(token):
+                    flag = token[1:]
+                    arity = self.FLAG_ARITY.get(flag, 1)
+                    if arity == 0:
+                        value = True
+                    elif arity == 1:
+                        value = melToPython(tokens[i + 1])
+                    else:
+                        value = [melToPython(t) for t in tokens[i + 1:i + 1 + arity]]
+                    if flag in repeated:
+                        flags[flag].append(value)
+                    elif flag in flags and arity:
+                        flags[flag] = [flags[flag], value]
+                        repeated.add(flag)
+                    else:
+                        flags[flag] = value
+                    i += 1 + arity
+                else:
+                    args.append(melToPython(token))
+                    i += 1
+            result = getattr(self.cmds, command)(*args, **flags)
+        return result
+
+
+def splitStatements(script):
+    ''' tokens of each MEL statement, split on ; outside of quotes
+    Quotes are removed and \\ and \" unescaped, like a posix shell.
+    '''
+    statements = []
+    current = []
+    for match in TOKEN_RE.finditer(script):
+        quoted, end, word = match.groups()
+        if end:
+            statements.append(current)
+            current = []
+        elif word is not None:
+            current.append(word)
+        else:
+            current.append(ESCAPE_RE.sub(r"\1", quoted))
+    if current:
+        statements.append(current)
+    return statements
+
+
+def isNumber(token):
+    try:
+        float(token)
+        return True
+    except ValueError:
+        return False
+
+
+def melToPython(token):
+    if token in ("true", "on", "yes"):
+        return True
+    if token in ("false", "off", "no"):
+        return False
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    try:
+        return float(token)
+    except ValueError:
+        return token
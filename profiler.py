@@ -0,0 +1,447 @@
+''' opt-in profiler for rig builds
+
+Wraps the build stages (rig part proxy/toJoint/control, Control and
+proxyObj construction, FkIkBlend and makeStretchyIK) and the cmds and mel
+handles of every MagicRig module, melBatch's too, while it is running.
+Nothing is wrapped when it is not running, so normal builds pay nothing.
+
+    prof = Profiler()
+    with prof:
+        build.buildCharacter("hero")
+    print(prof.table(sortBy="self"))
+    prof.saveTrace("hero_trace.json")
+
+Each stage records wall time, maya.cmds calls by command, with the MEL
+batches counted as mel.eval, and the number of nodes created, inclusive
+of the stages inside it. Nodes are counted with an OpenMaya node added
+callback; without OpenMaya (a stand-in cmds) the count is the change in
+scene size, so deletes show as negative.
+
+    mayapy profiler.py hero --rigType quad --trace hero_trace.json
+    mayapy profiler.py hero --compare-undo
+    mayapy profiler.py hero --compare-drive
+
+--compare-undo builds once more in each undo mode and reports the time
+each one saves over recording every command to the undo queue.
+--compare-drive builds once more in each drive mode, constraints or
+matrix connections, and reports the scene's node count and the time to
+evaluate the joints after posing every control.
+'''
+import os
+import sys
+import json
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# rig part methods that are timed
+PART_METHODS = ("proxy", "toJoint", "control")
+# functions timed wherever they have been imported
+# (module, function, argument used as the stage label)
+FUNCTIONS = (("proxyObj", "proxyObj", 0), ("rigUtils", "FkIkBlend", 1), ("StretchyIK", "makeStretchyIK", 0))
+
+SORT_KEYS = {
+    "name": lambda row: row["name"],
+    "calls": lambda row: -row["calls"],
+    "time": lambda row: -row["time"],
+    "self": lambda row: -row["selfTime"],
+    "cmds": lambda row: -row["cmds"],
+    "nodes": lambda row: -row["nodes"],
+}
+
+
+class Stage(object):
+    ''' one timed call '''
+    __slots__ = ("name", "label", "start", "end", "counts", "nodes", "children", "parent", "depth")
+
+    def __init__(self, name, label, parent=None):
+        self.name = name
+        self.label = label
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent else 0
+        self.start = time.perf_counter()
+        self.end = None
+        self.counts = {}
+        self.nodes = 0
+        self.children = []
+
+
+    def seconds(self):
+        return self.end - self.start
+
+
+    def cmdsCalls(self):
+        return sum(self.counts.values())
+
+
+class CountingCmds(object):
+    ''' stands in for maya.cmds, or maya.mel, and counts calls against the running stages
+    Kwargs:
+        prefix (string) put before the command names, "mel." for maya.mel
+    '''
+    def __init__(self, cmds, profiler, prefix=""):
+        self._cmds = cmds
+        self._profiler = profiler
+        self._prefix = prefix
+        self._funcs = {}
+
+
+    def __getattr__(self, name):
+        func = self._funcs.get(name)
+        if func is None:
+            original = getattr(self._cmds, name)
+            stack = self._profiler.stack
+            command = self._prefix + name
+
+            def func(*args, **kwargs):
+                for stage in stack:
+                    stage.counts[command] = stage.counts.get(command, 0) + 1
+                return original(*args, **kwargs)
+            self._funcs[name] = func
+        return func
+
+
+class Profiler(object):
+    ''' collects Stages while running, use as a context manager or call start/stop '''
+    def __init__(self):
+        self.stages = []
+        self.stack = []
+        self.patches = []
+        self.callback = None
+        self.cmds = None
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+    #-------------------------------------------------------------------------
+    # install
+    #-------------------------------------------------------------------------
+    def start(self):
+        ''' wrap build stages, cmds and mel in every loaded MagicRig module '''
+        if self.patches:
+            return
+        modules = rigModules()
+        for module in modules:
+            if module.__name__.split(".")[-1] == "rigparts":
+                for cls in vars(module).values():
+                    if isinstance(cls, type) and cls.__module__ == module.__name__:
+                        for method in PART_METHODS:
+                            if method in vars(cls):
+                                self.patch(cls, method, self.wrap(vars(cls)[method], cls.__name__ + "." + method))
+            if module.__name__.split(".")[-1] == "Control" and hasattr(module, "Control"):
+                cls = module.Control
+                self.patch(cls, "__init__", self.wrap(cls.__init__, "Control", labelArg=1))
+        for moduleName, funcName, labelArg in FUNCTIONS:
+            originals = set()
+            for module in modules:
+                if module.__name__.split(".")[-1] == moduleName and hasattr(module, funcName):
+                    originals.add(getattr(module, funcName))
+            for original in originals:
+                wrapper = self.wrap(original, funcName, labelArg)
+                # replace every reference, rigparts imports them by name
+                for module in modules:
+                    for name, value in list(vars(module).items()):
+                        if value is original:
+                            self.patch(module, name, wrapper)
+        import maya.cmds
+        import maya.mel
+        self.cmds = maya.cmds
+        counting = CountingCmds(maya.cmds, self)
+        # MEL batches are one mel.eval each, counted under that name
+        countingMel = CountingCmds(maya.mel, self, prefix="mel.")
+        for module in modules:
+            if hasattr(module, "cmds"):
+                self.patch(module, "cmds", counting)
+            if hasattr(module, "mel"):
+                self.patch(module, "mel", countingMel)
+        self.callback = nodeAddedCallback(self)
+
+
+    def stop(self):
+        ''' put back everything start changed '''
+        for target, name, original in reversed(self.patches):
+            setattr(target, name, original)
+        self.patches = []
+        if self.callback is not None:
+            removeCallback(self.callback)
+            self.callback = None
+
+
+    def patch(self, target, name, value):
+        self.patches.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+
+    def wrap(self, func, name, labelArg=0):
+        ''' timed version of func
+        Kwargs:
+            labelArg (int) argument that names the stage, a string or an object with a name
+        '''
+        profiler = self
+
+        def timed(*args, **kwargs):
+            label = args[labelArg] if len(args) > labelArg else None
+            if not isinstance(label, str):
+                label = getattr(label, "name", None)
+            profiler.push(name, "%s %s" % (name, label) if isinstance(label, str) else name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.pop()
+        timed.__name__ = getattr(func, "__name__", name)
+        timed.__doc__ = getattr(func, "__doc__", None)
+        return timed
+
+
+    #-------------------------------------------------------------------------
+    # recording
+    #-------------------------------------------------------------------------
+    def push(self, name, label):
+        parent = self.stack[-1] if self.stack else None
+        stage = Stage(name, label, parent)
+        if parent:
+            parent.children.append(stage)
+        if self.callback is None:
+            # no node added callback, count from the size of the scene
+            stage.nodes = -len(self.cmds.ls())
+        self.stack.append(stage)
+        self.stages.append(stage)
+
+
+    def pop(self):
+        stage = self.stack.pop()
+        stage.end = time.perf_counter()
+        if self.callback is None:
+            stage.nodes += len(self.cmds.ls())
+
+
+    def nodeAdded(self):
+        for stage in self.stack:
+            stage.nodes += 1
+
+
+    #-------------------------------------------------------------------------
+    # output
+    #-------------------------------------------------------------------------
+    def rows(self, sortBy="time"):
+        ''' stages grouped by name
+        Kwargs:
+            sortBy (string) one of name, calls, time, self, cmds, nodes
+        Returns:
+            list of dicts with name, calls, time, selfTime, cmds, selfCmds, nodes, commands
+        '''
+        rows = {}
+        for stage in self.stages:
+            if stage.end is None:
+                continue
+            row = rows.setdefault(stage.name, {"name": stage.name, "calls": 0, "time": 0.0,
+                                               "selfTime": 0.0, "cmds": 0, "selfCmds": 0,
+                                               "nodes": 0, "commands": {}})
+            childTime = sum(c.seconds() for c in stage.children if c.end is not None)
+            childCmds = sum(c.cmdsCalls() for c in stage.children)
+            # nested calls of the same stage are already in the outer one
+            nested = any(s.name == stage.name for s in self.ancestors(stage))
+            row["calls"] += 1
+            row["selfTime"] += stage.seconds() - childTime
+            row["selfCmds"] += stage.cmdsCalls() - childCmds
+            if not nested:
+                row["time"] += stage.seconds()
+                row["cmds"] += stage.cmdsCalls()
+                row["nodes"] += stage.nodes
+                for command, count in stage.counts.items():
+                    row["commands"][command] = row["commands"].get(command, 0) + count
+        return sorted(rows.values(), key=SORT_KEYS[sortBy])
+
+
+    def ancestors(self, stage):
+        result = []
+        while stage.parent:
+            stage = stage.parent
+            result.append(stage)
+        return result
+
+
+    def table(self, sortBy="time", topCommands=3):
+        ''' aligned text table of rows(sortBy) '''
+        lines = ["%-28s %6s %10s %10s %8s %8s %7s  %s" % (
+            "stage", "calls", "time", "self", "cmds", "self", "nodes", "top commands")]
+        for row in self.rows(sortBy):
+            top = sorted(row["commands"].items(), key=lambda item: -item[1])[:topCommands]
+            lines.append("%-28s %6d %9.3fs %9.3fs %8d %8d %7d  %s" % (
+                row["name"], row["calls"], row["time"], row["selfTime"], row["cmds"], row["selfCmds"],
+                row["nodes"], ", ".join("%s %s" % item for item in top)))
+        return "\n".join(lines)
+
+
+    def toDict(self):
+        ''' json friendly dict of every stage and the grouped rows '''
+        origin = self.stages[0].start if self.stages else 0.0
+        stages = []
+        for stage in self.stages:
+            if stage.end is None:
+                continue
+            stages.append({"name": stage.name, "label": stage.label, "depth": stage.depth,
+                           "start": stage.start - origin, "seconds": stage.seconds(),
+                           "nodes": stage.nodes, "commands": stage.counts})
+        return {"stages": stages, "summary": self.rows()}
+
+
+    def saveJson(self, path):
+        with open(path, "w") as f:
+            json.dump(self.toDict(), f, indent=1)
+
+
+    def saveTrace(self, path):
+        ''' chrome://tracing / perfetto file, one complete event per stage '''
+        origin = self.stages[0].start if self.stages else 0.0
+        events = []
+        for stage in self.stages:
+            if stage.end is None:
+                continue
+            events.append({"name": stage.label, "cat": stage.name, "ph": "X", "pid": 1, "tid": 1,
+                           "ts": (stage.start - origin) * 1e6, "dur": stage.seconds() * 1e6,
+                           "args": {"cmds": stage.cmdsCalls(), "nodes": stage.nodes,
+                                    "commands": stage.counts}})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def rigModules():
+    ''' loaded modules from the MagicRig folder, under either import name '''
+    modules = []
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None) or ""
+        if path and os.path.dirname(os.path.abspath(path)) == ROOT:
+            modules.append(module)
+    return modules
+
+
+def nodeAddedCallback(profiler):
+    ''' count created nodes with an OpenMaya callback, None outside maya '''
+    try:
+        import maya.api.OpenMaya as om
+    except ImportError:
+        return None
+    return om.MDGMessage.addNodeAddedCallback(lambda *args: profiler.nodeAdded(), "dependNode")
+
+
+def removeCallback(callback):
+    import maya.api.OpenMaya as om
+    om.MMessage.removeCallback(callback)
+
+
+def compareUndo(build, prefix, rigType="biped", modes=("record", "chunk", "off")):
+    ''' build once per undo mode
+    Returns:
+        list of (mode, seconds, seconds saved against the first mode)
+    '''
+    import maya.cmds as cmds
+    rows = []
+    for mode in modes:
+        cmds.undoInfo(state=True)
+        cmds.flushUndo()
+        start = time.perf_counter()
+        build.buildCharacter(prefix, rigType=rigType, undo=mode)
+        seconds = time.perf_counter() - start
+        rows.append((mode, seconds, rows[0][1] - seconds if rows else 0.0))
+    return rows
+
+
+def evaluationTime(frames=20):
+    ''' seconds per frame to pose every control and pull every joint's world
+    matrix, the controls are put back afterwards
+    '''
+    import maya.cmds as cmds
+    controls = [ctrl for ctrl in cmds.listConnections("MR_Root.controls") or []
+                if not cmds.getAttr(ctrl + ".rotateX", lock=True)]
+    joints = cmds.ls(type="joint")
+    start = time.perf_counter()
+    for frame in range(frames):
+        for ctrl in controls:
+            cmds.setAttr(ctrl + ".rotateX", frame % 10)
+        for joint in joints:
+            cmds.getAttr(joint + ".worldMatrix[0]")
+    seconds = (time.perf_counter() - start) / frames
+    for ctrl in controls:
+        cmds.setAttr(ctrl + ".rotateX", 0)
+    return seconds
+
+
+def compareDrive(build, prefix, rigType="biped", modes=("constraint", "matrix"), frames=20, **options):
+    ''' build once per drive mode
+    Kwargs:
+        options: build options for buildCharacter, e.g. fingers=10
+    Returns:
+        list of (mode, build seconds, node count, evaluation seconds per frame)
+    '''
+    import maya.cmds as cmds
+    rows = []
+    for mode in modes:
+        start = time.perf_counter()
+        build.buildCharacter(prefix, rigType=rigType, drive=mode, undo="off", **options)
+        seconds = time.perf_counter() - start
+        rows.append((mode, seconds, len(cmds.ls()), evaluationTime(frames)))
+    return rows
+
+
+def driveTable(rows):
+    lines = ["%-10s %10s %8s %12s" % ("drive", "build", "nodes", "evaluation")]
+    for mode, seconds, nodes, evaluation in rows:
+        lines.append("%-10s %9.3fs %8d %11.2fms" % (mode, seconds, nodes, evaluation * 1000.0))
+    return "\n".join(lines)
+
+
+def undoTable(rows):
+    lines = ["%-10s %10s %10s" % ("undo", "time", "saved")]
+    for mode, seconds, saved in rows:
+        lines.append("%-10s %9.3fs %9.3fs" % (mode, seconds, saved))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile a MagicRig character build")
+    parser.add_argument("prefix", help="character name")
+    parser.add_argument("--rigType", default="biped")
+    parser.add_argument("--sort", default="time", choices=sorted(SORT_KEYS))
+    parser.add_argument("--json", default=None, help="write stages and summary json")
+    parser.add_argument("--trace", default=None, help="write a chrome trace json")
+    parser.add_argument("--undo", default="chunk", choices=("chunk", "off", "record"),
+                        help="undo mode of the profiled build")
+    parser.add_argument("--compare-undo", dest="compareUndo", action="store_true",
+                        help="also time a build in each undo mode")
+    parser.add_argument("--drive", default="constraint", choices=("constraint", "matrix"),
+                        help="drive mode of the profiled build")
+    parser.add_argument("--compare-drive", dest="compareDrive", action="store_true",
+                        help="also build in each drive mode and time evaluating the joints")
+    args = parser.parse_args(argv)
+
+    import batch
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    build = batch.importBuild()
+    prof = Profiler()
+    with prof:
+        build.buildCharacter(args.prefix, rigType=args.rigType, undo=args.undo, drive=args.drive)
+    print(prof.table(args.sort))
+    if args.compareUndo:
+        print("")
+        print(undoTable(compareUndo(build, args.prefix, args.rigType)))
+    if args.compareDrive:
+        print("")
+        print(driveTable(compareDrive(build, args.prefix, args.rigType)))
+    if args.json:
+        prof.saveJson(args.json)
+    if args.trace:
+        prof.saveTrace(args.trace)
+
+
+if __name__ == "__main__":
+    main()
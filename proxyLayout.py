@@ -0,0 +1,96 @@
+''' proxy layout templates
+
+A layout is the local transform of every proxy and part mover, the
+part options they were made with and the master scale, written as one
+compact json file:
+
+    {"version": 1, "rigType": "biped", "options": {"spineJoints": 4, ...},
+     "masterScale": 1.0, "nodes": {"pHipL": [tx, ty, tz, rx, ry, rz], ...}}
+
+Scale is only written for nodes that are not at 1, 1, 1. Layouts are
+read with one xform query and applied with one batched MEL call, so a
+template can be swapped onto a proxy rig in a few milliseconds.
+'''
+import json
+
+import maya.cmds as cmds
+
+import vecMath
+from melBatch import MelBatch
+
+VERSION = 1
+# decimals kept in the file
+PRECISION = 4
+
+
+def capture(nodes):
+    ''' local transforms of nodes from one xform query
+    Returns:
+        dict of node: [tx, ty, tz, rx, ry, rz] or with sx, sy, sz on the end,
+        apply also takes [tx, ty, tz] on its own
+    '''
+    if not nodes:
+        return {}
+    flat = cmds.xform(nodes, query=True, objectSpace=True, matrix=True)
+    transforms = {}
+    for i, node in enumerate(nodes):
+        translate, rotate, scale = vecMath.decomposeMatrix(vecMath.unflatten(flat[i * 16:i * 16 + 16]))
+        values = translate + rotate
+        if any(abs(s - 1.0) > 1e-6 for s in scale):
+            values += scale
+        transforms[node] = [round(v, PRECISION) + 0.0 for v in values]
+    return transforms
+
+
+def apply(transforms, extra=None):
+    ''' set the local transforms of every node in the scene with one MEL call
+    Args:
+        transforms (dict) node: values, as made by capture
+    Kwargs:
+        extra (list) more (plug, value) setAttr pairs for the same call
+    Returns:
+        list of nodes in transforms that are not in the scene
+    '''
+    names = list(transforms)
+    found = set(cmds.ls(names) or []) if names else set()
+    batch = MelBatch()
+    missing = []
+    for node in names:
+        if node not in found:
+            missing.append(node)
+            continue
+        values = transforms[node]
+        batch.add("setAttr", node + ".translate", *values[0:3], type="double3")
+        if len(values) >= 6:
+            batch.add("setAttr", node + ".rotate", *values[3:6], type="double3")
+        if len(values) == 9:
+            batch.add("setAttr", node + ".scale", *values[6:9], type="double3")
+    for plug, value in extra or []:
+        batch.add("setAttr", plug, value)
+    batch.flush()
+    return missing
+
+
+def write(path, rigType, options, masterScale, transforms):
+    ''' write a layout file, see the module docstring for its contents '''
+    data = {"version": VERSION, "rigType": rigType, "options": options,
+            "masterScale": masterScale, "nodes": transforms}
+    with open(path, "w") as f:
+        json.dump(data, f, separators=(",", ":"), sort_keys=True)
+
+
+def read(path):
+    ''' read a layout file, older files are brought up to VERSION
+    Returns:
+        dict with version, rigType, options, masterScale and nodes
+    '''
+    with open(path) as f:
+        data = json.load(f)
+    if "version" not in data:
+        # the first layouts were only {proxy: translate}
+        data = {"version": 0, "rigType": None, "options": {}, "masterScale": None,
+                "nodes": dict((node, list(t)) for node, t in data.items())}
+    elif data["version"] > VERSION:
+        raise ValueError("%s is a version %s layout, this MagicRig reads up to version %s"
+                         % (path, data["version"], VERSION))
+    return data
@@ -1,156 +1,371 @@
-import maya.cmds as cmds
-
-#import AutoRig
-import proxyObj
-from Control import Control
-
-def FkIkBlend(joints, name, pvOffset, switchCtrl, side=""):
-    '''Create an FK/IK controls with blend from joint list
-    Only works with RP solver
-
-    Args:
-        joints, list, 3 joints to create controls on
-        
-        name, Str, name of fk/ik system e.g. "left_arm"
-        
-        pvOffset, float, position of pole vector control in relation to the middle joint 
-        
-        switchCtrl, str, the object the blend control attributes will be added to
-        
-    Kwargs:
-        Side, str, Default="", optional side prefix e.g. "L" or "R"
-    
-    Returns:
-        IK handle name, IK control name, IK control offset
-    '''
-    # Duplicate and reparent joints
-    for i in joints:
-        cmds.duplicate(i, parentOnly=True, name="FKJ_" + i)
-        cmds.parent("FKJ_" + i, world=True)
-        cmds.duplicate(i, parentOnly=True, name="IKJ_" + i)
-        cmds.parent("IKJ_" + i, world=True)
-
-    cmds.parent("FKJ_" + joints[1], "FKJ_" + joints[0])
-    cmds.parent("FKJ_" + joints[2], "FKJ_" + joints[1])
-    cmds.parent("IKJ_" + joints[1], "IKJ_" + joints[0])
-    cmds.parent("IKJ_" + joints[2], "IKJ_" + joints[1])
-
-    # FK Controls
-    ctrlName = joints[0] + "FK_" + side
-    controlFK0 = Control(ctrlName, scale=1.5, snapTo=joints[0], pointTo=joints[1], hideChannels=["s", "t", "v"], direction="z")
-    cmds.orientConstraint(controlFK0.ctrlName, "FKJ_" + joints[0], maintainOffset=True)
-    cmds.pointConstraint(joints[0], controlFK0.ctrlName, maintainOffset=True)
-
-    ctrlName = joints[1] + "FK_" + side
-    controlFK1 = Control(ctrlName, scale=1.5, snapTo=joints[1], pointTo=joints[0], hideChannels=["s", "t", "v"], direction="z")
-    cmds.orientConstraint(controlFK1.ctrlName, "FKJ_" + joints[1], maintainOffset=True)
-
-    ctrlName = joints[2] + "FK_" + side
-    controlFK2 = Control(ctrlName, scale=1.5, snapTo=joints[2], pointTo=joints[1], hideChannels=["s", "t", "v"], direction="z")
-    cmds.orientConstraint(controlFK2.ctrlName, "FKJ_" + joints[2], maintainOffset=True)
-
-    cmds.parent(controlFK1.ctrlOff, controlFK0.ctrlName)
-    cmds.parent(controlFK2.ctrlOff, controlFK1.ctrlName)
-    
-    # IK Controls
-    handleName = "ik" + name + side
-    cmds.ikHandle(name=handleName, startJoint="IKJ_" + joints[0], endEffector="IKJ_" + joints[2], solver="ikRPsolver")
-    ctrlName = joints[2] + "IK_" + side
-    controlIK = Control(ctrlName, scale=2, snapTo=joints[2], pointTo=joints[1], hideChannels=["s", "t", "v"], direction="z")
-    cmds.parentConstraint(controlIK.ctrlName, "ik" + name + side, maintainOffset=True)
-    cmds.orientConstraint(controlIK.ctrlName, "IKJ_" + joints[2], maintainOffset=True)
-    # Polevector
-    ctrlName = joints[1] + "PV_" + side
-    controlIKPV = Control(ctrlName, scale=0.5, direction="x", snapTo=joints[1], moveTo=("z", pvOffset), hideChannels=["s", "t", "v"])
-    cmds.poleVectorConstraint(controlIKPV.ctrlName, "ik" + name + side)
-
-    # Constraints
-    cmds.pointConstraint(joints[0], "FKJ_" + joints[0], maintainOffset=False)
-    cmds.pointConstraint(joints[0], "IKJ_" + joints[0], maintainOffset=False)
-
-    blend0 = cmds.orientConstraint("FKJ_" + joints[0], "IKJ_" + joints[0], joints[0], weight=10, maintainOffset=False)[0]
-    blend1 = cmds.parentConstraint("FKJ_" + joints[1], "IKJ_" + joints[1], joints[1], weight=10, maintainOffset=False)[0]
-    blend2 = cmds.parentConstraint("FKJ_" + joints[2], "IKJ_" + joints[2], joints[2], weight=10, maintainOffset=False)[0]
-
-    # Add attributes
-    cmds.addAttr(switchCtrl, longName="Blend_FkIk_" + name + side, attributeType="float", min=0, max=10, defaultValue=0)
-    cmds.setAttr((switchCtrl + ".Blend_FkIk_" + name + side), edit=True, keyable=True)
-
-    cmds.connectAttr(switchCtrl + ".Blend_FkIk_" + name + side, blend0 + ".FKJ_" + joints[0] + "W0")
-    cmds.connectAttr(switchCtrl + ".Blend_FkIk_" + name + side, blend1 + ".FKJ_" + joints[1] + "W0")
-    cmds.connectAttr(switchCtrl + ".Blend_FkIk_" + name + side, blend2 + ".FKJ_" + joints[2] + "W0")
-
-    rev = cmds.shadingNode("plusMinusAverage", asUtility=True, name=name + side + "_Minus")
-    cmds.setAttr((rev + ".operation"), 2)
-    cmds.setAttr(rev + ".input1D[0]", 10)
-    cmds.connectAttr(switchCtrl + ".Blend_FkIk_" + name + side, rev + ".input1D[1]")
-
-    cmds.connectAttr(rev + ".output1D", blend0 + ".IKJ_" + joints[0] + "W1")
-    cmds.connectAttr(rev + ".output1D", blend1 + ".IKJ_" + joints[1] + "W1")
-    cmds.connectAttr(rev + ".output1D", blend2 + ".IKJ_" + joints[2] + "W1")
-
-    # Visibility Toggle
-    cmds.addAttr(switchCtrl, longName="Show_FK_" + name + side, attributeType="bool", defaultValue=1)
-    cmds.setAttr(switchCtrl + ".Show_FK_" + name + side, edit=True, keyable=True)
-    cmds.connectAttr(switchCtrl + ".Show_FK_" + name + side, controlFK0.ctrlName + ".visibility")
-    cmds.connectAttr(switchCtrl + ".Show_FK_" + name + side, controlFK1.ctrlName + ".visibility")
-    cmds.connectAttr(switchCtrl + ".Show_FK_" + name + side, controlFK2.ctrlName + ".visibility")
-
-    cmds.addAttr(switchCtrl, longName="Show_IK_" + name + side, attributeType="bool", defaultValue=1)
-    cmds.setAttr(switchCtrl + ".Show_IK_" + name + side, edit=True, keyable=True)
-    cmds.connectAttr(switchCtrl + ".Show_IK_" + name + side, controlIK.ctrlName + ".visibility")
-    cmds.connectAttr(switchCtrl + ".Show_IK_" + name + side, controlIKPV.ctrlName + ".visibility")
-
-    return (handleName, controlIK.ctrlName, controlIK.ctrlOff)
-
-
-def freezeTransforms(obj):
-    cmds.makeIdentity(obj, apply=True, translate=True, rotate=True, scale=True)
-    cmds.delete(obj, constructionHistory=True)
-
-
-def uniqueName(name):
-    '''check name is unique and return unique name
-    Args:
-        name of object (string)
-    '''
-    newName = name
-    i = 1
-    while cmds.objExists(newName):
-        newName = name + str(i)
-        i += 1
-    return newName
-
-
-def locator(name, pos=[0, 0, 0], snapTo=None):
-    ''' Create new locator 
-    Args:
-        name (string) name of locator
-        pos (float3) x, y, z position
-    Kwargs:
-        snapTo (string) object to snap to
-    Returns:
-        new locators unique name
-    '''
-    name = uniqueName(name)
-    newLoc = cmds.spaceLocator(name=name)[0]
-    if snapTo and cmds.objExists(snapTo):
-        cmds.delete(cmds.pointConstraint(snapTo, newLoc))
-    cmds.move(pos[0], pos[1], pos[2], newLoc, relative=True)
-    # set colour
-    cmds.setAttr(newLoc + ".overrideEnabled", 1)
-    if "L" in name[-1]:
-        cmds.setAttr(newLoc + ".overrideColor", 6)
-    elif "R" in name[-1]:
-        cmds.setAttr(newLoc + ".overrideColor", 13)
-    else:
-        cmds.setAttr(newLoc + ".overrideColor", 22)
-    # Add locator to root nodes proxy object list
-    cmds.addAttr(newLoc, ln="locatorName", at="message")
-    cmds.connectAttr("MR_Root.proxyObjects", newLoc + ".locatorName")
-    # add to rig group
-    try:
-        cmds.parent(newLoc, cmds.getAttr("MR_Root.prefix") + "_Rig")
-    except:
-        cmds.group(newLoc, name=cmds.getAttr("MR_Root.prefix") + "_Rig")
-    return newLoc
+import maya.cmds as cmds
+
+#import AutoRig
+import proxyObj
+import vecMath
+import nameIndex
+import buildContext
+import fkIkMatch
+from melBatch import MelBatch
+from Control import Control, setChannelState
+
+def FkIkBlend(joints, name, pvOffset, switchCtrl, side=""):
+    '''Create an FK/IK controls with blend from joint list
+    Only works with RP solver. The switch, Blend_FkIk_<name><side>, goes
+    from 0 for IK to 1 for FK, see blendJoints.
+
+    Args:
+        joints, list, 3 joints to create controls on
+        
+        name, Str, name of fk/ik system e.g. "left_arm"
+        
+        pvOffset, float, position of pole vector control in relation to the middle joint 
+        
+        switchCtrl, str, the object the blend control attributes will be added to
+        
+    Kwargs:
+        Side, str, Default="", optional side prefix e.g. "L" or "R"
+    
+    Returns:
+        IK handle name, IK control name, IK control offset
+    '''
+    # Duplicate and reparent joints
+    for i in joints:
+        cmds.duplicate(i, parentOnly=True, name="FKJ_" + i)
+        cmds.parent("FKJ_" + i, world=True)
+        cmds.duplicate(i, parentOnly=True, name="IKJ_" + i)
+        cmds.parent("IKJ_" + i, world=True)
+
+    cmds.parent("FKJ_" + joints[1], "FKJ_" + joints[0])
+    cmds.parent("FKJ_" + joints[2], "FKJ_" + joints[1])
+    cmds.parent("IKJ_" + joints[1], "IKJ_" + joints[0])
+    cmds.parent("IKJ_" + joints[2], "IKJ_" + joints[1])
+
+    # FK Controls
+    ctrlName = joints[0] + "FK_" + side
+    controlFK0 = Control(ctrlName, scale=1.5, snapTo=joints[0], pointTo=joints[1], hideChannels=["s", "t", "v"], direction="z", deferChannels=True)
+    drive(controlFK0.ctrlName, "FKJ_" + joints[0], translate=False, sharedPivot=True)
+    drive(joints[0], controlFK0.ctrlName, rotate=False)
+
+    ctrlName = joints[1] + "FK_" + side
+    controlFK1 = Control(ctrlName, scale=1.5, snapTo=joints[1], pointTo=joints[0], hideChannels=["s", "t", "v"], direction="z", deferChannels=True)
+
+    ctrlName = joints[2] + "FK_" + side
+    controlFK2 = Control(ctrlName, scale=1.5, snapTo=joints[2], pointTo=joints[1], hideChannels=["s", "t", "v"], direction="z", deferChannels=True)
+
+    cmds.parent(controlFK1.ctrlOff, controlFK0.ctrlName)
+    cmds.parent(controlFK2.ctrlOff, controlFK1.ctrlName)
+    # the FK controls sit on their joints, so matrix mode can follow with offsetParentMatrix
+    drive(controlFK1.ctrlName, "FKJ_" + joints[1], translate=False, sharedPivot=True)
+    drive(controlFK2.ctrlName, "FKJ_" + joints[2], translate=False, sharedPivot=True)
+    
+    # IK Controls
+    handleName = "ik" + name + side
+    cmds.ikHandle(name=handleName, startJoint="IKJ_" + joints[0], endEffector="IKJ_" + joints[2], solver="ikRPsolver")
+    ctrlName = joints[2] + "IK_" + side
+    controlIK = Control(ctrlName, scale=2, snapTo=joints[2], pointTo=joints[1], hideChannels=["s", "v"], direction="z", deferChannels=True)
+    drive(controlIK.ctrlName, "ik" + name + side)
+    drive(controlIK.ctrlName, "IKJ_" + joints[2], translate=False)
+    # Polevector
+    ctrlName = joints[1] + "PV_" + side
+    controlIKPV = Control(ctrlName, scale=0.5, direction="x", snapTo=joints[1], moveTo=("z", pvOffset), hideChannels=["s", "v"], deferChannels=True)
+    cmds.poleVectorConstraint(controlIKPV.ctrlName, "ik" + name + side)
+
+    # lock and hide channels of all fk/ik controls at once
+    setChannelState([controlFK0, controlFK1, controlFK2, controlIK, controlIKPV])
+
+    # Constraints, in matrix mode the first FK joint follows its control in full already
+    if buildContext.driveMode == "constraint":
+        drive(joints[0], "FKJ_" + joints[0], rotate=False, maintainOffset=False)
+    drive(joints[0], "IKJ_" + joints[0], rotate=False, maintainOffset=False)
+
+    # Add attributes, a rebuilt limb keeps the switches it already has
+    newSwitch = not cmds.attributeQuery("Blend_FkIk_" + name + side, node=switchCtrl, exists=True)
+    if newSwitch:
+        cmds.addAttr(switchCtrl, longName="Blend_FkIk_" + name + side, attributeType="float", min=0, max=1, defaultValue=0)
+        cmds.setAttr((switchCtrl + ".Blend_FkIk_" + name + side), edit=True, keyable=True)
+        cmds.addAttr(switchCtrl, longName="Show_FK_" + name + side, attributeType="bool", defaultValue=1)
+        cmds.setAttr(switchCtrl + ".Show_FK_" + name + side, edit=True, keyable=True)
+        cmds.addAttr(switchCtrl, longName="Show_IK_" + name + side, attributeType="bool", defaultValue=1)
+        cmds.setAttr(switchCtrl + ".Show_IK_" + name + side, edit=True, keyable=True)
+
+    # keep the controls for fkIkMatch
+    fkIkMatch.saveLimb(switchCtrl, name + side, joints, [controlFK0.ctrlName, controlFK1.ctrlName, controlFK2.ctrlName],
+                       controlIK.ctrlName, controlIKPV.ctrlName)
+
+    # blend and visibility connections in one batch
+    batch = MelBatch()
+    blendJoints(joints, switchWeight(switchCtrl + ".Blend_FkIk_" + name + side), name + side, batch)
+    for ctrl in (controlFK0, controlFK1, controlFK2):
+        batch.add("connectAttr", switchCtrl + ".Show_FK_" + name + side, ctrl.ctrlName + ".visibility")
+    for ctrl in (controlIK, controlIKPV):
+        batch.add("connectAttr", switchCtrl + ".Show_IK_" + name + side, ctrl.ctrlName + ".visibility")
+    batch.flush()
+
+    return (handleName, controlIK.ctrlName, controlIK.ctrlOff)
+
+
+def switchWeight(switchAttr):
+    ''' 0-1 plug for an FK/IK switch, switches made with a 0-10 range
+    before it was 0-1 go through a multDoubleLinear
+    '''
+    node, attr = switchAttr.split(".", 1)
+    if not cmds.attributeQuery(attr, node=node, maxExists=True):
+        return switchAttr
+    maximum = cmds.attributeQuery(attr, node=node, maximum=True)
+    if maximum[0] <= 1:
+        return switchAttr
+    weight = cmds.createNode("multDoubleLinear", name=uniqueName(attr + "_weight"))
+    cmds.setAttr(weight + ".input2", 1.0 / maximum[0])
+    cmds.connectAttr(switchAttr, weight + ".input1")
+    return weight + ".output"
+
+
+def blendJoints(joints, weight, name, batch=None):
+    ''' blend joints between their FKJ_ and IKJ_ duplicates, weight 0 is IK
+    and 1 is FK, each joint has one blend node
+    With constraints the first joint, whose FK and IK joints are not under
+    its parent, gets an orientConstraint weighted by one reverse node. A
+    joint under another parent than its FK and IK joints, like the wrist
+    under an arm roll joint, gets a parentConstraint weighted the same way,
+    so it blends in world space. The others get a pairBlend of their FK and
+    IK channels. In matrix drive mode every joint gets a blendMatrix.
+    Args:
+        joints (list) 3 joints
+        weight (string) 0-1 plug, see switchWeight
+        name (string) limb name with side, e.g. "ArmL"
+    Kwargs:
+        batch (MelBatch) add the connections to it, the caller flushes
+    Returns:
+        list of the blend nodes
+    '''
+    if buildContext.driveMode == "matrix":
+        return blendMatrixDrive(joints, weight)
+    flush = batch is None
+    if flush:
+        batch = MelBatch()
+    rev = cmds.createNode("reverse", name=uniqueName(name + "_Reverse"))
+    blend0 = cmds.orientConstraint("FKJ_" + joints[0], "IKJ_" + joints[0], joints[0], maintainOffset=False)[0]
+    batch.add("connectAttr", weight, rev + ".inputX")
+    batch.add("connectAttr", weight, blend0 + ".FKJ_" + joints[0] + "W0")
+    batch.add("connectAttr", rev + ".outputX", blend0 + ".IKJ_" + joints[0] + "W1")
+    blends = [blend0]
+    for parent, joint in zip(joints, joints[1:]):
+        if cmds.listRelatives(joint, parent=True)[0] != parent:
+            # the FK and IK channels are relative to another parent, blend the world transforms
+            blend = cmds.parentConstraint("FKJ_" + joint, "IKJ_" + joint, joint, maintainOffset=False)[0]
+            batch.add("connectAttr", weight, blend + ".FKJ_" + joint + "W0")
+            batch.add("connectAttr", rev + ".outputX", blend + ".IKJ_" + joint + "W1")
+            blends.append(blend)
+            continue
+        blend = cmds.createNode("pairBlend", name=uniqueName(joint + "_pairBlend"))
+        # slerp the rotations rather than blending euler channels
+        batch.add("setAttr", blend + ".rotInterpolation", 1)
+        for attr, chain in (("1", "IKJ_"), ("2", "FKJ_")):
+            batch.add("connectAttr", chain + joint + ".translate", blend + ".inTranslate" + attr)
+            batch.add("connectAttr", chain + joint + ".rotate", blend + ".inRotate" + attr)
+        batch.add("connectAttr", weight, blend + ".weight")
+        batch.add("connectAttr", blend + ".outTranslate", joint + ".translate")
+        batch.add("connectAttr", blend + ".outRotate", joint + ".rotate")
+        blends.append(blend)
+    if flush:
+        batch.flush()
+    return blends
+
+
+def blendMatrixDrive(joints, weight):
+    ''' blend joints between their FKJ_ and IKJ_ duplicates with one
+    blendMatrix each, see blendJoints
+    Returns:
+        list of the blendMatrix nodes
+    '''
+    blends = []
+    for joint in joints:
+        blend = cmds.createNode("blendMatrix", name=uniqueName(joint + "_blendMatrix"))
+        cmds.connectAttr("IKJ_" + joint + ".worldMatrix[0]", blend + ".inputMatrix")
+        cmds.connectAttr("FKJ_" + joint + ".worldMatrix[0]", blend + ".target[0].targetMatrix")
+        cmds.connectAttr(weight, blend + ".target[0].weight")
+        # the FK and IK roots are kept on the first joint, so it can follow in full too
+        matrixDrive(blend + ".outputMatrix", joint, maintainOffset=False)
+        blends.append(blend)
+    return blends
+
+
+def stretchBlend(stretch, joints, switchAttr, name):
+    ''' scale joints along their bones by an IK chain's stretch factor, blended
+    by the FK/IK switch, one node for the whole limb
+    makeStretchyIK stretches the IKJ_ joints through their scaleX, which the
+    pairBlends of blendJoints don't carry over. In matrix drive mode the
+    blendMatrix nodes follow the stretched IK joints already.
+    Args:
+        stretch (string) stretch factor plug, from makeStretchyIK
+        joints (list) joints blended by FkIkBlend whose IKJ_ duplicates stretch
+        switchAttr (string) the limb's Blend_FkIk_ switch
+        name (string) limb name with side, e.g. "ArmL"
+    Returns:
+        blendColors name, None in matrix drive mode
+    '''
+    if buildContext.driveMode == "matrix":
+        return None
+    blend = cmds.createNode("blendColors", name=uniqueName(name + "_stretchBlend"))
+    # blender 0 is IK and 1 is FK, like the switch
+    batch = MelBatch()
+    batch.add("setAttr", blend + ".color1R", 1.0)
+    batch.add("connectAttr", stretch, blend + ".color2R")
+    batch.add("connectAttr", switchWeight(switchAttr), blend + ".blender")
+    for joint in joints:
+        batch.add("connectAttr", blend + ".outputR", joint + ".scaleX")
+    batch.flush()
+    return blend
+
+
+def drive(driver, driven, translate=True, rotate=True, maintainOffset=True, sharedPivot=False, freeRotation=False):
+    ''' make driven follow driver, like a point, orient or parentConstraint
+    In buildContext's "constraint" drive mode that is the constraint, in
+    "matrix" mode it is matrixDrive from the driver's world matrix.
+    A joint driving translate only is read through its parent and its
+    translate as it is now, its rotation often comes from what it drives,
+    like the FK and IK chains of FkIkBlend.
+    Args:
+        driver (string) object to follow
+        driven (string) object that follows
+    Kwargs:
+        translate (bool) follow position
+        rotate (bool) follow rotation
+        maintainOffset (bool) keep the offset between them as it is now
+        sharedPivot (bool) the driver stays on the driven's pivot, so matrix
+            mode can follow rotation through offsetParentMatrix alone
+        freeRotation (bool) nothing but a rotate plane solver reads the
+            driven's rotation, like an ikHandle's, so matrix mode can carry
+            the driver's rotation along and follow position through
+            offsetParentMatrix alone
+    Returns:
+        constraint or multMatrix name
+    '''
+    if buildContext.driveMode == "constraint":
+        if translate and rotate:
+            return cmds.parentConstraint(driver, driven, maintainOffset=maintainOffset)[0]
+        if translate:
+            return cmds.pointConstraint(driver, driven, maintainOffset=maintainOffset)[0]
+        return cmds.orientConstraint(driver, driven, maintainOffset=maintainOffset)[0]
+    if translate and not rotate and cmds.nodeType(driver) == "joint":
+        position = vecMath.translationMatrix(cmds.getAttr(driver + ".translate")[0])
+        return matrixDrive(driver + ".parentMatrix[0]", driven, translate, rotate, maintainOffset, position)
+    if sharedPivot:
+        translate = True
+    if freeRotation:
+        return matrixDrive(driver + ".worldMatrix[0]", driven, maintainOffset=maintainOffset, offsetParent=True)
+    return matrixDrive(driver + ".worldMatrix[0]", driven, translate, rotate, maintainOffset)
+
+
+def matrixDrive(matrixPlug, driven, translate=True, rotate=True, maintainOffset=True, preMatrix=None,
+                offsetParent=None):
+    ''' make driven follow a world matrix without constraints
+    Joints following in full, and other nodes with offsetParent, get one
+    multMatrix into their offsetParentMatrix and keep their own channels.
+    Anything else gets a multMatrix and a
+    decomposeMatrix into its translate and rotate, so the channels still
+    hold the pose for nodes that read them, like makeStretchyIK's handle.
+    Args:
+        matrixPlug (string) world matrix to follow, e.g. "ctrl.worldMatrix[0]"
+        driven (string) object that follows
+    Kwargs:
+        translate (bool) follow position
+        rotate (bool) follow rotation
+        maintainOffset (bool) keep the offset to the matrix as it is now
+        preMatrix (list) constant 4x4 matrix in front of matrixPlug
+        offsetParent (bool) follow in full through offsetParentMatrix, by
+            default for joints only
+    Returns:
+        multMatrix name
+    '''
+    source = vecMath.unflatten(cmds.getAttr(matrixPlug))
+    if preMatrix:
+        source = vecMath.matMul(preMatrix, source)
+    world = vecMath.unflatten(cmds.getAttr(driven + ".worldMatrix[0]"))
+    offset = vecMath.matMul(world, vecMath.matInverse(source)) if maintainOffset else vecMath.identity()
+    isJoint = cmds.nodeType(driven) == "joint"
+    if offsetParent is None:
+        offsetParent = isJoint
+    inputs = [preMatrix, matrixPlug, driven + ".parentInverseMatrix[0]"]
+    if translate and rotate and offsetParent:
+        # offsetParentMatrix goes between the node's own channels and its parent
+        local = vecMath.unflatten(cmds.getAttr(driven + ".matrix"))
+        inputs.insert(0, vecMath.matMul(vecMath.matInverse(local), offset))
+    elif translate and not rotate:
+        # like a pointConstraint the offset is added in the parent's space
+        parentInverse = vecMath.unflatten(cmds.getAttr(driven + ".parentInverseMatrix[0]"))
+        position = vecMath.matMul(source, parentInverse)[3][:3]
+        translate0 = cmds.getAttr(driven + ".translate")[0]
+        delta = [translate0[i] - position[i] for i in range(3)] if maintainOffset else [0.0, 0.0, 0.0]
+        inputs.append(vecMath.translationMatrix(delta))
+    else:
+        inputs.insert(0, vecMath.rotationMatrix(offset) if not translate else offset)
+        if rotate and isJoint:
+            # rotate is what is left once the joint orient is taken off
+            orient = vecMath.composeMatrix(rotate=cmds.getAttr(driven + ".jointOrient")[0])
+            inputs.append(vecMath.matInverse(orient))
+
+    multMatrix = cmds.createNode("multMatrix", name=uniqueName(driven + "_multMatrix"))
+    for i, value in enumerate(item for item in inputs if item is not None):
+        if isinstance(value, list):
+            cmds.setAttr("%s.matrixIn[%s]" % (multMatrix, i), vecMath.flatten(value), type="matrix")
+        else:
+            cmds.connectAttr(value, "%s.matrixIn[%s]" % (multMatrix, i))
+    if translate and rotate and offsetParent:
+        cmds.connectAttr(multMatrix + ".matrixSum", driven + ".offsetParentMatrix")
+        return multMatrix
+    decompose = cmds.createNode("decomposeMatrix", name=uniqueName(driven + "_decomposeMatrix"))
+    cmds.connectAttr(multMatrix + ".matrixSum", decompose + ".inputMatrix")
+    if translate:
+        cmds.connectAttr(decompose + ".outputTranslate", driven + ".translate")
+    if rotate:
+        cmds.connectAttr(decompose + ".outputRotate", driven + ".rotate")
+    return multMatrix
+
+
+def freezeTransforms(obj):
+    cmds.makeIdentity(obj, apply=True, translate=True, rotate=True, scale=True)
+    cmds.delete(obj, constructionHistory=True)
+
+
+def uniqueName(name):
+    '''check name is unique and return unique name
+    Args:
+        name of object (string)
+    '''
+    return nameIndex.uniqueName(name)
+
+
+def locator(name, pos=[0, 0, 0], snapTo=None):
+    ''' Create new locator 
+    Args:
+        name (string) name of locator
+        pos (float3) x, y, z position
+    Kwargs:
+        snapTo (string) object to snap to
+    Returns:
+        new locators unique name
+    '''
+    name = uniqueName(name)
+    newLoc = cmds.spaceLocator(name=name)[0]
+    if snapTo and cmds.objExists(snapTo):
+        cmds.delete(cmds.pointConstraint(snapTo, newLoc))
+    cmds.move(pos[0], pos[1], pos[2], newLoc, relative=True)
+    # set colour
+    cmds.setAttr(newLoc + ".overrideEnabled", 1)
+    if "L" in name[-1]:
+        cmds.setAttr(newLoc + ".overrideColor", 6)
+    elif "R" in name[-1]:
+        cmds.setAttr(newLoc + ".overrideColor", 13)
+    else:
+        cmds.setAttr(newLoc + ".overrideColor", 22)
+    # Add locator to root nodes proxy object list
+    cmds.addAttr(newLoc, ln="locatorName", at="message")
+    cmds.connectAttr("MR_Root.proxyObjects", newLoc + ".locatorName")
+    # add to rig group
+    try:
+        cmds.parent(newLoc, cmds.getAttr("MR_Root.prefix") + "_Rig")
+    except:
+        cmds.group(newLoc, name=cmds.getAttr("MR_Root.prefix") + "_Rig")
+    return newLoc
@@ -0,0 +1,456 @@
+''' plan a rig build in memory, optimise it, then replay it into maya
+
+While planning, every MagicRig module talks to a planScene.Scene instead
+of maya. Commands that change the scene are recorded as Ops, queries are
+answered by the scene. The op list can then be optimised and replayed
+into maya in one ordered pass:
+
+    plan = RigPlan()
+    with planning(plan):
+        part = rigparts.leg("legRigL", "L")
+        part.proxy()
+    plan.optimise()
+    execute(plan)
+'''
+import sys
+import os
+import copy
+import importlib
+from contextlib import contextmanager
+
+import planScene
+import nameIndex
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# nodes that only compute values, safe to merge when type, values and inputs match
+UTILITY_TYPES = {"multiplyDivide", "plusMinusAverage", "condition", "reverse", "blendColors",
+                 "distanceBetween", "addDoubleLinear", "multDoubleLinear", "clamp", "setRange",
+                 "remapValue", "decomposeMatrix", "multMatrix", "composeMatrix", "inverseMatrix",
+                 "blendTwoAttr", "pairBlend"}
+
+# commands whose created nodes have no side effects on other nodes
+PLAIN_CREATE = {"createNode", "shadingNode", "spaceLocator"}
+
+# the package's SUBMODULES without ui, which needs Qt, imported before
+# planning swaps cmds so nothing a build loads can keep maya's
+PLANNED_MODULES = ("AutoRig", "build", "Control", "mirror", "proxyObj", "rigparts", "roleIndex", "rigUtils")
+
+
+class Op(object):
+    ''' one recorded command
+    Args:
+        command (string) maya.cmds function name, or "mel.eval"
+        args (tuple) positional arguments
+        kwargs (dict) flags
+    '''
+    __slots__ = ("command", "args", "kwargs", "result", "created", "refs", "snap")
+
+    def __init__(self, command, args, kwargs):
+        self.command = command
+        self.args = args
+        self.kwargs = kwargs
+        self.result = None
+        # nodes the command made, planScene.Node objects
+        self.created = []
+        # existing nodes the command read or changed
+        self.refs = set()
+        # (node, channels) a constraint changed when it was made
+        self.snap = []
+
+
+    def __repr__(self):
+        args = [repr(a) for a in self.args] + ["%s=%r" % item for item in sorted(self.kwargs.items())]
+        return "%s(%s)" % (self.command, ", ".join(args))
+
+
+class RigPlan(object):
+    ''' recorded rig build, the scene it produced and its op list '''
+    def __init__(self, scene=None):
+        self.scene = scene or planScene.Scene()
+        self.sceneCmds = planScene.SceneCmds(self.scene)
+        self.sceneMel = planScene.SceneMel(self.sceneCmds)
+        self.cmds = PlanCmds(self)
+        self.mel = PlanMel(self)
+        self.ops = []
+        self.passes = []
+
+
+    def record(self, command, func, args, kwargs):
+        ''' run func on the scene and record it as an op '''
+        scene = self.scene
+        op = Op(command, copy.deepcopy(args), copy.deepcopy(kwargs))
+        op.refs = self.references(args, kwargs)
+        first = len(scene.history)
+        snapshot = [(n, snapshotChannels(n)) for n in op.refs if n.isTransform()] \
+            if command in CONSTRAINT_COMMANDS else None
+        op.result = func(*args, **kwargs)
+        op.created = [n for n in scene.history[first:] if n.name in scene.nodes]
+        if snapshot is not None:
+            # channels the constraint moved, used if the constraint turns out to be temporary
+            op.snap = [(n, changedChannels(before, snapshotChannels(n))) for n, before in snapshot]
+        self.ops.append(op)
+        return op.result
+
+
+    def references(self, args, kwargs):
+        ''' scene nodes named in the arguments '''
+        refs = set()
+        for value in list(args) + list(kwargs.values()):
+            for name in planScene.asList(value):
+                if isinstance(name, str):
+                    for token in nameTokens(name):
+                        node = self.scene.nodes.get(token)
+                        if node:
+                            refs.add(node)
+        return refs
+
+
+    #-------------------------------------------------------------------------
+    # stats
+    #-------------------------------------------------------------------------
+    def nodeCount(self):
+        ''' number of nodes the op list creates '''
+        return sum(len(op.created) for op in self.ops)
+
+
+    def stats(self):
+        ''' dict of op and node counts, with a row per optimisation pass run '''
+        return {"ops": len(self.ops), "nodesCreated": self.nodeCount(),
+                "nodesInScene": len(self.scene.nodes), "passes": list(self.passes)}
+
+
+    #-------------------------------------------------------------------------
+    # passes
+    #-------------------------------------------------------------------------
+    def optimise(self):
+        ''' run every optimisation pass
+        Returns:
+            list of (pass name, nodes before, nodes after)
+        '''
+        self.removeTransient()
+        self.mergeUtilities()
+        return self.passes
+
+
+    def _runPass(self, name, func):
+        before = self.nodeCount()
+        func()
+        self.passes.append((name, before, self.nodeCount()))
+
+
+    def removeTransient(self):
+        ''' drop nodes that are created and deleted again with nothing using them
+
+        Constraints used only to snap a node are replaced by setAttr ops with
+        the channel values the constraint produced.
+        '''
+        self._runPass("removeTransient", self._removeTransient)
+
+
+    def _removeTransient(self):
+        ops = self.ops
+        created = {}
+        for i, op in enumerate(ops):
+            for node in op.created:
+                created[node] = i
+        replaced = {}
+        for i, op in enumerate(ops):
+            if op.command != "delete" or not op.refs:
+                continue
+            transient = []
+            for node in op.refs:
+                start = created.get(node)
+                if start is None or start in replaced:
+                    continue
+                source = ops[start]
+                if source.command not in CONSTRAINT_COMMANDS and source.command not in PLAIN_CREATE:
+                    continue
+                if len(source.created) != 1 and source.command not in CONSTRAINT_COMMANDS:
+                    continue
+                if any(node in ops[j].refs for j in range(start + 1, i)):
+                    continue
+                transient.append(node)
+                replaced[start] = node
+            if not transient:
+                continue
+            names = [nodeName(self, n, i) for n in transient]
+            remaining = [a for a in planScene.asList(op.args) if a not in names]
+            op.refs = op.refs - set(transient)
+            op.args = tuple(remaining)
+            if not remaining:
+                ops[i] = None
+        for start in replaced:
+            ops[start] = snapOps(ops[start])
+        self.ops = flattenOps(ops)
+
+
+    def mergeUtilities(self):
+        ''' merge utility nodes with the same type, values and inputs '''
+        self._runPass("mergeUtilities", self._mergeUtilities)
+
+
+    def _mergeUtilities(self):
+        melRefs = set()
+        for op in self.ops:
+            if op.command == "mel.eval":
+                melRefs |= op.refs
+        merged = {}
+        while True:
+            seen = {}
+            found = {}
+            for node in self.scene.history:
+                if node.type not in UTILITY_TYPES or node.name not in self.scene.nodes:
+                    continue
+                if node in merged or node in melRefs:
+                    continue
+                key = utilityKey(node, merged)
+                if key in seen:
+                    found[node] = seen[key]
+                else:
+                    seen[key] = node
+            if not found:
+                break
+            merged.update(found)
+        if not merged:
+            return
+        ops = []
+        for op in self.ops:
+            dropped = set(op.created) & set(merged)
+            if dropped:
+                if len(op.created) == len(dropped):
+                    continue
+            if op.command in ("setAttr", "addAttr") and op.refs & set(merged):
+                continue
+            # the kept node already has the same inputs
+            if op.command == "connectAttr" and self.scene.nodes.get(nameTokens(op.args[1])[-1]) in merged:
+                continue
+            for node in op.refs & set(merged):
+                keep = merged[node]
+                while keep in merged:
+                    keep = merged[keep]
+                op.args = renameArgs(op.args, node.name, keep.name)
+                op.kwargs = renameArgs(op.kwargs, node.name, keep.name)
+                op.refs = (op.refs - {node}) | {keep}
+            ops.append(op)
+        self.ops = ops
+        for node in merged:
+            self.scene.delete(node)
+
+
+CONSTRAINT_COMMANDS = {"pointConstraint", "orientConstraint", "parentConstraint",
+                       "scaleConstraint", "aimConstraint"}
+
+
+def nameTokens(name):
+    ''' node names inside a name, path or plug string '''
+    return name.split(".", 1)[0].split("|")
+
+
+def nodeName(plan, node, index):
+    ''' name node had when op index ran, the name in its delete op '''
+    op = plan.ops[index]
+    for arg in planScene.asList(op.args):
+        if isinstance(arg, str) and plan.scene.nodes.get(arg) is node or arg == node.name:
+            return arg
+    return node.name
+
+
+def snapshotChannels(node):
+    return dict((attr, list(node.attrs[attr])) for attr in ("translate", "rotate", "scale"))
+
+
+def changedChannels(before, after):
+    return dict((attr, value) for attr, value in after.items()
+                if any(abs(a - b) > 1e-9 for a, b in zip(value, before[attr])))
+
+
+def snapOps(op):
+    ''' setAttr ops with the values a temporary constraint produced '''
+    ops = []
+    for node, channels in op.snap:
+        for attr in ("translate", "rotate", "scale"):
+            if attr in channels:
+                value = channels[attr]
+                snap = Op("setAttr", ("%s.%s" % (node.name, attr), value[0], value[1], value[2]),
+                          {"type": "double3"})
+                snap.refs = {node}
+                ops.append(snap)
+    return ops
+
+
+def flattenOps(ops):
+    result = []
+    for op in ops:
+        if op is None:
+            continue
+        if isinstance(op, list):
+            result.extend(op)
+        else:
+            result.append(op)
+    return result
+
+
+def utilityKey(node, merged):
+    ''' hashable description of a utility node's type, values and inputs '''
+    inputs = []
+    for attr, (src, srcAttr) in sorted(node.inputs.items(), key=lambda item: item[0]):
+        while src in merged:
+            src = merged[src]
+        inputs.append((attr, id(src), srcAttr))
+    values = []
+    for attr, value in sorted(node.attrs.items()):
+        values.append((attr, repr(value)))
+    return (node.type, tuple(values), tuple(inputs))
+
+
+def renameArgs(value, old, new):
+    ''' replace node name old with new in names, paths and plugs '''
+    if isinstance(value, str):
+        if value == old or value.startswith(old + "."):
+            return new + value[len(old):]
+        return value
+    if isinstance(value, tuple):
+        return tuple(renameArgs(v, old, new) for v in value)
+    if isinstance(value, list):
+        return [renameArgs(v, old, new) for v in value]
+    if isinstance(value, dict):
+        return dict((k, renameArgs(v, old, new)) for k, v in value.items())
+    return value
+
+
+class PlanCmds(object):
+    ''' stands in for maya.cmds while planning '''
+    def __init__(self, plan):
+        self._plan = plan
+
+
+    def __getattr__(self, name):
+        plan = self._plan
+        func = getattr(plan.sceneCmds, name)
+        if name in planScene.QUERY_COMMANDS:
+            return func
+
+        def planned(*args, **kwargs):
+            if kwargs.get("query") or kwargs.get("q"):
+                return func(*args, **kwargs)
+            return plan.record(name, func, args, kwargs)
+        return planned
+
+
+class PlanMel(object):
+    ''' stands in for maya.mel while planning, each eval is one op '''
+    def __init__(self, plan):
+        self._plan = plan
+
+
+    def eval(self, script):
+        plan = self._plan
+        op = Op("mel.eval", (script,), {})
+        for token in script.replace('"', " ").split():
+            node = plan.scene.nodes.get(token.split(".", 1)[0])
+            if node:
+                op.refs.add(node)
+        first = len(plan.scene.history)
+        op.result = plan.sceneMel.eval(script)
+        op.created = plan.scene.history[first:]
+        plan.ops.append(op)
+        return op.result
+
+
+def magicRigModules():
+    ''' loaded MagicRig modules that use maya.cmds or maya.mel '''
+    modules = []
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None) or ""
+        if path and os.path.dirname(os.path.abspath(path)) == ROOT and (hasattr(module, "cmds") or hasattr(module, "mel")):
+            modules.append(module)
+    return modules
+
+
+def importModules():
+    ''' import PLANNED_MODULES and everything they import, under the package
+    name this folder is loaded as, MagicRig unless a caller chose another
+    '''
+    package = None
+    for name, module in list(sys.modules.items()):
+        if ROOT in [os.path.abspath(path) for path in getattr(module, "__path__", None) or []]:
+            package = name
+            break
+    if package is None:
+        import batch
+        package = batch.importBuild().__name__.rsplit(".", 1)[0]
+    for name in PLANNED_MODULES:
+        importlib.import_module(package + "." + name)
+
+
+@contextmanager
+def planning(plan):
+    ''' record MagicRig commands into plan instead of running them in maya '''
+    importModules()
+    modules = magicRigModules()
+    saved = [(m, getattr(m, "cmds", None), getattr(m, "mel", None)) for m in modules]
+    for module in modules:
+        if hasattr(module, "cmds"):
+            module.cmds = plan.cmds
+        if hasattr(module, "mel"):
+            module.mel = plan.mel
+    # names come from the plan scene while planning
+    nameIndex.index.scanned = False
+    try:
+        yield plan
+    finally:
+        for module, cmds, mel in saved:
+            if cmds is not None:
+                module.cmds = cmds
+            if mel is not None:
+                module.mel = mel
+        nameIndex.index.scanned = False
+
+
+def execute(plan, cmds=None, mel=None):
+    ''' replay the plan's ops into maya
+    Kwargs:
+        cmds (module) defaults to maya.cmds
+        mel (module) defaults to maya.mel
+    Returns:
+        dict of planned name: name in maya, for nodes maya named differently
+    '''
+    if cmds is None:
+        import maya.cmds as cmds
+    if mel is None:
+        import maya.mel as mel
+    names = {}
+    for op in plan.ops:
+        args = mapNames(op.args, names)
+        kwargs = mapNames(op.kwargs, names)
+        if op.command == "mel.eval":
+            result = mel.eval(mapMelNames(args[0], names))
+        else:
+            result = getattr(cmds, op.command)(*args, **kwargs)
+        for planned, actual in zip(planScene.asList(op.result), planScene.asList(result)):
+            if isinstance(planned, str) and planned != actual:
+                names[planScene.shortName(planned)] = planScene.shortName(actual)
+    return names
+
+
+def mapNames(value, names):
+    if not names:
+        return value
+    if isinstance(value, str):
+        node, dot, rest = value.partition(".")
+        parts = [names.get(p, p) for p in node.split("|")]
+        return "|".join(parts) + dot + rest
+    if isinstance(value, tuple):
+        return tuple(mapNames(v, names) for v in value)
+    if isinstance(value, list):
+        return [mapNames(v, names) for v in value]
+    if isinstance(value, dict):
+        return dict((k, mapNames(v, names)) for k, v in value.items())
+    return value
+
+
+def mapMelNames(script, names):
+    for planned, actual in names.items():
+        script = script.replace('"%s.' % planned, '"%s.' % actual).replace('"%s"' % planned, '"%s"' % actual)
+    return script
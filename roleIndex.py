@@ -0,0 +1,142 @@
+import json
+
+import maya.cmds as cmds
+
+# string attribute on MR_Root the index is saved in
+ATTR = "roles"
+
+
+def flatten(obj, key, roles):
+    ''' add the SETTINGS and ROLES of a rig part to roles
+    Nested parts, like the fingers of an arm, get keys of their own,
+    "armRigL.thumb.base", "armRigL.fingers[0].base", and a list of nested
+    parts is saved as its length.
+    '''
+    roles[key + ".object"] = type(obj).__name__
+    for attr in obj.SETTINGS + obj.ROLES:
+        value = getattr(obj, attr, None)
+        if value is None:
+            continue
+        attrKey = key + "." + attr
+        if hasattr(value, "ROLES"):
+            flatten(value, attrKey, roles)
+        elif isinstance(value, (list, tuple)):
+            if value and hasattr(value[0], "ROLES"):
+                roles[attrKey] = len(value)
+                for i, item in enumerate(value):
+                    flatten(item, "%s[%d]" % (attrKey, i), roles)
+            else:
+                roles[attrKey] = list(value)
+        else:
+            roles[attrKey] = value
+
+
+def restore(key, roles, classes):
+    ''' make the rig part saved under key again, without touching the scene '''
+    cls = getattr(classes, roles[key + ".object"])
+    # object.__new__ so MetaNode does not make a new network node
+    obj = object.__new__(cls)
+    for attr in cls.SETTINGS + cls.ROLES:
+        attrKey = key + "." + attr
+        if attrKey + ".object" in roles:
+            setattr(obj, attr, restore(attrKey, roles, classes))
+        elif attrKey + "[0].object" in roles:
+            setattr(obj, attr, [restore("%s[%d]" % (attrKey, i), roles, classes) for i in range(roles[attrKey])])
+        elif attrKey in roles:
+            setattr(obj, attr, roles[attrKey])
+    return obj
+
+
+class RoleIndex(object):
+    ''' role -> node index of the rig parts, kept on MR_Root as one json string
+
+    Keys are "<part node>.<role>", e.g. "armRigL.wrist" -> "WristL", so
+    any joint or control of the rig is one dictionary lookup away, and
+    reopening a scene reads one attribute instead of walking the
+    network nodes with listConnections.
+    '''
+    def __init__(self):
+        self.roles = None
+
+
+    def clear(self):
+        self.roles = None
+
+
+    def read(self):
+        ''' read the index saved on MR_Root
+        Returns:
+            dict of role: value, empty if the scene has no index
+        '''
+        if cmds.objExists("MR_Root") and cmds.attributeQuery(ATTR, node="MR_Root", exists=True):
+            self.roles = json.loads(cmds.getAttr("MR_Root." + ATTR) or "{}")
+        else:
+            self.roles = {}
+        return self.roles
+
+
+    def save(self, parts):
+        ''' save the roles of every rig part on MR_Root
+        Args:
+            parts (dict) part name: rig part, as made by build.makeProxyBiped
+        '''
+        roles = {}
+        for partName, part in parts.items():
+            roles[part.name + ".part"] = partName
+            flatten(part, part.name, roles)
+        if not cmds.attributeQuery(ATTR, node="MR_Root", exists=True):
+            cmds.addAttr("MR_Root", longName=ATTR, dataType="string")
+        cmds.setAttr("MR_Root." + ATTR, json.dumps(roles, separators=(",", ":")), type="string")
+        self.roles = roles
+
+
+    def load(self, classes):
+        ''' rebuild the rig parts connected to MR_Root.child
+        Parts missing from the index, from scenes saved before it, get
+        their type and settings from their network node, but no roles.
+        Args:
+            classes (module) where the rig part classes are, rigparts
+        Returns:
+            dict of part name: rig part
+        '''
+        roles = self.read()
+        parts = {}
+        for node in cmds.listConnections("MR_Root.child") or []:
+            if node + ".object" in roles:
+                part = restore(node, roles, classes)
+                partName = roles.get(node + ".part", node)
+            else:
+                cls = getattr(classes, cmds.getAttr(node + ".object"))
+                part = object.__new__(cls)
+                for attr in cls.SETTINGS:
+                    if cmds.attributeQuery(attr, node=node, exists=True):
+                        setattr(part, attr, cmds.getAttr(node + "." + attr))
+                partName = node
+                cmds.warning("MagicRig: no saved roles for %s, rebuild the rig to save them" % node)
+            part.name = node
+            parts[partName] = part
+        return parts
+
+
+    def lookup(self, role):
+        ''' node or value saved for role, e.g. "armRigL.wrist", None if there is none '''
+        if self.roles is None:
+            self.read()
+        return self.roles.get(role)
+
+
+    def values(self, role):
+        ''' every node saved for role in any part, e.g. values("mover") '''
+        if self.roles is None:
+            self.read()
+        ending = "." + role
+        return [value for key, value in self.roles.items() if key.endswith(ending) and value is not None]
+
+
+# one index shared by every MagicRig module
+index = RoleIndex()
+
+
+def lookup(role):
+    ''' node or value saved for role, e.g. "armRigL.wrist" '''
+    return index.lookup(role)
@@ -0,0 +1,124 @@
+import os
+import json
+from math import cos, sin, radians
+
+SHAPE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ControlShapes.json")
+
+# rotation applied for each Control direction, matches the old offset rotate
+DIRECTIONS = {
+    "x": (0, 90),
+    "y": (1, 90),
+    "z": (2, 90),
+}
+
+# process wide shape cache, filled on first use
+_library = {"mtime": None, "shapes": {}}
+
+
+class ShapeRecord(object):
+    ''' pre-built curve data for one control shape
+    Args:
+        name (string) name of shape
+        points (list) list of [x, y, z] cv positions
+    Kwargs:
+        degree (int) curve degree, default 1
+        knots (list) knot vector, built from degree and points if not given
+        periodic (bool) closed periodic curve
+    '''
+    def __init__(self, name, points, degree=1, knots=None, periodic=False):
+        self.name = name
+        self.points = tuple(tuple(float(v) for v in p) for p in points)
+        self.degree = degree
+        self.periodic = periodic
+        if knots is None:
+            knots = openKnots(len(self.points), degree)
+        self.knots = tuple(knots)
+
+
+    def baked(self, scale=1.0, direction=""):
+        ''' return cv positions with scale and direction applied
+        Kwargs:
+            scale (float or float3) size of shape
+            direction (char) "x", "y" or "z" rotate shape 90 degrees on axis
+        '''
+        if type(scale) is int or type(scale) is float:
+            scale = (scale, scale, scale)
+        points = [(p[0] * scale[0], p[1] * scale[1], p[2] * scale[2]) for p in self.points]
+        if direction in DIRECTIONS:
+            axis, angle = DIRECTIONS[direction]
+            points = [rotatePoint(p, axis, angle) for p in points]
+        return [tuple(round(v, 6) for v in p) for p in points]
+
+
+    def curveKwargs(self, scale=1.0, direction=""):
+        ''' return keyword arguments for cmds.curve '''
+        kwargs = {"point": self.baked(scale, direction), "degree": self.degree, "knot": list(self.knots)}
+        if self.periodic:
+            kwargs["periodic"] = True
+        return kwargs
+
+
+def openKnots(numPoints, degree):
+    ''' knot vector maya uses for an open curve '''
+    spans = numPoints - degree
+    return [0] * (degree - 1) + list(range(spans + 1)) + [spans] * (degree - 1)
+
+
+def rotatePoint(point, axis, angle):
+    ''' rotate point around world axis (0, 1, 2) by angle in degrees '''
+    c = cos(radians(angle))
+    s = sin(radians(angle))
+    x, y, z = point
+    if axis == 0:
+        return (x, y * c - z * s, y * s + z * c)
+    elif axis == 1:
+        return (x * c + z * s, y, -x * s + z * c)
+    return (x * c - y * s, x * s + y * c, z)
+
+
+def circleRecord():
+    ''' same curve as cmds.circle(normal=[0, 1, 0], radius=1) '''
+    a = 0.783611
+    b = 1.108194
+    points = [(a, 0, -a), (0, 0, -b), (-a, 0, -a), (-b, 0, 0),
+              (-a, 0, a), (0, 0, b), (a, 0, a), (b, 0, 0)]
+    # periodic curve repeats the first degree points
+    points += points[:3]
+    return ShapeRecord("circle", points, degree=3, knots=range(-2, 11), periodic=True)
+
+
+def load(force=False):
+    ''' load shape library, only reads the file again when it has changed
+    Kwargs:
+        force (bool) reload even if file is unchanged
+    Returns:
+        dict of shape name: ShapeRecord
+    '''
+    mtime = os.path.getmtime(SHAPE_FILE)
+    if force or mtime != _library["mtime"]:
+        with open(SHAPE_FILE) as f:
+            data = json.load(f)
+        shapes = {"circle": circleRecord()}
+        for name, points in data.items():
+            shapes[name] = ShapeRecord(name, points)
+        _library["shapes"] = shapes
+        _library["mtime"] = mtime
+    return _library["shapes"]
+
+
+def getShape(name):
+    ''' return ShapeRecord for shape name '''
+    shapes = load()
+    if name not in shapes:
+        raise KeyError("Unknown control shape: %s" % name)
+    return shapes[name]
+
+
+def shapeNames():
+    ''' list of available shapes '''
+    return sorted(load().keys())
+
+
+def curveKwargs(name, scale=1.0, direction=""):
+    ''' cmds.curve keyword arguments for shape with scale and direction baked in '''
+    return getShape(name).curveKwargs(scale, direction)
@@ -0,0 +1,234 @@
+''' small pure python vector and matrix helpers
+
+Matrices are 4x4 lists of rows and follow maya's row vector convention,
+a point is transformed with point * matrix and a child's world matrix is
+local * parentWorld. Angles are in degrees, euler rotations are xyz order.
+'''
+from math import sqrt, sin, cos, asin, atan2, radians, degrees
+
+EPSILON = 1e-9
+
+
+def add(a, b):
+    return [a[0] + b[0], a[1] + b[1], a[2] + b[2]]
+
+
+def sub(a, b):
+    return [a[0] - b[0], a[1] - b[1], a[2] - b[2]]
+
+
+def mul(a, value):
+    return [a[0] * value, a[1] * value, a[2] * value]
+
+
+def dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def cross(a, b):
+    return [a[1] * b[2] - a[2] * b[1],
+            a[2] * b[0] - a[0] * b[2],
+            a[0] * b[1] - a[1] * b[0]]
+
+
+def length(a):
+    return sqrt(dot(a, a))
+
+
+def distance(a, b):
+    return length(sub(a, b))
+
+
+def normalize(a):
+    size = length(a)
+    if size < EPSILON:
+        return [0.0, 0.0, 0.0]
+    return [a[0] / size, a[1] / size, a[2] / size]
+
+
+def average(points):
+    ''' centre of a list of points '''
+    count = float(len(points))
+    return [sum(p[0] for p in points) / count,
+            sum(p[1] for p in points) / count,
+            sum(p[2] for p in points) / count]
+
+
+def identity():
+    return [[1.0, 0.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0, 0.0],
+            [0.0, 0.0, 1.0, 0.0],
+            [0.0, 0.0, 0.0, 1.0]]
+
+
+def matMul(a, b):
+    ''' a * b '''
+    b0, b1, b2, b3 = b
+    return [[r[0] * b0[0] + r[1] * b1[0] + r[2] * b2[0] + r[3] * b3[0],
+             r[0] * b0[1] + r[1] * b1[1] + r[2] * b2[1] + r[3] * b3[1],
+             r[0] * b0[2] + r[1] * b1[2] + r[2] * b2[2] + r[3] * b3[2],
+             r[0] * b0[3] + r[1] * b1[3] + r[2] * b2[3] + r[3] * b3[3]] for r in a]
+
+
+def matInverse(m):
+    ''' inverse of a 4x4 matrix, gauss jordan '''
+    size = 4
+    a = [list(m[i]) + [1.0 if i == j else 0.0 for j in range(size)] for i in range(size)]
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda r: abs(a[r][col]))
+        if abs(a[pivot][col]) < EPSILON:
+            raise ValueError("Matrix is not invertible")
+        a[col], a[pivot] = a[pivot], a[col]
+        value = a[col][col]
+        a[col] = [x / value for x in a[col]]
+        for row in range(size):
+            if row != col and a[row][col] != 0.0:
+                factor = a[row][col]
+                a[row] = [x - factor * y for x, y in zip(a[row], a[col])]
+    return [row[size:] for row in a]
+
+
+def translationMatrix(t):
+    m = identity()
+    m[3][0], m[3][1], m[3][2] = t[0], t[1], t[2]
+    return m
+
+
+def scaleMatrix(s):
+    m = identity()
+    m[0][0], m[1][1], m[2][2] = s[0], s[1], s[2]
+    return m
+
+
+def eulerToMatrix(r):
+    ''' rotation matrix from xyz euler angles in degrees '''
+    cx, sx = cos(radians(r[0])), sin(radians(r[0]))
+    cy, sy = cos(radians(r[1])), sin(radians(r[1]))
+    cz, sz = cos(radians(r[2])), sin(radians(r[2]))
+    # Rx * Ry * Rz
+    return [[cy * cz, cy * sz, -sy, 0.0],
+            [sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy, 0.0],
+            [cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy, 0.0],
+            [0.0, 0.0, 0.0, 1.0]]
+
+
+def matrixToEuler(m):
+    ''' xyz euler angles in degrees from the rotation part of a matrix '''
+    rows = [normalize(m[i][:3]) for i in range(3)]
+    sy = max(-1.0, min(1.0, -rows[0][2]))
+    y = asin(sy)
+    if abs(cos(y)) > 1e-6:
+        x = atan2(rows[1][2], rows[2][2])
+        z = atan2(rows[0][1], rows[0][0])
+    else:
+        # gimbal lock, put all of the rotation on x
+        z = 0.0
+        x = atan2(rows[1][0] * sy, rows[1][1])
+    return [clean(degrees(x)), clean(degrees(y)), clean(degrees(z))]
+
+
+def clean(value, places=9):
+    ''' round away float noise, keeps -0.0 out of results '''
+    value = round(value, places)
+    return 0.0 if value == 0 else value
+
+
+def rotationMatrix(m):
+    ''' matrix with only the normalised rotation part of m '''
+    rows = [normalize(m[i][:3]) for i in range(3)]
+    return [rows[0] + [0.0], rows[1] + [0.0], rows[2] + [0.0], [0.0, 0.0, 0.0, 1.0]]
+
+
+def composeMatrix(translate=(0, 0, 0), rotate=(0, 0, 0), scale=(1, 1, 1), jointOrient=None,
+                  rotatePivot=None, scalePivot=None):
+    ''' local matrix of a transform or joint from its channels
+    Same as Sp^-1 * S * Sp * Rp^-1 * R * Rp * T, worked out on the 3x3 part
+    and the translation row so no 4x4 products are needed.
+    '''
+    r = eulerToMatrix(rotate)
+    if jointOrient is not None and any(jointOrient):
+        r = matMul(r, eulerToMatrix(jointOrient))
+    # scale then rotate: the rows of r scaled
+    m = [[r[i][0] * scale[i], r[i][1] * scale[i], r[i][2] * scale[i], 0.0] for i in range(3)]
+    offset = [translate[0], translate[1], translate[2]]
+    if rotatePivot and any(rotatePivot):
+        # -rp * R + rp
+        for j in range(3):
+            offset[j] += rotatePivot[j] - (rotatePivot[0] * r[0][j] + rotatePivot[1] * r[1][j] + rotatePivot[2] * r[2][j])
+    if scalePivot and any(scalePivot):
+        # (-sp * S + sp) * R
+        shift = [scalePivot[i] - scalePivot[i] * scale[i] for i in range(3)]
+        for j in range(3):
+            offset[j] += shift[0] * r[0][j] + shift[1] * r[1][j] + shift[2] * r[2][j]
+    m.append([offset[0], offset[1], offset[2], 1.0])
+    return m
+
+
+def decomposeMatrix(m):
+    ''' translate, rotate and scale from a matrix without shear '''
+    scale = [length(m[i][:3]) for i in range(3)]
+    # negative determinant means one axis is flipped
+    if dot(cross(m[0][:3], m[1][:3]), m[2][:3]) < 0:
+        scale[0] *= -1
+        m = [mul(m[0][:3], -1) + [0.0]] + [list(r) for r in m[1:]]
+    return [m[3][0], m[3][1], m[3][2]], matrixToEuler(m), scale
+
+
+def transformPoint(p, m):
+    ''' point * matrix '''
+    return [p[0] * m[0][0] + p[1] * m[1][0] + p[2] * m[2][0] + m[3][0],
+            p[0] * m[0][1] + p[1] * m[1][1] + p[2] * m[2][1] + m[3][1],
+            p[0] * m[0][2] + p[1] * m[1][2] + p[2] * m[2][2] + m[3][2]]
+
+
+def transformVector(v, m):
+    ''' vector * matrix, ignores translation '''
+    return [v[0] * m[0][0] + v[1] * m[1][0] + v[2] * m[2][0],
+            v[0] * m[0][1] + v[1] * m[1][1] + v[2] * m[2][1],
+            v[0] * m[0][2] + v[1] * m[1][2] + v[2] * m[2][2]]
+
+
+def flatten(m):
+    ''' 16 floats, the layout getAttr returns for matrix attributes '''
+    return [v for row in m for v in row]
+
+
+def unflatten(values):
+    return [list(values[i:i + 4]) for i in range(0, 16, 4)]
+
+
+def aimMatrix(aim, up, aimAxis=0, upAxis=1, reference=None):
+    ''' rotation matrix that points aimAxis along aim and upAxis towards up
+    Args:
+        aim (float3) aim direction
+        up (float3) up direction, does not need to be perpendicular
+    Kwargs:
+        aimAxis (int) 0, 1 or 2 for x, y, z
+        upAxis (int) 0, 1 or 2, must differ from aimAxis
+        reference (matrix) frame used when up is parallel to aim, default identity.
+            Like maya's orientJoint the third axis then keeps the direction of the
+            reference's third axis, e.g. x aimed down with yup leaves z on world z
+    '''
+    aim = normalize(aim)
+    side = normalize(cross(aim, up))
+    if length(side) < EPSILON:
+        reference = reference or identity()
+        keep = reference[3 - aimAxis - upAxis][:3]
+        if length(cross(aim, keep)) < EPSILON:
+            up = reference[upAxis][:3]
+        elif (aimAxis, upAxis) in ((0, 1), (1, 2), (2, 0)):
+            up = cross(keep, aim)
+        else:
+            up = cross(aim, keep)
+        side = normalize(cross(aim, up))
+    upVec = cross(side, aim)
+    rows = [None, None, None]
+    rows[aimAxis] = aim
+    rows[upAxis] = upVec
+    third = 3 - aimAxis - upAxis
+    # keep the basis right handed
+    if (aimAxis, upAxis) in ((0, 1), (1, 2), (2, 0)):
+        rows[third] = cross(rows[aimAxis], rows[upAxis])
+    else:
+        rows[third] = cross(rows[upAxis], rows[aimAxis])
+    return [rows[0] + [0.0], rows[1] + [0.0], rows[2] + [0.0], [0.0, 0.0, 0.0, 1.0]]